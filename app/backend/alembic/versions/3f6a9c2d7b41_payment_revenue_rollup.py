@@ -0,0 +1,56 @@
+"""payment revenue rollup
+
+Revision ID: 3f6a9c2d7b41
+Revises: 8e2b1ee98933
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a9c2d7b41'
+down_revision: Union[str, Sequence[str], None] = '8e2b1ee98933'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('payment_revenue_daily',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('affiliate_id', sa.String(), nullable=False),
+    sa.Column('payment_type', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('payment_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'affiliate_id', 'payment_type', 'status', name='uq_payment_revenue_daily_bucket')
+    )
+    op.create_index(op.f('ix_payment_revenue_daily_id'), 'payment_revenue_daily', ['id'], unique=False)
+
+    # Backfill from existing payments; PaymentsService keeps it current from here on
+    # (scripts/rebuild_payment_rollups.py recomputes it on demand)
+    if op.get_bind().dialect.name == 'postgresql':
+        day = "(COALESCE(payment_date, created_at) AT TIME ZONE 'UTC')::date"
+    else:
+        day = "date(COALESCE(payment_date, created_at))"
+    op.execute(
+        f"""
+        INSERT INTO payment_revenue_daily (day, affiliate_id, payment_type, status, total_amount, payment_count)
+        SELECT {day}, affiliate_id, payment_type, status, SUM(amount), COUNT(*)
+        FROM payments
+        WHERE deleted_at IS NULL AND COALESCE(payment_date, created_at) IS NOT NULL
+        GROUP BY {day}, affiliate_id, payment_type, status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_payment_revenue_daily_id'), table_name='payment_revenue_daily')
+    op.drop_table('payment_revenue_daily')
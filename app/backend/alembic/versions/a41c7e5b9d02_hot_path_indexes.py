@@ -0,0 +1,77 @@
+"""hot path indexes
+
+Revision ID: a41c7e5b9d02
+Revises: 3f6a9c2d7b41
+Create Date: 2026-10-16 10:00:00.000000
+
+Indexes for the ownership filters, status/foreign-key lookups and created_at
+sorts used by the entity list endpoints. (user_id, id) serves the default
+"WHERE user_id = ? ORDER BY id DESC" page on both PostgreSQL and SQLite by
+scanning the index backwards. The unique sku/barcode indexes fail if the
+inventory table already holds duplicates; resolve those before upgrading.
+scripts/check_index_usage.py verifies the plans with EXPLAIN.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c7e5b9d02'
+down_revision: Union[str, Sequence[str], None] = '3f6a9c2d7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_audit_logs_table_name_created_at'), 'audit_logs', ['table_name', 'created_at'], unique=False)
+    op.create_index(op.f('ix_audit_logs_created_at'), 'audit_logs', ['created_at'], unique=False)
+    op.create_index(op.f('ix_consignments_user_id_id'), 'consignments', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_consignments_affiliate_id_created_at'), 'consignments', ['affiliate_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_consignments_inventory_id'), 'consignments', ['inventory_id'], unique=False)
+    op.create_index(op.f('ix_consignments_status'), 'consignments', ['status'], unique=False)
+    op.create_index(op.f('ix_deliveries_user_id_id'), 'deliveries', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_deliveries_driver_id_scheduled_date'), 'deliveries', ['driver_id', 'scheduled_date'], unique=False)
+    op.create_index(op.f('ix_deliveries_consignment_id'), 'deliveries', ['consignment_id'], unique=False)
+    op.create_index(op.f('ix_deliveries_status'), 'deliveries', ['status'], unique=False)
+    op.create_index(op.f('ix_inventory_sku'), 'inventory', ['sku'], unique=True)
+    op.create_index(op.f('ix_inventory_barcode'), 'inventory', ['barcode'], unique=True)
+    op.create_index(op.f('ix_inventory_status'), 'inventory', ['status'], unique=False)
+    op.create_index(op.f('ix_issues_user_id_id'), 'issues', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_issues_affiliate_id_created_at'), 'issues', ['affiliate_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_issues_inventory_id'), 'issues', ['inventory_id'], unique=False)
+    op.create_index(op.f('ix_issues_status'), 'issues', ['status'], unique=False)
+    op.create_index(op.f('ix_payments_user_id_id'), 'payments', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_payments_affiliate_id_created_at'), 'payments', ['affiliate_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_payments_consignment_id'), 'payments', ['consignment_id'], unique=False)
+    op.create_index(op.f('ix_payments_status'), 'payments', ['status'], unique=False)
+    op.create_index(op.f('ix_users_extended_role'), 'users_extended', ['role'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_extended_role'), table_name='users_extended')
+    op.drop_index(op.f('ix_payments_status'), table_name='payments')
+    op.drop_index(op.f('ix_payments_consignment_id'), table_name='payments')
+    op.drop_index(op.f('ix_payments_affiliate_id_created_at'), table_name='payments')
+    op.drop_index(op.f('ix_payments_user_id_id'), table_name='payments')
+    op.drop_index(op.f('ix_issues_status'), table_name='issues')
+    op.drop_index(op.f('ix_issues_inventory_id'), table_name='issues')
+    op.drop_index(op.f('ix_issues_affiliate_id_created_at'), table_name='issues')
+    op.drop_index(op.f('ix_issues_user_id_id'), table_name='issues')
+    op.drop_index(op.f('ix_inventory_status'), table_name='inventory')
+    op.drop_index(op.f('ix_inventory_barcode'), table_name='inventory')
+    op.drop_index(op.f('ix_inventory_sku'), table_name='inventory')
+    op.drop_index(op.f('ix_deliveries_status'), table_name='deliveries')
+    op.drop_index(op.f('ix_deliveries_consignment_id'), table_name='deliveries')
+    op.drop_index(op.f('ix_deliveries_driver_id_scheduled_date'), table_name='deliveries')
+    op.drop_index(op.f('ix_deliveries_user_id_id'), table_name='deliveries')
+    op.drop_index(op.f('ix_consignments_status'), table_name='consignments')
+    op.drop_index(op.f('ix_consignments_inventory_id'), table_name='consignments')
+    op.drop_index(op.f('ix_consignments_affiliate_id_created_at'), table_name='consignments')
+    op.drop_index(op.f('ix_consignments_user_id_id'), table_name='consignments')
+    op.drop_index(op.f('ix_audit_logs_created_at'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_table_name_created_at'), table_name='audit_logs')
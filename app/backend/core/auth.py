@@ -1,17 +1,33 @@
+import asyncio
 import base64
 import hashlib
 import logging
+import re
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 from core.config import settings
-from jose import JWTError, jwt
+from core.http_clients import OIDC, http_clients
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from jose.exceptions import ExpiredSignatureError, JWSSignatureError, JWTClaimsError
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Verified access tokens, evicted at their `exp` or when the least recently used entry is pushed out
+ACCESS_TOKEN_CACHE_MAXSIZE = 10000
+_access_token_cache = TTLCache(ttl=0, maxsize=ACCESS_TOKEN_CACHE_MAXSIZE)
+
+
+def _user_hash(user_id: Any) -> str:
+    """Short hash of a user id for log lines, so raw ids are not exposed."""
+    return hashlib.sha256(str(user_id).encode()).hexdigest()[:8] if user_id not in (None, "unknown") else "unknown"
+
 
 def generate_state() -> str:
     """Generate a secure state parameter for OIDC."""
@@ -34,17 +50,37 @@ def generate_code_challenge(code_verifier: str) -> str:
     return base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
 
 
-async def get_jwks() -> Dict[str, Any]:
-    """Get JWKS (JSON Web Key Set) from OIDC provider."""
+# Issuer signing keys are cached for the response's Cache-Control max-age (or the default TTL),
+# clamped to [JWKS_MIN_REFRESH_SECONDS, JWKS_MAX_TTL_SECONDS]. An unknown `kid` triggers a refetch
+# at most once every JWKS_MIN_REFRESH_SECONDS.
+JWKS_DEFAULT_TTL_SECONDS = 3600
+JWKS_MAX_TTL_SECONDS = 86400
+JWKS_MIN_REFRESH_SECONDS = 30
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def parse_cache_control_max_age(cache_control: Optional[str]) -> Optional[int]:
+    """Return the max-age of a Cache-Control header in seconds, 0 for no-cache/no-store, or None."""
+    if not cache_control:
+        return None
+    directives = cache_control.lower()
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    match = _MAX_AGE_RE.search(directives)
+    return int(match.group(1)) if match else None
+
+
+async def _fetch_jwks() -> Tuple[Dict[str, Any], Optional[int]]:
+    """Download the issuer's JWKS, returning it with the response's max-age."""
     jwks_url = f"{settings.oidc_issuer_url}/.well-known/jwks.json"
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            logger.info(f"Fetching JWKS from: {jwks_url}")
-            response = await client.get(jwks_url)
-            response.raise_for_status()
-            jwks_data = response.json()
-            logger.info(f"Successfully fetched JWKS with {len(jwks_data.get('keys', []))} keys")
-            return jwks_data
+        logger.info(f"Fetching JWKS from: {jwks_url}")
+        response = await http_clients.get(OIDC).get(jwks_url, timeout=60.0)
+        response.raise_for_status()
+        jwks_data = response.json()
+        logger.info(f"Successfully fetched JWKS with {len(jwks_data.get('keys', []))} keys")
+        return jwks_data, parse_cache_control_max_age(response.headers.get("cache-control"))
     except httpx.TimeoutException as e:
         logger.error(f"Timeout while fetching JWKS from {jwks_url}: {e}")
         raise Exception("Unable to retrieve authentication keys")
@@ -56,6 +92,92 @@ async def get_jwks() -> Dict[str, Any]:
         raise Exception("Unable to retrieve authentication keys")
 
 
+async def get_jwks() -> Dict[str, Any]:
+    """Get JWKS (JSON Web Key Set) from OIDC provider."""
+    jwks_data, _ = await _fetch_jwks()
+    return jwks_data
+
+
+def build_jwk_keys(jwks: Dict[str, Any]) -> Dict[str, Key]:
+    """Construct verification key objects for every usable key in a JWKS, indexed by `kid`."""
+    keys = {}
+    for key_data in jwks.get("keys", []):
+        kid = key_data.get("kid")
+        if not kid or key_data.get("use", "sig") != "sig":
+            continue
+        try:
+            keys[kid] = jwk.construct(key_data, key_data.get("alg", "RS256"))
+        except Exception as e:
+            logger.error(f"Skipping JWKS key {kid}: failed to construct public key: {e}")
+    return keys
+
+
+class JWKSCache:
+    """Issuer signing keys by `kid`, refreshed on expiry or when an unknown `kid` shows up.
+
+    Refreshes are single-flight: concurrent callers wait on one fetch and then
+    read its result. A fetch is never repeated within `min_refresh_interval`, so
+    tokens with unknown or forged `kid`s cannot make us hammer the issuer. If a
+    refresh fails, the previous keys are served until the next attempt is due.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = JWKS_DEFAULT_TTL_SECONDS,
+        max_ttl: float = JWKS_MAX_TTL_SECONDS,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_SECONDS,
+    ):
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, Key] = {}
+        self._expires_at = 0.0
+        self._last_fetch: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str) -> Optional[Key]:
+        """Return the verification key for `kid`, or None if the issuer does not publish it."""
+        key = self._keys.get(kid)
+        if key is not None and time.monotonic() < self._expires_at:
+            return key
+
+        async with self._lock:
+            now = time.monotonic()
+            key = self._keys.get(kid)
+            if key is not None and now < self._expires_at:
+                return key
+            if self._last_fetch is not None and now - self._last_fetch < self.min_refresh_interval:
+                # Fetched moments ago, possibly by a caller we were waiting on
+                if not self._keys:
+                    raise Exception("Unable to retrieve authentication keys")
+                return key
+            await self._refresh(now)
+            return self._keys.get(kid)
+
+    async def _refresh(self, now: float) -> None:
+        self._last_fetch = now
+        try:
+            jwks_data, max_age = await _fetch_jwks()
+        except Exception:
+            if not self._keys:
+                raise
+            logger.warning("JWKS refresh failed, keeping %d cached keys", len(self._keys))
+            self._expires_at = now + self.min_refresh_interval
+            return
+
+        self._keys = build_jwk_keys(jwks_data)
+        ttl = self.default_ttl if max_age is None else max_age
+        self._expires_at = now + min(max(ttl, self.min_refresh_interval), self.max_ttl)
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._expires_at = 0.0
+        self._last_fetch = None
+
+
+jwks_cache = JWKSCache()
+
+
 class IDTokenValidationError(Exception):
     """Custom exception for ID token validation errors."""
 
@@ -94,26 +216,48 @@ def create_access_token(claims: Dict[str, Any], expires_minutes: Optional[int] =
     )
 
     token = jwt.encode(token_claims, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
-    # Log user hash instead of actual user ID to avoid exposing sensitive information
-    user_id = token_claims.get("sub", "unknown")
-    user_hash = hashlib.sha256(str(user_id).encode()).hexdigest()[:8] if user_id != "unknown" else "unknown"
-    logger.debug("Authentication token created for user hash: %s", user_hash)
+    if logger.isEnabledFor(logging.DEBUG):
+        # Log user hash instead of actual user ID to avoid exposing sensitive information
+        logger.debug("Authentication token created for user hash: %s", _user_hash(token_claims.get("sub", "unknown")))
     return token
 
 
-def decode_access_token(token: str) -> Dict[str, Any]:
-    """Decode and validate JWT access token."""
+class AccessTokenClaims:
+    """Verified access token claims, shared by every request that presents the same token."""
+
+    __slots__ = ("payload", "sub", "exp", "user")
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+        self.sub = payload.get("sub")
+        self.exp = payload.get("exp")
+        # User object built once from the claims; get_current_user hands out a copy per request
+        self.user = None
+
+
+@lru_cache(maxsize=4)
+def _token_cache_key(secret: str) -> bytes:
+    return hashlib.sha256(secret.encode("utf-8")).digest()
+
+
+def _token_digest(token: str) -> bytes:
+    # Keyed by the signing secret, so rotating the secret never serves tokens verified under the old one
+    return hashlib.blake2b(token.encode("utf-8"), key=_token_cache_key(settings.jwt_secret_key), digest_size=16).digest()
+
+
+def verify_access_token(token: str) -> AccessTokenClaims:
+    """Verify a JWT access token, returning cached claims for tokens already verified."""
     if not settings.jwt_secret_key:
         logger.error("JWT secret key is not configured")
         raise AccessTokenError("Authentication service is misconfigured")
 
+    digest = _token_digest(token)
+    claims = _access_token_cache.get(digest)
+    if claims is not None:
+        return claims
+
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        # Log user hash instead of actual user ID to avoid exposing sensitive information
-        user_id = payload.get("sub", "unknown")
-        user_hash = hashlib.sha256(str(user_id).encode()).hexdigest()[:8] if user_id != "unknown" else "unknown"
-        logger.debug("Authentication token validated for user hash: %s", user_hash)
-        return payload
     except ExpiredSignatureError as exc:
         logger.info("Authentication token has expired")
         raise AccessTokenError("Token has expired") from exc
@@ -122,6 +266,28 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         logger.warning("Token validation failed: %s", type(exc).__name__)
         raise AccessTokenError("Invalid authentication token") from exc
 
+    if logger.isEnabledFor(logging.DEBUG):
+        # Log user hash instead of actual user ID to avoid exposing sensitive information
+        logger.debug("Authentication token validated for user hash: %s", _user_hash(payload.get("sub", "unknown")))
+
+    claims = AccessTokenClaims(payload)
+    if isinstance(claims.exp, (int, float)):
+        # Cache only until the token expires; tokens without exp are re-verified every time
+        remaining = claims.exp - time.time()
+        if remaining > 0:
+            _access_token_cache.set(digest, claims, ttl=remaining)
+    return claims
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Decode and validate JWT access token."""
+    return dict(verify_access_token(token).payload)
+
+
+def clear_access_token_cache() -> None:
+    """Forget all verified tokens, e.g. after revoking sessions."""
+    _access_token_cache.clear()
+
 
 async def validate_id_token(id_token: str) -> Optional[Dict[str, Any]]:
     """Validate ID token with proper JWT signature verification using JWKS."""
@@ -134,63 +300,26 @@ async def validate_id_token(id_token: str) -> Optional[Dict[str, Any]]:
             logger.error("ID token validation failed: No key ID found in JWT header")
             raise IDTokenValidationError("Token format is invalid", "missing_kid")
 
-        # Get JWKS from the provider
+        # Get the matching signing key, fetching the issuer's JWKS only when needed
         try:
-            jwks = await get_jwks()
+            key = await jwks_cache.get_key(kid)
         except Exception as e:
             logger.error(
                 f"ID token validation failed: Failed to fetch JWKS from issuer {settings.oidc_issuer_url}: {e}"
             )
             raise IDTokenValidationError("Unable to retrieve authentication keys", "jwks_fetch_error")
 
-        # Find the matching key
-        key = None
-        for jwk in jwks.get("keys", []):
-            if jwk.get("kid") == kid:
-                key = jwk
-                break
-
         if not key:
             logger.error(
                 f"ID token validation failed: No key found for kid: {kid} in JWKS from {settings.oidc_issuer_url}"
             )
             raise IDTokenValidationError("Authentication key validation failed", "key_not_found")
 
-        # Convert JWK to PEM format for jose library
-        import base64
-
-        from cryptography.hazmat.primitives import serialization
-        from cryptography.hazmat.primitives.asymmetric import rsa
-
-        def base64url_decode(inp):
-            """Decode base64url-encoded string."""
-            padding = 4 - (len(inp) % 4)
-            if padding != 4:
-                inp += "=" * padding
-            return base64.urlsafe_b64decode(inp)
-
-        try:
-            # Extract RSA components
-            n = int.from_bytes(base64url_decode(key["n"]), "big")
-            e = int.from_bytes(base64url_decode(key["e"]), "big")
-
-            # Construct RSA public key
-            public_numbers = rsa.RSAPublicNumbers(e, n)
-            public_key = public_numbers.public_key()
-
-            # Convert to PEM format
-            pem_key = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM, format=serialization.PublicFormat.SubjectPublicKeyInfo
-            )
-        except Exception as e:
-            logger.error(f"ID token validation failed: Failed to convert JWK to PEM format: {e}")
-            raise IDTokenValidationError("Authentication key processing failed", "key_conversion_error")
-
         # Verify and decode the JWT
         try:
             payload = jwt.decode(
                 id_token,
-                pem_key,
+                key,
                 algorithms=["RS256"],
                 issuer=settings.oidc_issuer_url,
                 audience=settings.oidc_client_id,
@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Any
+from typing import Any, Dict
 
 from pydantic_settings import BaseSettings
 
@@ -25,6 +25,41 @@ class Settings(BaseSettings):
     # Environment
     environment: str = "development"  # development, staging, production
 
+    # Authorization
+    admin_trust_token_role: bool = False  # accept the JWT role claim on admin routes without a profile lookup
+    oidc_state_store: str = "database"  # database (any number of workers) or memory (single worker only)
+
+    # Outbound HTTP connection pools (see core.http_clients)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = False  # requires the optional `h2` package
+    oss_http_timeout: float = 120.0
+    oidc_http_timeout: float = 5.0
+    images_http_timeout: float = 30.0
+
+    # Storage backend and resumable uploads (see services.storage_backends, services.chunked_uploads)
+    storage_backend: str = "oss"  # oss (ObjectStorage service) or local (files under storage_local_dir)
+    storage_local_dir: str = "data/storage"
+    storage_local_url_ttl_seconds: int = 3600  # lifetime of signed download URLs of the local backend
+    storage_upload_dir: str = ""  # staging directory for chunked uploads, a temp directory when empty
+    storage_upload_chunk_bytes: int = 2 * 1024 * 1024  # largest chunk accepted per request
+    storage_upload_max_bytes: int = 200 * 1024 * 1024
+    storage_upload_ttl_seconds: int = 86400  # unfinished uploads are removed after this
+
+    # AI Hub gentxt response cache (see services.aihub_cache)
+    aihub_cache_max_entries: int = 1024
+    aihub_cache_max_bytes: int = 64 * 1024 * 1024
+    aihub_cache_ttl_seconds: int = 86400
+    aihub_cache_dir: str = ""  # optional on-disk tier, off when empty
+    aihub_cache_max_disk_bytes: int = 512 * 1024 * 1024
+
+    # AI Hub backpressure (see services.aihub_limits)
+    aihub_max_concurrency: int = 4  # concurrent provider calls per model
+    aihub_model_concurrency: Dict[str, int] = {}  # per-model overrides, e.g. {"gemini-3-pro-image-preview": 2}
+    aihub_max_queue: int = 16  # waiting requests per model before shedding with 429
+    aihub_queue_timeout_seconds: float = 30.0  # longest wait for a slot before 503
+
     @property
     def backend_url(self) -> str:
         """Generate backend URL from host and port."""
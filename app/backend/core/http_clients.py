@@ -0,0 +1,101 @@
+"""
+Shared outbound HTTP clients, one connection pool per upstream.
+
+Every upstream (ObjectStorage service, OIDC issuer, image downloads) gets one
+long-lived `httpx.AsyncClient`, so calls reuse keep-alive connections instead
+of doing a TCP/TLS handshake each time. Clients are created on first use and
+closed in the application lifespan (`close_all`).
+
+Pool sizes are configured with the `http_max_connections`,
+`http_max_keepalive_connections` and `http_keepalive_expiry` settings, and the
+per-upstream timeouts with `oss_http_timeout`, `oidc_http_timeout` and
+`images_http_timeout`. HTTP/2 is used when `http2_enabled` is set and the
+optional `h2` package is installed.
+"""
+
+import importlib.util
+import logging
+from typing import Dict, Optional
+
+import httpx
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OSS = "oss"
+OIDC = "oidc"
+IMAGES = "images"
+
+
+def _http2_enabled() -> bool:
+    if not settings.http2_enabled:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+class HTTPClientManager:
+    """Lazily created, shared `httpx.AsyncClient` per upstream."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._request_counts: Dict[str, int] = {}
+
+    def _create(self, upstream: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        timeout = getattr(settings, f"{upstream}_http_timeout")
+        self._request_counts[upstream] = 0
+
+        async def count_request(request: httpx.Request) -> None:
+            self._request_counts[upstream] += 1
+
+        logger.info(f"Creating shared HTTP client for {upstream} (timeout={timeout}s, limits={limits})")
+        return httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits,
+            http2=_http2_enabled(),
+            event_hooks={"request": [count_request]},
+        )
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """Return the shared client for `upstream`, creating it on first use."""
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._clients[upstream] = self._create(upstream)
+        return client
+
+    async def close_all(self) -> None:
+        for upstream, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client for {upstream}: {e}")
+        self._clients.clear()
+
+    def pool_stats(self) -> Dict[str, Dict[str, Optional[int]]]:
+        """Connection pool usage per upstream, for sizing the pools."""
+        stats = {}
+        for upstream, client in self._clients.items():
+            # httpx does not expose its pool; read it from the default transport when it is there
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            idle = sum(1 for connection in connections if connection.is_idle())
+            stats[upstream] = {
+                "requests": self._request_counts.get(upstream, 0),
+                "connections": len(connections),
+                "active": len(connections) - idle,
+                "idle": idle,
+                "queued": sum(1 for request in getattr(pool, "_requests", []) if request.is_queued()),
+                "max_connections": getattr(pool, "_max_connections", None),
+                "max_keepalive_connections": getattr(pool, "_max_keepalive_connections", None),
+            }
+        return stats
+
+
+http_clients = HTTPClientManager()
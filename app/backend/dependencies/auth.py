@@ -3,10 +3,14 @@ import logging
 from datetime import datetime
 from typing import Optional
 
-from core.auth import AccessTokenError, decode_access_token
+from core.auth import AccessTokenError, verify_access_token
+from core.config import settings
+from core.database import get_db
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from schemas.auth import UserResponse
+from services.user_roles import UserRoleService
+from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
@@ -24,28 +28,18 @@ async def get_bearer_token(
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication credentials were not provided")
 
 
-async def get_current_user(token: str = Depends(get_bearer_token)) -> UserResponse:
-    """Dependency to get current authenticated user via JWT token."""
-    try:
-        payload = decode_access_token(token)
-    except AccessTokenError as exc:
-        # Log error type only, not the full exception which may contain sensitive token data
-        logger.warning("Token validation failed: %s", type(exc).__name__)
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=exc.message)
-
+def _build_user(payload: dict) -> UserResponse:
     user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
-
     last_login_raw = payload.get("last_login")
     last_login = None
     if isinstance(last_login_raw, str):
         try:
             last_login = datetime.fromisoformat(last_login_raw)
         except ValueError:
-            # Log user hash instead of actual user ID to avoid exposing sensitive information
-            user_hash = hashlib.sha256(str(user_id).encode()).hexdigest()[:8] if user_id else "unknown"
-            logger.debug("Failed to parse last_login for user hash: %s", user_hash)
+            if logger.isEnabledFor(logging.DEBUG):
+                # Log user hash instead of actual user ID to avoid exposing sensitive information
+                user_hash = hashlib.sha256(str(user_id).encode()).hexdigest()[:8] if user_id else "unknown"
+                logger.debug("Failed to parse last_login for user hash: %s", user_hash)
 
     return UserResponse(
         id=user_id,
@@ -56,8 +50,55 @@ async def get_current_user(token: str = Depends(get_bearer_token)) -> UserRespon
     )
 
 
+async def get_current_user(token: str = Depends(get_bearer_token)) -> UserResponse:
+    """Dependency to get current authenticated user via JWT token.
+
+    Verified tokens are cached until they expire, and the user object is built
+    once per token, so repeat requests cost a cache lookup.
+    """
+    try:
+        claims = verify_access_token(token)
+    except AccessTokenError as exc:
+        # Log error type only, not the full exception which may contain sensitive token data
+        logger.warning("Token validation failed: %s", type(exc).__name__)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=exc.message)
+
+    if not claims.sub:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
+
+    if claims.user is None:
+        claims.user = _build_user(claims.payload)
+    # A copy per request, so a handler changing current_user cannot leak into other requests with the same token
+    return claims.user.model_copy()
+
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> Optional[UserResponse]:
+    """Dependency returning the authenticated user, or None when no bearer token was sent."""
+    if not credentials or credentials.scheme.lower() != "bearer":
+        return None
+    return await get_current_user(credentials.credentials)
+
+
 async def get_admin_user(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
     """Dependency to ensure current user has admin role."""
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
+
+
+async def require_admin_profile(
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> UserResponse:
+    """Dependency to ensure current user's users_extended profile has the admin role.
+
+    The role is served from an in-process cache. With `admin_trust_token_role`
+    enabled, an admin role claim in the access token is accepted as is.
+    """
+    if settings.admin_trust_token_role and current_user.role == "admin":
+        return current_user
+    if await UserRoleService(db).get_role(current_user.id) != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
@@ -4,15 +4,23 @@ This handler simulates Nginx routing logic within Lambda
 """
 import asyncio
 import base64
+import gzip
+import hashlib
 import json
 import logging
 import os
+import re
 import traceback
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from urllib.parse import unquote
 
 from mangum import Mangum
 
+try:
+    import brotli  # optional, adds br variants of static assets
+except ImportError:  # pragma: no cover - depends on the deployment package
+    brotli = None
+
 # Configure logging
 logger = logging.getLogger()
 if logger.hasHandlers():
@@ -35,6 +43,42 @@ seo_paths = set()
 # SEO domain placeholder - will be replaced with actual request domain at runtime
 SEO_DOMAIN_PLACEHOLDER = "https://atoms.template.com"
 
+# Static assets are loaded into memory once per cold start, see build_static_manifest()
+STATIC_ROOT = "/var/task/frontend/dist"
+STATIC_CONTENT_TYPES = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".ico": "image/x-icon",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+    ".eot": "application/vnd.ms-fontobject",
+}
+# Already compressed formats are not worth gzip/brotli
+COMPRESSIBLE_CONTENT_TYPES = {
+    "application/javascript",
+    "text/css",
+    "image/svg+xml",
+    "image/x-icon",
+    "font/ttf",
+    "font/otf",
+    "application/vnd.ms-fontobject",
+}
+# Vite output such as /assets/index-BuVJVs3k.js: the name changes whenever the content does.
+# Files copied from public/ keep their names and are revalidated instead.
+HASHED_ASSET_DIR = "/assets/"
+HASHED_ASSET_PATTERN = re.compile(r"-[A-Za-z0-9_]{8}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+static_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+
 
 def format_traceback() -> str:
     """Format traceback with newlines replaced by '\\n' string literal"""
@@ -75,6 +119,73 @@ def initialize_dynamic_routes():
         dynamic_routes_initialized = True
 
 
+def is_hashed_asset(url_path: str) -> bool:
+    return url_path.startswith(HASHED_ASSET_DIR) and HASHED_ASSET_PATTERN.search(url_path) is not None
+
+
+# Suffix of the strong ETag of each compressed variant, which has different bytes than the file
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+def _encode_body(content: bytes, content_type: str, encoded: bool) -> Dict[str, Any]:
+    if not encoded and content_type.startswith("text/"):
+        return {"body": content.decode("utf-8"), "isBase64Encoded": False}
+    return {"body": base64.b64encode(content).decode("ascii"), "isBase64Encoded": True}
+
+
+def build_static_manifest(root: str = STATIC_ROOT) -> Dict[str, Dict[str, Any]]:
+    """Load every static asset under `root` with its headers and ready-to-send (compressed) bodies.
+
+    Bodies are stored already decoded or base64-encoded, so serving an asset is a dict lookup.
+    """
+    manifest = {}
+    if not os.path.isdir(root):
+        return manifest
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            content_type = STATIC_CONTENT_TYPES.get(os.path.splitext(name)[1].lower())
+            if content_type is None:
+                continue
+            file_path = os.path.join(dirpath, name)
+            with open(file_path, "rb") as f:
+                content = f.read()
+
+            digest = hashlib.sha256(content).hexdigest()[:32]
+            variants = {"identity": _encode_body(content, content_type, encoded=False)}
+            if content_type in COMPRESSIBLE_CONTENT_TYPES:
+                compressed = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    compressed["br"] = brotli.compress(content)
+                for encoding, data in compressed.items():
+                    if len(data) < len(content):
+                        variants[encoding] = _encode_body(data, content_type, encoded=True)
+            for encoding, variant in variants.items():
+                variant["etag"] = f'"{digest}{ETAG_SUFFIXES[encoding]}"'
+
+            url_path = "/" + os.path.relpath(file_path, root).replace(os.sep, "/")
+            manifest[url_path] = {
+                "content_type": content_type,
+                "cache_control": IMMUTABLE_CACHE_CONTROL if is_hashed_asset(url_path) else REVALIDATE_CACHE_CONTROL,
+                "variants": variants,
+            }
+    return manifest
+
+
+def initialize_static_manifest():
+    """Build the static asset manifest on the first request (cold start)"""
+    global static_manifest
+
+    if static_manifest is not None:
+        return
+
+    try:
+        static_manifest = build_static_manifest()
+        logger.info(f"Static manifest initialized: files={len(static_manifest)}")
+    except Exception as e:
+        logger.error(f"Failed to build static manifest: {e}\n{format_traceback()}")
+        static_manifest = {}
+
+
 async def initialize_services_once():
     """Initialize all services once for the Lambda function (equivalent to FastAPI lifespan startup)"""
     global services_initialized
@@ -92,12 +203,15 @@ async def initialize_services_once():
             from services.database import initialize_database
             from services.mock_data import initialize_mock_data
             from services.auth import initialize_admin_user
+            from services.oidc_state import sweep_oidc_states
             # MODULE_IMPORTS_END
 
             # MODULE_STARTUP_START
             await initialize_database()
             await initialize_mock_data()
             await initialize_admin_user()
+            # No background tasks while the instance is frozen, so sweep once per cold start
+            await sweep_oidc_states()
             # MODULE_STARTUP_END
 
             services_initialized = True
@@ -169,8 +283,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     AWS Lambda handler function that simulates Nginx routing
     """
     try:
-        # Initialize dynamic routes on first request (cold start)
+        # Initialize dynamic routes and static assets on first request (cold start)
         initialize_dynamic_routes()
+        initialize_static_manifest()
         
         # Extract request information from the event
         # Support both API Gateway v1 and v2 event formats
@@ -241,11 +356,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
                 "body": json.dumps({"error": "Not found"}),
             }
-        elif path.endswith(
-            (".js", ".css", ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg", ".woff", ".woff2", ".ttf", ".eot")
-        ):
+        elif path.lower().endswith(tuple(STATIC_CONTENT_TYPES)):
             # Serve static files
-            return serve_static_file(path)
+            return serve_static_file(path, headers or {})
         
         elif path == "/sitemap.xml":
             return serve_sitemap(request_domain)
@@ -363,44 +476,68 @@ def serve_frontend() -> Dict[str, Any]:
         }
 
 
-def serve_static_file(path: str) -> Dict[str, Any]:
-    """Serve static files"""
-    # Map file extensions to content types
-    content_types = {
-        ".js": "application/javascript",
-        ".css": "text/css",
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".gif": "image/gif",
-        ".ico": "image/x-icon",
-        ".svg": "image/svg+xml",
-    }
+def _header(headers: dict, name: str) -> str:
+    """Case-insensitive header lookup (API Gateway v1 keeps the client's casing)"""
+    value = headers.get(name)
+    if value is None:
+        value = next((v for k, v in headers.items() if k.lower() == name), "")
+    return value or ""
 
-    # Get file extension
-    ext = os.path.splitext(path)[1].lower()
-    content_type = content_types.get(ext, "application/octet-stream")
 
-    # Try to read the file
-    file_path = f"/var/task/frontend/dist{path}"
-    if os.path.exists(file_path):
-        with open(file_path, "rb") as f:
-            content = f.read()
-        return {
-            "statusCode": 200,
-            "headers": {"Content-Type": content_type, "Access-Control-Allow-Origin": "*"},
-            "body": content.decode("utf-8")
-            if content_type.startswith("text/")
-            else base64.b64encode(content).decode("utf-8"),
-            "isBase64Encoded": not content_type.startswith("text/"),
-        }
-    else:
+def _accepted_encodings(accept_encoding: str) -> set:
+    encodings = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        encodings.add(token.strip().lower())
+    return encodings
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def serve_static_file(path: str, headers: Optional[dict] = None) -> Dict[str, Any]:
+    """Serve static files from the in-memory manifest, with ETag revalidation and precompressed variants"""
+    headers = headers or {}
+    asset = (static_manifest or {}).get(path)
+    if asset is None:
         return {
             "statusCode": 404,
             "headers": {"Content-Type": "text/plain", "Access-Control-Allow-Origin": "*"},
             "body": "File not found",
         }
 
+    variants = asset["variants"]
+    accepted = _accepted_encodings(_header(headers, "accept-encoding"))
+    encoding = next((name for name in ("br", "gzip") if name in variants and name in accepted), "identity")
+    variant = variants[encoding]
+
+    response_headers = {
+        "Content-Type": asset["content_type"],
+        "Access-Control-Allow-Origin": "*",
+        "Cache-Control": asset["cache_control"],
+        "ETag": variant["etag"],
+    }
+    if len(variants) > 1:
+        response_headers["Vary"] = "Accept-Encoding"
+
+    # Compared against the variant being served, so a cached gzip body is never confirmed for a br client
+    if _etag_matches(_header(headers, "if-none-match"), variant["etag"]):
+        return {"statusCode": 304, "headers": response_headers, "body": ""}
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    return {
+        "statusCode": 200,
+        "headers": response_headers,
+        "body": variant["body"],
+        "isBase64Encoded": variant["isBase64Encoded"],
+    }
+
 
 def handle_config_request(headers: dict, query_params: dict) -> Dict[str, Any]:
     """Handle configuration requests with security filtering"""
@@ -14,6 +14,9 @@ from fastapi.routing import APIRouter
 from services.database import initialize_database, close_database
 from services.mock_data import initialize_mock_data
 from services.auth import initialize_admin_user
+from services.oidc_state import start_oidc_state_sweeper, stop_oidc_state_sweeper
+from core.http_clients import http_clients
+from services.aihub import close_ai_client
 # MODULE_IMPORTS_END
 
 
@@ -67,11 +70,15 @@ async def lifespan(app: FastAPI):
     await initialize_database()
     await initialize_mock_data()
     await initialize_admin_user()
+    start_oidc_state_sweeper()
     # MODULE_STARTUP_END
 
     logger.info("=== Application startup completed successfully ===")
     yield
     # MODULE_SHUTDOWN_START
+    await stop_oidc_state_sweeper()
+    await http_clients.close_all()
+    await close_ai_client()
     await close_database()
     # MODULE_SHUTDOWN_END
 
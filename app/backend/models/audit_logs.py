@@ -1,10 +1,14 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 
 class Audit_logs(Base):
     __tablename__ = "audit_logs"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_audit_logs_table_name_created_at", "table_name", "created_at"),
+        Index("ix_audit_logs_created_at", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     table_name = Column(String, nullable=False)
@@ -1,19 +1,23 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 
 class Consignments(Base):
     __tablename__ = "consignments"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_consignments_user_id_id", "user_id", "id"),
+        Index("ix_consignments_affiliate_id_created_at", "affiliate_id", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     user_id = Column(String, nullable=False)
     affiliate_id = Column(String, nullable=False)
-    inventory_id = Column(Integer, nullable=False)
+    inventory_id = Column(Integer, nullable=False, index=True)
     quantity = Column(Integer, nullable=False)
     consigned_date = Column(DateTime(timezone=True), nullable=True)
     return_date = Column(DateTime(timezone=True), nullable=True)
-    status = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), nullable=True)
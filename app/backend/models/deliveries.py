@@ -1,19 +1,23 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 
 
 class Deliveries(Base):
     __tablename__ = "deliveries"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_deliveries_user_id_id", "user_id", "id"),
+        Index("ix_deliveries_driver_id_scheduled_date", "driver_id", "scheduled_date"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     user_id = Column(String, nullable=False)
     driver_id = Column(String, nullable=False)
-    consignment_id = Column(Integer, nullable=False)
+    consignment_id = Column(Integer, nullable=False, index=True)
     delivery_address = Column(String, nullable=False)
     scheduled_date = Column(DateTime(timezone=True), nullable=True)
     completed_date = Column(DateTime(timezone=True), nullable=True)
-    status = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
     route_priority = Column(Integer, nullable=False)
     signature_url = Column(String, nullable=True)
     photo_url = Column(String, nullable=True)
@@ -7,15 +7,15 @@ class Inventory(Base):
     __table_args__ = {"extend_existing": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
-    sku = Column(String, nullable=False)
+    sku = Column(String, nullable=False, unique=True, index=True)
     product_name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     category = Column(String, nullable=True)
     unit_cost = Column(Float, nullable=False)
     retail_price = Column(Float, nullable=False)
-    status = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
     location = Column(String, nullable=True)
-    barcode = Column(String, nullable=True)
+    barcode = Column(String, nullable=True, unique=True, index=True)
     created_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), nullable=True)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from core.database import Base
+from sqlalchemy import Column, Date, Float, Integer, String, UniqueConstraint
+
+
+class Payment_revenue_daily(Base):
+    """Daily payment revenue rollup, maintained incrementally by PaymentsService"""
+
+    __tablename__ = "payment_revenue_daily"
+    __table_args__ = (
+        UniqueConstraint("day", "affiliate_id", "payment_type", "status", name="uq_payment_revenue_daily_bucket"),
+        {"extend_existing": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
+    day = Column(Date, nullable=False)
+    affiliate_id = Column(String, nullable=False)
+    payment_type = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    payment_count = Column(Integer, nullable=False, default=0)
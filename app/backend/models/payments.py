@@ -1,19 +1,23 @@
 from core.database import Base
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 
 
 class Payments(Base):
     __tablename__ = "payments"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_payments_user_id_id", "user_id", "id"),
+        Index("ix_payments_affiliate_id_created_at", "affiliate_id", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True, nullable=False)
     user_id = Column(String, nullable=False)
     affiliate_id = Column(String, nullable=False)
-    consignment_id = Column(Integer, nullable=True)
+    consignment_id = Column(Integer, nullable=True, index=True)
     amount = Column(Float, nullable=False)
     payment_type = Column(String, nullable=False)
     payment_date = Column(DateTime(timezone=True), nullable=True)
-    status = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -7,7 +7,7 @@ class Users_extended(Base):
     __table_args__ = {"extend_existing": True}
 
     id = Column(String, primary_key=True, index=True, nullable=False)
-    role = Column(String, nullable=False)
+    role = Column(String, nullable=False, index=True)
     status = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
     phone = Column(String, nullable=True)
@@ -6,10 +6,14 @@ from typing import Optional, List
 from datetime import datetime
 
 from core.database import get_db
-from dependencies.auth import get_current_user
+from core.http_clients import http_clients
+from dependencies.auth import require_admin_profile
 from schemas.auth import UserResponse
 from models.users_extended import Users_extended
 from models.audit_logs import Audit_logs
+from services.aihub_limits import aihub_metrics
+from services.analytics import AnalyticsService, invalidate_analytics
+from services.user_roles import invalidate_user_roles
 from sqlalchemy import select, func, and_
 
 logger = logging.getLogger(__name__)
@@ -42,19 +46,10 @@ class AnalyticsResponse(BaseModel):
 @router.post("/users/create")
 async def create_user(
     data: CreateUserRequest,
-    current_user: UserResponse = Depends(get_current_user),
+    current_user: UserResponse = Depends(require_admin_profile),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin-only: Create a new user account"""
-    # Check if current user is admin
-    result = await db.execute(
-        select(Users_extended).where(Users_extended.id == current_user.id)
-    )
-    admin_user = result.scalar_one_or_none()
-    
-    if not admin_user or admin_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     # In production, this would create auth.users entry first
     # For now, we'll create the extended user profile
     try:
@@ -68,6 +63,8 @@ async def create_user(
         )
         db.add(new_user)
         await db.commit()
+        invalidate_analytics()
+        invalidate_user_roles()
         await db.refresh(new_user)
         
         return {"success": True, "user_id": new_user.id}
@@ -79,19 +76,10 @@ async def create_user(
 @router.post("/users/update-status")
 async def update_user_status(
     data: UpdateUserStatusRequest,
-    current_user: UserResponse = Depends(get_current_user),
+    current_user: UserResponse = Depends(require_admin_profile),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin-only: Update user status (active/suspended)"""
-    # Check if current user is admin
-    result = await db.execute(
-        select(Users_extended).where(Users_extended.id == current_user.id)
-    )
-    admin_user = result.scalar_one_or_none()
-    
-    if not admin_user or admin_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     try:
         result = await db.execute(
             select(Users_extended).where(Users_extended.id == data.user_id)
@@ -103,6 +91,8 @@ async def update_user_status(
         
         user.status = data.status
         await db.commit()
+        invalidate_analytics()
+        invalidate_user_roles()
         
         return {"success": True, "user_id": user.id, "status": user.status}
     except Exception as e:
@@ -112,29 +102,13 @@ async def update_user_status(
 
 @router.get("/analytics", response_model=AnalyticsResponse)
 async def get_analytics(
-    current_user: UserResponse = Depends(get_current_user),
+    current_user: UserResponse = Depends(require_admin_profile),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin-only: Get platform analytics"""
-    # Check if current user is admin
-    result = await db.execute(
-        select(Users_extended).where(Users_extended.id == current_user.id)
-    )
-    admin_user = result.scalar_one_or_none()
-    
-    if not admin_user or admin_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     try:
-        # This would query actual data in production
-        return AnalyticsResponse(
-            total_inventory=0,
-            warehouse_count=0,
-            consigned_count=0,
-            sold_count=0,
-            total_affiliates=0,
-            active_deliveries=0,
-        )
+        summary = await AnalyticsService(db).get_summary()
+        return AnalyticsResponse(**summary)
     except Exception as e:
         logger.error(f"Error fetching analytics: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch analytics: {str(e)}")
@@ -145,19 +119,10 @@ async def get_audit_logs(
     skip: int = 0,
     limit: int = 50,
     table_name: Optional[str] = None,
-    current_user: UserResponse = Depends(get_current_user),
+    current_user: UserResponse = Depends(require_admin_profile),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin-only: Get audit logs"""
-    # Check if current user is admin
-    result = await db.execute(
-        select(Users_extended).where(Users_extended.id == current_user.id)
-    )
-    admin_user = result.scalar_one_or_none()
-    
-    if not admin_user or admin_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     try:
         query = select(Audit_logs).order_by(Audit_logs.created_at.desc())
         
@@ -171,4 +136,16 @@ async def get_audit_logs(
         return {"logs": [log.__dict__ for log in logs], "total": len(logs)}
     except Exception as e:
         logger.error(f"Error fetching audit logs: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch logs: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to fetch logs: {str(e)}")
+
+
+@router.get("/http-pools")
+async def get_http_pool_stats(current_user: UserResponse = Depends(require_admin_profile)):
+    """Admin-only: Get outbound HTTP connection pool usage per upstream"""
+    return {"pools": http_clients.pool_stats()}
+
+
+@router.get("/aihub-metrics")
+async def get_aihub_metrics(current_user: UserResponse = Depends(require_admin_profile)):
+    """Admin-only: Get AI Hub per-model concurrency, queue depth and wait times"""
+    return aihub_metrics()
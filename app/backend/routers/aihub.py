@@ -6,12 +6,17 @@ Provides Generate Text (gentxt) and Generate Image (genimg) API endpoints.
 import ast
 import json
 import logging
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from dependencies.auth import get_optional_user
+from fastapi import APIRouter, Depends, HTTPException, status
 from schemas.aihub import GenImgRequest, GenImgResponse, GenTxtRequest
+from schemas.auth import UserResponse
 from services.aihub import AIHubService, InvalidImageInputError
+from services.aihub_limits import AIHubOverloadedError
 from sse_starlette.sse import EventSourceResponse
+from starlette.background import BackgroundTask
+from utils.streaming import coalesce_text
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +111,7 @@ async def generate_text(
     Use the `stream` request parameter to control streaming behavior:
     - stream=false: return a full JSON response
     - stream=true: return an SSE streaming response
+      (deltas are coalesced into one event per `stream_flush_ms` / `stream_flush_chars`, default 30 ms / 256 chars)
 
     Available models:
     - gpt-5-chat: high stability and compliance, suitable for JSON output and customer service scenarios
@@ -119,10 +125,24 @@ async def generate_text(
 
         # Decide response mode based on the `stream` parameter
         if request.stream:
+            # Reserve capacity first, so an overloaded model gets a 429/503 rather than an SSE error
+            stream, slot = await service.start_gentxt_stream(request)
+
+            async def close_stream():
+                # Runs once the response is over, also when the client left before the first event
+                # and the stream never started (its own cleanup then never runs)
+                try:
+                    await stream.aclose()
+                finally:
+                    if slot is not None:
+                        slot.release()
+
             # Streaming response - wrap content in JSON for SSE
             async def event_generator():
                 try:
-                    async for content in service.gentxt_stream(request):
+                    async for content in coalesce_text(
+                        stream, request.stream_flush_ms / 1000, request.stream_flush_chars
+                    ):
                         yield json.dumps({"content": content})
                 except Exception as e:
                     logger.error(f"Stream error: {e}")
@@ -130,12 +150,21 @@ async def generate_text(
                 finally:
                     yield "[DONE]"
 
-            return EventSourceResponse(event_generator(), media_type="text/event-stream")
+            try:
+                return EventSourceResponse(
+                    event_generator(), media_type="text/event-stream", background=BackgroundTask(close_stream)
+                )
+            except Exception:
+                await close_stream()
+                raise
         else:
             # Non-streaming response
             response = await service.gentxt(request)
             return response
 
+    except AIHubOverloadedError as e:
+        logger.warning(f"AI request shed: {e}")
+        raise HTTPException(status_code=e.status_code, detail=e.message, headers={"Retry-After": str(e.retry_after)})
     except ValueError as e:
         logger.error(f"AI service configuration error: {e}")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=extract_error_message(e))
@@ -150,6 +179,7 @@ async def generate_text(
 @router.post("/genimg", response_model=GenImgResponse)
 async def generate_image(
     request: GenImgRequest,
+    current_user: Optional[UserResponse] = Depends(get_optional_user),
 ):
     """
     Text-to-Image / Image-to-Image endpoint.
@@ -166,7 +196,12 @@ async def generate_image(
     - size: image size (1024x1024 / 1024x1792 / 1792x1024)
     - quality: image quality (standard / hd). Only effective for text-to-image; ignored when `image` is provided.
     - n: number of images to generate (1-4)
+    - output: `base64` (default, inline data URIs), `url` (provider URLs) or `storage` (upload to `bucket_name`,
+      return presigned download URLs and object keys; requires authentication)
     """
+    if request.output == "storage" and current_user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required for storage output")
+
     try:
         service = AIHubService()
         return await service.genimg(request)
@@ -174,6 +209,9 @@ async def generate_image(
     except InvalidImageInputError as e:
         logger.warning(f"Invalid image input: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except AIHubOverloadedError as e:
+        logger.warning(f"AI request shed: {e}")
+        raise HTTPException(status_code=e.status_code, detail=e.message, headers={"Retry-After": str(e.retry_after)})
     except ValueError as e:
         logger.error(f"AI service configuration error: {e}")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=extract_error_message(e))
@@ -10,11 +10,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
 from services.audit_logs import Audit_logsService
+from utils.export import export_response, validate_export_format
+from utils.serialization import ORJSONResponse, list_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/entities/audit_logs", tags=["audit_logs"])
+router = APIRouter(prefix="/api/v1/entities/audit_logs", tags=["audit_logs"], default_response_class=ORJSONResponse)
 
 
 # ---------- Pydantic Schemas ----------
@@ -58,9 +60,10 @@ class Audit_logsResponse(BaseModel):
 class Audit_logsListResponse(BaseModel):
     """List response schema"""
     items: List[Audit_logsResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class Audit_logsBatchCreateRequest(BaseModel):
@@ -87,11 +90,13 @@ class Audit_logsBatchDeleteRequest(BaseModel):
 # ---------- Routes ----------
 @router.get("", response_model=Audit_logsListResponse)
 async def query_audit_logss(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     """Query audit_logss with filtering, sorting, and pagination"""
@@ -112,11 +117,18 @@ async def query_audit_logss(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} audit_logss")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(Audit_logsResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for audit_logss: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying audit_logss: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -124,11 +136,13 @@ async def query_audit_logss(
 
 @router.get("/all", response_model=Audit_logsListResponse)
 async def query_audit_logss_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query audit_logss with filtering, sorting, and pagination without user limitation
@@ -148,17 +162,61 @@ async def query_audit_logss_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} audit_logss")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(Audit_logsResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for audit_logss: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying audit_logss: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/export")
+async def export_audit_logs(
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
+    fields: str = Query(None, description="Comma-separated list of fields to export"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every matching audit_logs row as NDJSON or CSV"""
+    logger.debug(f"Exporting audit_logs: format={format}, query={query}, sort={sort}, fields={fields}")
+
+    service = Audit_logsService(db)
+    try:
+        validate_export_format(format)
+        query_dict = None
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+
+        export_query, columns = service.export_query(
+            query_dict=query_dict,
+            sort=sort,
+            fields=fields,
+        )
+        return export_response(db, export_query, columns, format, "audit_logs")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid export request for audit_logs: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting audit_logs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.get("/{id}", response_model=Audit_logsResponse)
 async def get_audit_logs(
     id: int,
@@ -170,11 +228,14 @@ async def get_audit_logs(
     
     service = Audit_logsService(db)
     try:
-        result = await service.get_by_id(id)
+        result = await service.get_by_id(id, fields=fields)
         if not result:
             logger.warning(f"Audit_logs with id {id} not found")
             raise HTTPException(status_code=404, detail="Audit_logs not found")
         
+        if fields:
+            # Projected rows are slim dicts that do not match the full response model
+            return ORJSONResponse(content=result)
         return result
     except HTTPException:
         raise
@@ -216,13 +277,10 @@ async def create_audit_logss_batch(
     logger.debug(f"Batch creating {len(request.items)} audit_logss")
     
     service = Audit_logsService(db)
-    results = []
     
     try:
-        for item_data in request.items:
-            result = await service.create(item_data.model_dump())
-            if result:
-                results.append(result)
+        items_data = [item.model_dump() for item in request.items]
+        results = await service.batch_create(items_data)
         
         logger.info(f"Batch created {len(results)} audit_logss successfully")
         return results
@@ -241,15 +299,11 @@ async def update_audit_logss_batch(
     logger.debug(f"Batch updating {len(request.items)} audit_logss")
     
     service = Audit_logsService(db)
-    results = []
     
     try:
-        for item in request.items:
-            # Only include non-None values for partial updates
-            update_dict = {k: v for k, v in item.updates.model_dump().items() if v is not None}
-            result = await service.update(item.id, update_dict)
-            if result:
-                results.append(result)
+        # None values are skipped by the service, so partial updates are preserved
+        items_to_update = [item.model_dump() for item in request.items]
+        results = await service.batch_update(items_to_update)
         
         logger.info(f"Batch updated {len(results)} audit_logss successfully")
         return results
@@ -298,13 +352,9 @@ async def delete_audit_logss_batch(
     logger.debug(f"Batch deleting {len(request.ids)} audit_logss")
     
     service = Audit_logsService(db)
-    deleted_count = 0
     
     try:
-        for item_id in request.ids:
-            success = await service.delete(item_id)
-            if success:
-                deleted_count += 1
+        deleted_count = await service.delete_batch(request.ids)
         
         logger.info(f"Batch deleted {deleted_count} audit_logss successfully")
         return {"message": f"Successfully deleted {deleted_count} audit_logss", "deleted_count": deleted_count}
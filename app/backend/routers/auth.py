@@ -15,6 +15,7 @@ from core.auth import (
 )
 from core.config import settings
 from core.database import get_db
+from core.http_clients import OIDC, http_clients
 from dependencies.auth import get_current_user
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import RedirectResponse
@@ -138,17 +139,16 @@ async def callback(
         if code_verifier:
             token_data["code_verifier"] = code_verifier
 
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                f"{settings.oidc_issuer_url}/token",
-                data=token_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded", "X-Request-ID": state},
-            )
+        token_response = await http_clients.get(OIDC).post(
+            f"{settings.oidc_issuer_url}/token",
+            data=token_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded", "X-Request-ID": state},
+        )
 
-            if token_response.status_code != 200:
-                return redirect_with_error(f"Token exchange failed: {token_response.text}")
+        if token_response.status_code != 200:
+            return redirect_with_error(f"Token exchange failed: {token_response.text}")
 
-            tokens = token_response.json()
+        tokens = token_response.json()
 
         # Validate ID token
         id_token = tokens.get("id_token")
@@ -214,12 +214,11 @@ async def exchange_platform_token(
     logger.debug(f"[token/exchange] Verifying token with issuer: {verify_url}")
 
     try:
-        async with httpx.AsyncClient() as client:
-            verify_response = await client.post(
-                verify_url,
-                json={"platform_token": payload.platform_token},
-                headers={"Content-Type": "application/json"},
-            )
+        verify_response = await http_clients.get(OIDC).post(
+            verify_url,
+            json={"platform_token": payload.platform_token},
+            headers={"Content-Type": "application/json"},
+        )
         logger.debug(f"[token/exchange] Issuer response status: {verify_response.status_code}")
     except httpx.HTTPError as exc:
         logger.error(f"[token/exchange] HTTP error verifying platform token: {exc}", exc_info=True)
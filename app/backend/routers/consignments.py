@@ -12,11 +12,13 @@ from core.database import get_db
 from services.consignments import ConsignmentsService
 from dependencies.auth import get_current_user
 from schemas.auth import UserResponse
+from utils.export import export_response, validate_export_format
+from utils.serialization import ORJSONResponse, list_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/entities/consignments", tags=["consignments"])
+router = APIRouter(prefix="/api/v1/entities/consignments", tags=["consignments"], default_response_class=ORJSONResponse)
 
 
 # ---------- Pydantic Schemas ----------
@@ -70,9 +72,10 @@ class ConsignmentsResponse(BaseModel):
 class ConsignmentsListResponse(BaseModel):
     """List response schema"""
     items: List[ConsignmentsResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class ConsignmentsBatchCreateRequest(BaseModel):
@@ -99,11 +102,13 @@ class ConsignmentsBatchDeleteRequest(BaseModel):
 # ---------- Routes ----------
 @router.get("", response_model=ConsignmentsListResponse)
 async def query_consignmentss(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -125,12 +130,19 @@ async def query_consignmentss(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
             user_id=str(current_user.id),
         )
         logger.debug(f"Found {result['total']} consignmentss")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(ConsignmentsResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for consignmentss: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying consignmentss: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -138,11 +150,13 @@ async def query_consignmentss(
 
 @router.get("/all", response_model=ConsignmentsListResponse)
 async def query_consignmentss_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query consignmentss with filtering, sorting, and pagination without user limitation
@@ -162,17 +176,63 @@ async def query_consignmentss_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} consignmentss")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(ConsignmentsResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for consignmentss: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying consignmentss: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/export")
+async def export_consignments(
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
+    fields: str = Query(None, description="Comma-separated list of fields to export"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every matching consignments row as NDJSON or CSV (user can only see their own records)"""
+    logger.debug(f"Exporting consignments: format={format}, query={query}, sort={sort}, fields={fields}")
+
+    service = ConsignmentsService(db)
+    try:
+        validate_export_format(format)
+        query_dict = None
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+
+        export_query, columns = service.export_query(
+            user_id=str(current_user.id),
+            query_dict=query_dict,
+            sort=sort,
+            fields=fields,
+        )
+        return export_response(db, export_query, columns, format, "consignments")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid export request for consignments: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting consignments: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.get("/{id}", response_model=ConsignmentsResponse)
 async def get_consignments(
     id: int,
@@ -185,11 +245,14 @@ async def get_consignments(
     
     service = ConsignmentsService(db)
     try:
-        result = await service.get_by_id(id, user_id=str(current_user.id))
+        result = await service.get_by_id(id, user_id=str(current_user.id), fields=fields)
         if not result:
             logger.warning(f"Consignments with id {id} not found")
             raise HTTPException(status_code=404, detail="Consignments not found")
         
+        if fields:
+            # Projected rows are slim dicts that do not match the full response model
+            return ORJSONResponse(content=result)
         return result
     except HTTPException:
         raise
@@ -233,13 +296,10 @@ async def create_consignmentss_batch(
     logger.debug(f"Batch creating {len(request.items)} consignmentss")
     
     service = ConsignmentsService(db)
-    results = []
     
     try:
-        for item_data in request.items:
-            result = await service.create(item_data.model_dump(), user_id=str(current_user.id))
-            if result:
-                results.append(result)
+        items_data = [item.model_dump() for item in request.items]
+        results = await service.batch_create(items_data, user_id=str(current_user.id))
         
         logger.info(f"Batch created {len(results)} consignmentss successfully")
         return results
@@ -259,15 +319,11 @@ async def update_consignmentss_batch(
     logger.debug(f"Batch updating {len(request.items)} consignmentss")
     
     service = ConsignmentsService(db)
-    results = []
     
     try:
-        for item in request.items:
-            # Only include non-None values for partial updates
-            update_dict = {k: v for k, v in item.updates.model_dump().items() if v is not None}
-            result = await service.update(item.id, update_dict, user_id=str(current_user.id))
-            if result:
-                results.append(result)
+        # None values are skipped by the service, so partial updates are preserved
+        items_to_update = [item.model_dump() for item in request.items]
+        results = await service.batch_update(items_to_update, user_id=str(current_user.id))
         
         logger.info(f"Batch updated {len(results)} consignmentss successfully")
         return results
@@ -318,13 +374,9 @@ async def delete_consignmentss_batch(
     logger.debug(f"Batch deleting {len(request.ids)} consignmentss")
     
     service = ConsignmentsService(db)
-    deleted_count = 0
     
     try:
-        for item_id in request.ids:
-            success = await service.delete(item_id, user_id=str(current_user.id))
-            if success:
-                deleted_count += 1
+        deleted_count = await service.delete_batch(request.ids, user_id=str(current_user.id))
         
         logger.info(f"Batch deleted {deleted_count} consignmentss successfully")
         return {"message": f"Successfully deleted {deleted_count} consignmentss", "deleted_count": deleted_count}
@@ -12,11 +12,13 @@ from core.database import get_db
 from services.deliveries import DeliveriesService
 from dependencies.auth import get_current_user
 from schemas.auth import UserResponse
+from utils.export import export_response, validate_export_format
+from utils.serialization import ORJSONResponse, list_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/entities/deliveries", tags=["deliveries"])
+router = APIRouter(prefix="/api/v1/entities/deliveries", tags=["deliveries"], default_response_class=ORJSONResponse)
 
 
 # ---------- Pydantic Schemas ----------
@@ -79,9 +81,10 @@ class DeliveriesResponse(BaseModel):
 class DeliveriesListResponse(BaseModel):
     """List response schema"""
     items: List[DeliveriesResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class DeliveriesBatchCreateRequest(BaseModel):
@@ -108,11 +111,13 @@ class DeliveriesBatchDeleteRequest(BaseModel):
 # ---------- Routes ----------
 @router.get("", response_model=DeliveriesListResponse)
 async def query_deliveriess(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -134,12 +139,19 @@ async def query_deliveriess(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
             user_id=str(current_user.id),
         )
         logger.debug(f"Found {result['total']} deliveriess")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(DeliveriesResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for deliveriess: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying deliveriess: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -147,11 +159,13 @@ async def query_deliveriess(
 
 @router.get("/all", response_model=DeliveriesListResponse)
 async def query_deliveriess_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query deliveriess with filtering, sorting, and pagination without user limitation
@@ -171,17 +185,63 @@ async def query_deliveriess_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} deliveriess")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(DeliveriesResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for deliveriess: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying deliveriess: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/export")
+async def export_deliveries(
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
+    fields: str = Query(None, description="Comma-separated list of fields to export"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every matching deliveries row as NDJSON or CSV (user can only see their own records)"""
+    logger.debug(f"Exporting deliveries: format={format}, query={query}, sort={sort}, fields={fields}")
+
+    service = DeliveriesService(db)
+    try:
+        validate_export_format(format)
+        query_dict = None
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+
+        export_query, columns = service.export_query(
+            user_id=str(current_user.id),
+            query_dict=query_dict,
+            sort=sort,
+            fields=fields,
+        )
+        return export_response(db, export_query, columns, format, "deliveries")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid export request for deliveries: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting deliveries: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.get("/{id}", response_model=DeliveriesResponse)
 async def get_deliveries(
     id: int,
@@ -194,11 +254,14 @@ async def get_deliveries(
     
     service = DeliveriesService(db)
     try:
-        result = await service.get_by_id(id, user_id=str(current_user.id))
+        result = await service.get_by_id(id, user_id=str(current_user.id), fields=fields)
         if not result:
             logger.warning(f"Deliveries with id {id} not found")
             raise HTTPException(status_code=404, detail="Deliveries not found")
         
+        if fields:
+            # Projected rows are slim dicts that do not match the full response model
+            return ORJSONResponse(content=result)
         return result
     except HTTPException:
         raise
@@ -242,13 +305,10 @@ async def create_deliveriess_batch(
     logger.debug(f"Batch creating {len(request.items)} deliveriess")
     
     service = DeliveriesService(db)
-    results = []
     
     try:
-        for item_data in request.items:
-            result = await service.create(item_data.model_dump(), user_id=str(current_user.id))
-            if result:
-                results.append(result)
+        items_data = [item.model_dump() for item in request.items]
+        results = await service.batch_create(items_data, user_id=str(current_user.id))
         
         logger.info(f"Batch created {len(results)} deliveriess successfully")
         return results
@@ -268,15 +328,11 @@ async def update_deliveriess_batch(
     logger.debug(f"Batch updating {len(request.items)} deliveriess")
     
     service = DeliveriesService(db)
-    results = []
     
     try:
-        for item in request.items:
-            # Only include non-None values for partial updates
-            update_dict = {k: v for k, v in item.updates.model_dump().items() if v is not None}
-            result = await service.update(item.id, update_dict, user_id=str(current_user.id))
-            if result:
-                results.append(result)
+        # None values are skipped by the service, so partial updates are preserved
+        items_to_update = [item.model_dump() for item in request.items]
+        results = await service.batch_update(items_to_update, user_id=str(current_user.id))
         
         logger.info(f"Batch updated {len(results)} deliveriess successfully")
         return results
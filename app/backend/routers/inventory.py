@@ -10,11 +10,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
 from services.inventory import InventoryService
+from utils.export import export_response, validate_export_format
+from utils.serialization import ORJSONResponse, list_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/entities/inventory", tags=["inventory"])
+router = APIRouter(prefix="/api/v1/entities/inventory", tags=["inventory"], default_response_class=ORJSONResponse)
 
 
 # ---------- Pydantic Schemas ----------
@@ -73,9 +75,10 @@ class InventoryResponse(BaseModel):
 class InventoryListResponse(BaseModel):
     """List response schema"""
     items: List[InventoryResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class InventoryBatchCreateRequest(BaseModel):
@@ -102,11 +105,13 @@ class InventoryBatchDeleteRequest(BaseModel):
 # ---------- Routes ----------
 @router.get("", response_model=InventoryListResponse)
 async def query_inventorys(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     """Query inventorys with filtering, sorting, and pagination"""
@@ -127,11 +132,18 @@ async def query_inventorys(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} inventorys")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(InventoryResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for inventorys: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying inventorys: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -139,11 +151,13 @@ async def query_inventorys(
 
 @router.get("/all", response_model=InventoryListResponse)
 async def query_inventorys_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query inventorys with filtering, sorting, and pagination without user limitation
@@ -163,17 +177,61 @@ async def query_inventorys_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} inventorys")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(InventoryResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for inventorys: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying inventorys: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/export")
+async def export_inventory(
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
+    fields: str = Query(None, description="Comma-separated list of fields to export"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every matching inventory row as NDJSON or CSV"""
+    logger.debug(f"Exporting inventory: format={format}, query={query}, sort={sort}, fields={fields}")
+
+    service = InventoryService(db)
+    try:
+        validate_export_format(format)
+        query_dict = None
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+
+        export_query, columns = service.export_query(
+            query_dict=query_dict,
+            sort=sort,
+            fields=fields,
+        )
+        return export_response(db, export_query, columns, format, "inventory")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid export request for inventory: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting inventory: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.get("/{id}", response_model=InventoryResponse)
 async def get_inventory(
     id: int,
@@ -185,11 +243,14 @@ async def get_inventory(
     
     service = InventoryService(db)
     try:
-        result = await service.get_by_id(id)
+        result = await service.get_by_id(id, fields=fields)
         if not result:
             logger.warning(f"Inventory with id {id} not found")
             raise HTTPException(status_code=404, detail="Inventory not found")
         
+        if fields:
+            # Projected rows are slim dicts that do not match the full response model
+            return ORJSONResponse(content=result)
         return result
     except HTTPException:
         raise
@@ -231,13 +292,10 @@ async def create_inventorys_batch(
     logger.debug(f"Batch creating {len(request.items)} inventorys")
     
     service = InventoryService(db)
-    results = []
     
     try:
-        for item_data in request.items:
-            result = await service.create(item_data.model_dump())
-            if result:
-                results.append(result)
+        items_data = [item.model_dump() for item in request.items]
+        results = await service.batch_create(items_data)
         
         logger.info(f"Batch created {len(results)} inventorys successfully")
         return results
@@ -310,13 +368,9 @@ async def delete_inventorys_batch(
     logger.debug(f"Batch deleting {len(request.ids)} inventorys")
     
     service = InventoryService(db)
-    deleted_count = 0
     
     try:
-        for item_id in request.ids:
-            success = await service.delete(item_id)
-            if success:
-                deleted_count += 1
+        deleted_count = await service.delete_batch(request.ids)
         
         logger.info(f"Batch deleted {deleted_count} inventorys successfully")
         return {"message": f"Successfully deleted {deleted_count} inventorys", "deleted_count": deleted_count}
@@ -10,13 +10,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
 from services.payments import PaymentsService
-from dependencies.auth import get_current_user
+from services.payment_rollups import DIMENSIONS, PaymentRollupService
+from dependencies.auth import get_admin_user, get_current_user
 from schemas.auth import UserResponse
+from utils.export import export_response, validate_export_format
+from utils.serialization import ORJSONResponse, list_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/entities/payments", tags=["payments"])
+router = APIRouter(prefix="/api/v1/entities/payments", tags=["payments"], default_response_class=ORJSONResponse)
 
 
 # ---------- Pydantic Schemas ----------
@@ -70,9 +73,10 @@ class PaymentsResponse(BaseModel):
 class PaymentsListResponse(BaseModel):
     """List response schema"""
     items: List[PaymentsResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class PaymentsBatchCreateRequest(BaseModel):
@@ -96,14 +100,32 @@ class PaymentsBatchDeleteRequest(BaseModel):
     ids: List[int]
 
 
+class PaymentsRevenueItem(BaseModel):
+    """Revenue for one period, broken down by the requested dimensions"""
+    period: date
+    affiliate_id: Optional[str] = None
+    payment_type: Optional[str] = None
+    status: Optional[str] = None
+    total_amount: float
+    payment_count: int
+
+
+class PaymentsRevenueResponse(BaseModel):
+    """Revenue report response"""
+    granularity: str
+    items: List[PaymentsRevenueItem]
+
+
 # ---------- Routes ----------
 @router.get("", response_model=PaymentsListResponse)
 async def query_paymentss(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -125,12 +147,19 @@ async def query_paymentss(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
             user_id=str(current_user.id),
         )
         logger.debug(f"Found {result['total']} paymentss")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(PaymentsResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for paymentss: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying paymentss: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -138,11 +167,13 @@ async def query_paymentss(
 
 @router.get("/all", response_model=PaymentsListResponse)
 async def query_paymentss_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query paymentss with filtering, sorting, and pagination without user limitation
@@ -162,17 +193,99 @@ async def query_paymentss_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} paymentss")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(PaymentsResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for paymentss: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying paymentss: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/revenue", response_model=PaymentsRevenueResponse)
+async def get_payments_revenue(
+    granularity: str = Query("day", description="Period size: day, week or month"),
+    start: date = Query(None, description="First day to include (inclusive)"),
+    end: date = Query(None, description="Last day to include (inclusive)"),
+    group_by: str = Query(",".join(DIMENSIONS), description="Comma-separated breakdown fields: affiliate_id, payment_type, status (empty for totals per period)"),
+    affiliate_id: str = Query(None, description="Only include this affiliate"),
+    payment_type: str = Query(None, description="Only include this payment type"),
+    status: str = Query(None, description="Only include this payment status"),
+    _current_user: UserResponse = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get payment revenue by day, week or month from the pre-aggregated daily rollup (admin only, covers all users)"""
+    logger.debug(f"Fetching payments revenue: granularity={granularity}, start={start}, end={end}, group_by={group_by}")
+
+    service = PaymentRollupService(db)
+    try:
+        dimensions = [name.strip() for name in group_by.split(",") if name.strip()]
+        items = await service.get_revenue(
+            granularity=granularity,
+            start=start,
+            end=end,
+            group_by=dimensions,
+            affiliate_id=affiliate_id,
+            payment_type=payment_type,
+            status=status,
+        )
+        return {"granularity": granularity, "items": items}
+    except ValueError as e:
+        logger.warning(f"Invalid revenue query: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching payments revenue: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/export")
+async def export_payments(
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
+    fields: str = Query(None, description="Comma-separated list of fields to export"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every matching payments row as NDJSON or CSV (user can only see their own records)"""
+    logger.debug(f"Exporting payments: format={format}, query={query}, sort={sort}, fields={fields}")
+
+    service = PaymentsService(db)
+    try:
+        validate_export_format(format)
+        query_dict = None
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+
+        export_query, columns = service.export_query(
+            user_id=str(current_user.id),
+            query_dict=query_dict,
+            sort=sort,
+            fields=fields,
+        )
+        return export_response(db, export_query, columns, format, "payments")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid export request for payments: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting payments: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.get("/{id}", response_model=PaymentsResponse)
 async def get_payments(
     id: int,
@@ -185,11 +298,14 @@ async def get_payments(
     
     service = PaymentsService(db)
     try:
-        result = await service.get_by_id(id, user_id=str(current_user.id))
+        result = await service.get_by_id(id, user_id=str(current_user.id), fields=fields)
         if not result:
             logger.warning(f"Payments with id {id} not found")
             raise HTTPException(status_code=404, detail="Payments not found")
         
+        if fields:
+            # Projected rows are slim dicts that do not match the full response model
+            return ORJSONResponse(content=result)
         return result
     except HTTPException:
         raise
@@ -256,15 +372,11 @@ async def update_paymentss_batch(
     logger.debug(f"Batch updating {len(request.items)} paymentss")
     
     service = PaymentsService(db)
-    results = []
     
     try:
-        for item in request.items:
-            # Only include non-None values for partial updates
-            update_dict = {k: v for k, v in item.updates.model_dump().items() if v is not None}
-            result = await service.update(item.id, update_dict, user_id=str(current_user.id))
-            if result:
-                results.append(result)
+        # None values are skipped by the service, so partial updates are preserved
+        items_to_update = [item.model_dump() for item in request.items]
+        results = await service.batch_update(items_to_update, user_id=str(current_user.id))
         
         logger.info(f"Batch updated {len(results)} paymentss successfully")
         return results
@@ -315,13 +427,9 @@ async def delete_paymentss_batch(
     logger.debug(f"Batch deleting {len(request.ids)} paymentss")
     
     service = PaymentsService(db)
-    deleted_count = 0
     
     try:
-        for item_id in request.ids:
-            success = await service.delete(item_id, user_id=str(current_user.id))
-            if success:
-                deleted_count += 1
+        deleted_count = await service.delete_batch(request.ids, user_id=str(current_user.id))
         
         logger.info(f"Batch deleted {deleted_count} paymentss successfully")
         return {"message": f"Successfully deleted {deleted_count} paymentss", "deleted_count": deleted_count}
@@ -1,9 +1,15 @@
 import logging
+from typing import Any, AsyncIterator, Dict, List
 
 from dependencies.auth import get_admin_user, get_current_user
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from schemas.auth import UserResponse
 from schemas.storage import (
+    BatchDeleteRequest,
+    BatchDeleteResponse,
+    BatchPresignRequest,
+    BatchPresignResponse,
     BucketListResponse,
     BucketRequest,
     BucketResponse,
@@ -11,13 +17,14 @@ from schemas.storage import (
     FileUpDownRequest,
     FileUpDownResponse,
     ObjectInfo,
+    ObjectListRequest,
     ObjectListResponse,
     ObjectRequest,
-    OSSBaseModel,
     RenameRequest,
     RenameResponse,
 )
-from services.storage import StorageService
+from services.storage import StorageService, storage_cache_stats
+from utils.export import EXPORT_FORMATS, encode_ndjson
 
 logger = logging.getLogger(__name__)
 
@@ -57,9 +64,11 @@ async def list_buckets(_current_user: UserResponse = Depends(get_current_user)):
 
 
 @router.get("/list-objects", response_model=ObjectListResponse)
-async def list_objects(request: OSSBaseModel = Depends(), _current_user: UserResponse = Depends(get_current_user)):
+async def list_objects(request: ObjectListRequest = Depends(), _current_user: UserResponse = Depends(get_current_user)):
     """
-    List objects under the bucket
+    List one page of objects under the bucket.
+
+    Pass `next_continuation_token` back as `continuation_token` to get the next page.
     """
     try:
         service = StorageService()
@@ -72,6 +81,42 @@ async def list_objects(request: OSSBaseModel = Depends(), _current_user: UserRes
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
 
 
+async def _listing_lines(first: ObjectListResponse, pages: AsyncIterator[ObjectListResponse]) -> AsyncIterator[List[Dict[str, Any]]]:
+    page = first
+    while page is not None:
+        yield [{"prefix": prefix} for prefix in page.prefixes] + [obj.model_dump() for obj in page.objects]
+        try:
+            page = await pages.__anext__()
+        except StopAsyncIteration:
+            page = None
+        except Exception as e:
+            # The status line has already been sent once streaming starts, so failures can only be logged
+            logger.error(f"Error streaming object listing: {e}")
+            raise
+
+
+@router.get("/list-objects/stream")
+async def stream_objects(request: ObjectListRequest = Depends(), _current_user: UserResponse = Depends(get_current_user)):
+    """
+    Stream every object under the bucket (and prefix) as NDJSON, one object per line.
+
+    With a delimiter, common prefixes are sent as `{"prefix": ...}` lines. Pages are fetched
+    from OSS one at a time as the client reads, so large buckets are never held in memory.
+    """
+    try:
+        service = StorageService()
+        pages = service.iter_objects(request)
+        # Fetch the first page before responding so errors still get a proper status code
+        first = await pages.__anext__()
+    except ValueError as e:
+        logger.error(f"Invalid list objects request: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to list objects: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
+    return StreamingResponse(encode_ndjson(_listing_lines(first, pages)), media_type=EXPORT_FORMATS["ndjson"])
+
+
 @router.get("/get-object-info", response_model=ObjectInfo)
 async def get_object_info(request: ObjectRequest = Depends(), _current_user: UserResponse = Depends(get_current_user)):
     """
@@ -120,6 +165,22 @@ async def delete_object(request: ObjectRequest, _current_user: UserResponse = De
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
 
 
+@router.delete("/delete-objects", response_model=BatchDeleteResponse)
+async def delete_objects(request: BatchDeleteRequest, _current_user: UserResponse = Depends(get_current_user)):
+    """
+    Delete many objects inside the bucket, with a result per key
+    """
+    try:
+        service = StorageService()
+        return await service.delete_objects(request)
+    except ValueError as e:
+        logger.error(f"Invalid delete objects: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to delete objects: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
+
+
 @router.post("/upload-url", response_model=FileUpDownResponse)
 async def upload_file(request: FileUpDownRequest, _current_user: UserResponse = Depends(get_current_user)):
     """
@@ -157,3 +218,29 @@ async def download_file(request: FileUpDownRequest, _current_user: UserResponse
     except Exception as e:
         logger.error(f"Failed to generate download URL: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
+
+
+@router.post("/batch-presign", response_model=BatchPresignResponse)
+async def batch_presign(request: BatchPresignRequest, _current_user: UserResponse = Depends(get_current_user)):
+    """
+    Get presigned upload or download URLs for many files in one request.
+
+    Items are presigned concurrently; an item that fails carries an `error` instead of a URL.
+    """
+    try:
+        service = StorageService()
+        return await service.presign_many(request)
+    except ValueError as e:
+        logger.error(f"Invalid batch presign request: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to generate presigned URLs: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(_current_user: UserResponse = Depends(get_admin_user)):
+    """
+    Get hit rates of the presigned URL, object metadata and bucket list caches
+    """
+    return storage_cache_stats()
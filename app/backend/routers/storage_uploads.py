@@ -0,0 +1,127 @@
+import logging
+import os
+
+from dependencies.auth import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+from schemas.auth import UserResponse
+from schemas.storage import ChunkedUploadRequest, ChunkedUploadStatus, DeleteResponse, FileUpDownResponse
+from services.chunked_uploads import UploadNotFoundError, UploadOffsetError, get_upload_store
+from services.storage_backends import LocalStorageBackend, get_storage_backend, guess_content_type
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/storage", tags=["storage"])
+
+
+def _upload_error(e: Exception, action: str) -> HTTPException:
+    if isinstance(e, UploadNotFoundError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if isinstance(e, UploadOffsetError):
+        # Upload-Offset tells the client where to resume
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=e.message, headers={"Upload-Offset": str(e.received)}
+        )
+    if isinstance(e, ValueError):
+        logger.error(f"Invalid {action} request: {e}")
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    logger.error(f"Failed to {action}: {e}")
+    return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{e}")
+
+
+@router.post("/uploads", response_model=ChunkedUploadStatus)
+async def start_upload(request: ChunkedUploadRequest, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Start a resumable upload.
+
+    Steps:
+    1. Client calls this endpoint with the bucket, object key and total size
+    2. Client sends the file in chunks of at most `chunk_size` bytes with
+       PUT /uploads/{upload_id}?offset=N, each chunk starting at `received`
+    3. After a dropped connection, GET /uploads/{upload_id} returns `received`
+       and the client continues from there
+    4. POST /uploads/{upload_id}/complete stores the object and returns its download URL
+    """
+    try:
+        return await get_upload_store().create(current_user.id, request)
+    except Exception as e:
+        raise _upload_error(e, "start upload")
+
+
+@router.get("/uploads/{upload_id}", response_model=ChunkedUploadStatus)
+async def get_upload(upload_id: str, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Get the progress of a resumable upload
+    """
+    try:
+        return await get_upload_store().status(upload_id, current_user.id)
+    except Exception as e:
+        raise _upload_error(e, "get upload")
+
+
+@router.put("/uploads/{upload_id}", response_model=ChunkedUploadStatus)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk in the file"),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Send one chunk of a resumable upload as the raw request body.
+
+    The body is streamed to disk as it arrives. A chunk that is cut off is discarded
+    and must be sent again from the same offset.
+    """
+    try:
+        return await get_upload_store().write_chunk(upload_id, current_user.id, offset, request.stream())
+    except Exception as e:
+        raise _upload_error(e, "upload chunk")
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=FileUpDownResponse)
+async def complete_upload(upload_id: str, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Finish a resumable upload and get a download URL for the stored object
+    """
+    try:
+        return await get_upload_store().complete(upload_id, current_user.id, get_storage_backend())
+    except Exception as e:
+        raise _upload_error(e, "complete upload")
+
+
+@router.delete("/uploads/{upload_id}", response_model=DeleteResponse)
+async def abort_upload(upload_id: str, current_user: UserResponse = Depends(get_current_user)):
+    """
+    Abandon a resumable upload and remove what was received
+    """
+    try:
+        await get_upload_store().abort(upload_id, current_user.id)
+        return DeleteResponse(success=True)
+    except Exception as e:
+        raise _upload_error(e, "abort upload")
+
+
+@router.get("/files/{bucket_name}/{object_key}")
+async def download_local_file(
+    bucket_name: str,
+    object_key: str,
+    expires: int = Query(...),
+    signature: str = Query(...),
+):
+    """
+    Serve an object of the local storage backend through a signed download URL
+    """
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    try:
+        valid = backend.verify(bucket_name, object_key, expires, signature)
+        path = backend.object_path(bucket_name, object_key)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    # FileResponse streams from the file (sendfile where the server supports it) instead of reading it into memory
+    return FileResponse(path, media_type=guess_content_type(object_key))
@@ -10,11 +10,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
 from services.users_extended import Users_extendedService
+from utils.export import export_response, validate_export_format
+from utils.serialization import ORJSONResponse, list_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/entities/users_extended", tags=["users_extended"])
+router = APIRouter(prefix="/api/v1/entities/users_extended", tags=["users_extended"], default_response_class=ORJSONResponse)
 
 
 # ---------- Pydantic Schemas ----------
@@ -55,9 +57,10 @@ class Users_extendedResponse(BaseModel):
 class Users_extendedListResponse(BaseModel):
     """List response schema"""
     items: List[Users_extendedResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class Users_extendedBatchCreateRequest(BaseModel):
@@ -84,11 +87,13 @@ class Users_extendedBatchDeleteRequest(BaseModel):
 # ---------- Routes ----------
 @router.get("", response_model=Users_extendedListResponse)
 async def query_users_extendeds(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     """Query users_extendeds with filtering, sorting, and pagination"""
@@ -109,11 +114,18 @@ async def query_users_extendeds(
             limit=limit,
             query_dict=query_dict,
             sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} users_extendeds")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(Users_extendedResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for users_extendeds: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying users_extendeds: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -121,11 +133,13 @@ async def query_users_extendeds(
 
 @router.get("/all", response_model=Users_extendedListResponse)
 async def query_users_extendeds_all(
-    query: str = Query(None, description="Query conditions (JSON string)"),
-    sort: str = Query(None, description="Sort field (prefix with '-' for descending)"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=2000, description="Max number of records to return"),
+    cursor: str = Query(None, description="Cursor from a previous page's next_cursor (keyset pagination, skip is ignored)"),
     fields: str = Query(None, description="Comma-separated list of fields to return"),
+    total: str = Query("exact", description="How to compute total: exact, estimate (planner statistics or a cached count) or none (skip counting)"),
     db: AsyncSession = Depends(get_db),
 ):
     # Query users_extendeds with filtering, sorting, and pagination without user limitation
@@ -145,17 +159,61 @@ async def query_users_extendeds_all(
             skip=skip,
             limit=limit,
             query_dict=query_dict,
-            sort=sort
+            sort=sort,
+            cursor=cursor,
+            fields=fields,
+            total_mode=total,
         )
         logger.debug(f"Found {result['total']} users_extendeds")
-        return result
+        # Rows go straight to orjson (projected rows are already slim dicts) without per-row validation
+        return list_response(Users_extendedResponse, result)
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.warning(f"Invalid query for users_extendeds: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying users_extendeds: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/export")
+async def export_users_extended(
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    query: str = Query(None, description="Query conditions (JSON string); values may be operator objects such as {\"$in\": [...]}, {\"$gte\": ...}, {\"$is_null\": true}"),
+    sort: str = Query(None, description="Comma-separated sort fields (prefix with '-' for descending)"),
+    fields: str = Query(None, description="Comma-separated list of fields to export"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every matching users_extended row as NDJSON or CSV"""
+    logger.debug(f"Exporting users_extended: format={format}, query={query}, sort={sort}, fields={fields}")
+
+    service = Users_extendedService(db)
+    try:
+        validate_export_format(format)
+        query_dict = None
+        if query:
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid query JSON format")
+
+        export_query, columns = service.export_query(
+            query_dict=query_dict,
+            sort=sort,
+            fields=fields,
+        )
+        return export_response(db, export_query, columns, format, "users_extended")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"Invalid export request for users_extended: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting users_extended: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @router.get("/{id}", response_model=Users_extendedResponse)
 async def get_users_extended(
     id: int,
@@ -167,11 +225,14 @@ async def get_users_extended(
     
     service = Users_extendedService(db)
     try:
-        result = await service.get_by_id(id)
+        result = await service.get_by_id(id, fields=fields)
         if not result:
             logger.warning(f"Users_extended with id {id} not found")
             raise HTTPException(status_code=404, detail="Users_extended not found")
         
+        if fields:
+            # Projected rows are slim dicts that do not match the full response model
+            return ORJSONResponse(content=result)
         return result
     except HTTPException:
         raise
@@ -213,13 +274,10 @@ async def create_users_extendeds_batch(
     logger.debug(f"Batch creating {len(request.items)} users_extendeds")
     
     service = Users_extendedService(db)
-    results = []
     
     try:
-        for item_data in request.items:
-            result = await service.create(item_data.model_dump())
-            if result:
-                results.append(result)
+        items_data = [item.model_dump() for item in request.items]
+        results = await service.batch_create(items_data)
         
         logger.info(f"Batch created {len(results)} users_extendeds successfully")
         return results
@@ -238,15 +296,11 @@ async def update_users_extendeds_batch(
     logger.debug(f"Batch updating {len(request.items)} users_extendeds")
     
     service = Users_extendedService(db)
-    results = []
     
     try:
-        for item in request.items:
-            # Only include non-None values for partial updates
-            update_dict = {k: v for k, v in item.updates.model_dump().items() if v is not None}
-            result = await service.update(item.id, update_dict)
-            if result:
-                results.append(result)
+        # None values are skipped by the service, so partial updates are preserved
+        items_to_update = [item.model_dump() for item in request.items]
+        results = await service.batch_update(items_to_update)
         
         logger.info(f"Batch updated {len(results)} users_extendeds successfully")
         return results
@@ -295,13 +349,9 @@ async def delete_users_extendeds_batch(
     logger.debug(f"Batch deleting {len(request.ids)} users_extendeds")
     
     service = Users_extendedService(db)
-    deleted_count = 0
     
     try:
-        for item_id in request.ids:
-            success = await service.delete(item_id)
-            if success:
-                deleted_count += 1
+        deleted_count = await service.delete_batch(request.ids)
         
         logger.info(f"Batch deleted {deleted_count} users_extendeds successfully")
         return {"message": f"Successfully deleted {deleted_count} users_extendeds", "deleted_count": deleted_count}
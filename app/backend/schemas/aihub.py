@@ -4,7 +4,7 @@ Request and response models for the AI Hub module.
 
 from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 # ==================== Generate Text ====================
 
@@ -55,6 +55,20 @@ class GenTxtRequest(BaseModel):
     stream: bool = Field(default=False, description="Whether to enable streaming output.")
     temperature: Optional[float] = Field(default=0.7, description="Sampling temperature (0-2).")
     max_tokens: Optional[int] = Field(default=4096, description="Maximum number of generated tokens.")
+    cache: bool = Field(
+        default=False,
+        description="Answer byte-identical requests from the response cache instead of calling the model again.",
+    )
+    stream_flush_ms: int = Field(
+        default=30,
+        ge=0,
+        description="Streaming only: longest time (ms) text is buffered before it is sent as an event; 0 sends every delta.",
+    )
+    stream_flush_chars: int = Field(
+        default=256,
+        ge=1,
+        description="Streaming only: buffered text is sent as soon as it reaches this many characters.",
+    )
 
 
 class GenTxtResponse(BaseModel):
@@ -90,11 +104,38 @@ class GenImgRequest(BaseModel):
         description="Image quality (only for text-to-image; ignored when `image` is provided).",
     )
     n: int = Field(default=1, description="Number of images to generate (1-4).")
+    output: Literal["base64", "url", "storage"] = Field(
+        default="base64",
+        description=(
+            "How images are returned: `base64` inlines data URIs; `url` passes provider URLs through "
+            "(images the provider returns inline stay data URIs); `storage` uploads the images to "
+            "`bucket_name` and returns presigned download URLs and object keys. Requires authentication."
+        ),
+    )
+    bucket_name: Optional[str] = Field(default=None, description="Target bucket for `output=storage`.")
+
+    @model_validator(mode="after")
+    def validate_output(self):
+        if self.output == "storage" and not self.bucket_name:
+            raise ValueError("bucket_name is required when output is 'storage'")
+        return self
+
+
+class GenImgObject(BaseModel):
+    """Generated image written to object storage."""
+
+    bucket_name: str = Field(..., description="Bucket the image was written to.")
+    object_key: str = Field(..., description="Object key of the image.")
+    content_type: str = Field(..., description="Image content type.")
+    size: int = Field(..., description="Image size in bytes.")
 
 
 class GenImgResponse(BaseModel):
     """Generate Image response."""
 
-    images: List[str] = Field(..., description="Generated image data URI list (base64).")
+    images: List[str] = Field(
+        ..., description="Generated images: base64 data URIs, or URLs for `output=url` / `output=storage`."
+    )
     model: str = Field(..., description="Name of the model used.")
     revised_prompt: Optional[str] = Field(default=None, description="Refined prompt used for generation.")
+    objects: Optional[List[GenImgObject]] = Field(default=None, description="Stored objects for `output=storage`.")
@@ -1,6 +1,6 @@
 import os
 import re
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -38,8 +38,23 @@ class ObjectInfo(OSSBaseModel):
     etag: str = ""
 
 
+MAX_LIST_KEYS = 1000
+
+
+class ObjectListRequest(OSSBaseModel):
+    """One page of a bucket listing, optionally restricted to a key prefix."""
+
+    prefix: str = Field(default="", description="Only list keys starting with this prefix")
+    delimiter: str = Field(default="", description="Group keys sharing a prefix up to this character (e.g. '/')")
+    max_keys: int = Field(default=MAX_LIST_KEYS, ge=1, le=MAX_LIST_KEYS, description="Maximum objects per page")
+    continuation_token: Optional[str] = Field(default=None, description="Token from the previous page")
+
+
 class ObjectListResponse(BaseModel):
     objects: list[ObjectInfo] = []
+    prefixes: list[str] = Field(default=[], description="Common prefixes when a delimiter is given")
+    next_continuation_token: Optional[str] = Field(default=None, description="Pass back to get the next page")
+    is_truncated: bool = False
 
 
 class BucketInfo(BucketRequest):
@@ -97,3 +112,64 @@ class RenameResponse(BaseModel):
 
 class DeleteResponse(BaseModel):
     success: bool = False
+
+
+MAX_BATCH_ITEMS = 200
+MAX_BATCH_DELETE_KEYS = 1000
+
+
+class BatchPresignRequest(BaseModel):
+    """Request for presigned URLs of many objects at once."""
+
+    operation: Literal["upload", "download"] = Field(..., description="Kind of presigned URL to create")
+    items: list[FileUpDownRequest] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchPresignItem(BaseModel):
+    """Presigned URL for one object, or the reason it could not be created."""
+
+    bucket_name: str
+    object_key: str
+    upload_url: str = ""
+    download_url: str = ""
+    expires_at: str = ""
+    error: Optional[str] = None
+
+
+class BatchPresignResponse(BaseModel):
+    items: list[BatchPresignItem] = []
+
+
+class BatchDeleteRequest(OSSBaseModel):
+    object_keys: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_DELETE_KEYS)
+
+
+class BatchDeleteItem(BaseModel):
+    object_key: str
+    success: bool = False
+    error: Optional[str] = None
+
+
+class BatchDeleteResponse(BaseModel):
+    deleted: int = 0
+    failed: int = 0
+    items: list[BatchDeleteItem] = []
+
+
+class ChunkedUploadRequest(FileUpDownRequest):
+    """Start a resumable upload of `size` bytes."""
+
+    size: int = Field(..., gt=0, description="Total size of the file in bytes")
+    content_type: str = Field(default="", description="MIME type, guessed from object_key when empty")
+
+
+class ChunkedUploadStatus(BaseModel):
+    """State of a resumable upload; the next chunk starts at `received`."""
+
+    upload_id: str
+    bucket_name: str
+    object_key: str
+    size: int
+    received: int = 0
+    chunk_size: int = Field(..., description="Largest chunk accepted per request")
+    expires_at: str = Field(..., description="Unfinished uploads are discarded after this time")
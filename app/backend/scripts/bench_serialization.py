@@ -0,0 +1,62 @@
+"""
+Microbenchmark: per-row cost of serializing an entity list response.
+
+Compares the validated path (Pydantic response model with from_attributes, then
+JSON encoding, as FastAPI does for a response_model) with the fast path used by
+the entity routers (direct row-to-dict conversion rendered by orjson).
+
+    python -m scripts.bench_serialization [rows] [repeats]
+"""
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from models.deliveries import Deliveries
+from routers.deliveries import DeliveriesListResponse, DeliveriesResponse
+from utils.serialization import list_response
+
+
+def make_rows(count: int):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Deliveries(
+            id=i,
+            user_id="user-1",
+            driver_id=f"driver-{i % 7}",
+            consignment_id=i,
+            delivery_address=f"{i} Long Example Street, Springfield",
+            scheduled_date=base + timedelta(hours=i),
+            completed_date=None,
+            status="PENDING",
+            route_priority=i % 5,
+            signature_url=f"https://example.com/signatures/{i}.png",
+            photo_url=f"https://example.com/photos/{i}.jpg",
+            notes="Leave at the front desk",
+            created_at=base,
+            updated_at=base,
+        )
+        for i in range(count)
+    ]
+
+
+def validated(result) -> bytes:
+    model = DeliveriesListResponse.model_validate(result)
+    return json.dumps(model.model_dump(mode="json"), separators=(",", ":")).encode("utf-8")
+
+
+def fast(result) -> bytes:
+    return list_response(DeliveriesResponse, result).body
+
+
+def main(rows: int = 2000, repeats: int = 20) -> None:
+    result = {"items": make_rows(rows), "total": rows, "skip": 0, "limit": rows, "next_cursor": None}
+    assert json.loads(validated(result)) == json.loads(fast(result))
+
+    for name, fn in (("validated", validated), ("fast", fast)):
+        seconds = min(timeit.repeat(lambda: fn(result), number=1, repeat=repeats))
+        print(f"{name:>10}: {seconds * 1000:8.2f} ms per {rows} rows, {seconds / rows * 1e6:6.2f} us/row")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
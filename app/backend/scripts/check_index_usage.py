@@ -0,0 +1,156 @@
+"""
+Check with EXPLAIN that the hot list/lookup queries are served by indexes.
+
+Works against SQLite (EXPLAIN QUERY PLAN) and PostgreSQL (EXPLAIN, with
+sequential scans disabled so small or empty tables still show whether an index
+is usable). Run it against the configured database after migrating:
+
+    python -m scripts.check_index_usage
+"""
+import asyncio
+import sys
+from typing import Any, List, NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from models.audit_logs import Audit_logs
+from models.consignments import Consignments
+from models.deliveries import Deliveries
+from models.inventory import Inventory
+from models.issues import Issues
+from models.payments import Payments
+from models.users_extended import Users_extended
+from utils.filters import compile_filters
+from utils.pagination import order_by_clauses, parse_sort
+
+
+class IndexCheck(NamedTuple):
+    description: str
+    statement: Any
+    index_name: str
+    # The index must also provide the ORDER BY, without a separate sort step
+    ordered: bool = False
+
+
+def _owner_page(model):
+    """The default list page: ownership filter, newest first."""
+    return (
+        select(model)
+        .where(model.user_id == "user-1")
+        .order_by(*order_by_clauses(parse_sort(model, None)))
+        .limit(20)
+    )
+
+
+def index_checks() -> List[IndexCheck]:
+    return [
+        IndexCheck("deliveries page for an owner", _owner_page(Deliveries), "ix_deliveries_user_id_id", ordered=True),
+        IndexCheck("payments page for an owner", _owner_page(Payments), "ix_payments_user_id_id", ordered=True),
+        IndexCheck("consignments page for an owner", _owner_page(Consignments), "ix_consignments_user_id_id", ordered=True),
+        IndexCheck("issues page for an owner", _owner_page(Issues), "ix_issues_user_id_id", ordered=True),
+        IndexCheck(
+            "inventory filtered by status",
+            select(Inventory).where(*compile_filters(Inventory, {"status": {"$in": ["WAREHOUSE", "CONSIGNED"]}})),
+            "ix_inventory_status",
+        ),
+        IndexCheck("inventory lookup by sku", select(Inventory).where(Inventory.sku == "SKU-1"), "ix_inventory_sku"),
+        IndexCheck("inventory lookup by barcode", select(Inventory).where(Inventory.barcode == "0001"), "ix_inventory_barcode"),
+        IndexCheck(
+            "consignments for an inventory item",
+            select(Consignments).where(Consignments.inventory_id == 1),
+            "ix_consignments_inventory_id",
+        ),
+        IndexCheck("issues for an inventory item", select(Issues).where(Issues.inventory_id == 1), "ix_issues_inventory_id"),
+        IndexCheck(
+            "deliveries for a consignment",
+            select(Deliveries).where(Deliveries.consignment_id == 1),
+            "ix_deliveries_consignment_id",
+        ),
+        IndexCheck("payments for a consignment", select(Payments).where(Payments.consignment_id == 1), "ix_payments_consignment_id"),
+        IndexCheck(
+            "payments for an affiliate, newest first",
+            select(Payments).where(Payments.affiliate_id == "aff-1").order_by(Payments.created_at.desc()).limit(20),
+            "ix_payments_affiliate_id_created_at",
+            ordered=True,
+        ),
+        IndexCheck(
+            "consignments for an affiliate, newest first",
+            select(Consignments).where(Consignments.affiliate_id == "aff-1").order_by(Consignments.created_at.desc()).limit(20),
+            "ix_consignments_affiliate_id_created_at",
+            ordered=True,
+        ),
+        IndexCheck(
+            "driver route in schedule order",
+            select(Deliveries).where(Deliveries.driver_id == "driver-1").order_by(Deliveries.scheduled_date).limit(50),
+            "ix_deliveries_driver_id_scheduled_date",
+            ordered=True,
+        ),
+        IndexCheck(
+            "audit logs for a table, newest first",
+            select(Audit_logs).where(Audit_logs.table_name == "payments").order_by(Audit_logs.created_at.desc()).limit(50),
+            "ix_audit_logs_table_name_created_at",
+            ordered=True,
+        ),
+        IndexCheck(
+            "audit logs, newest first",
+            select(Audit_logs).order_by(Audit_logs.created_at.desc()).limit(50),
+            "ix_audit_logs_created_at",
+            ordered=True,
+        ),
+        IndexCheck(
+            "affiliate count",
+            select(func.count()).select_from(Users_extended).where(Users_extended.role == "affiliate"),
+            "ix_users_extended_role",
+        ),
+    ]
+
+
+async def explain(conn: AsyncConnection, statement) -> str:
+    """Return the query plan for `statement` as text."""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(str(row[-1]) for row in result)
+    async with conn.begin():
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        result = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+        return "\n".join(str(row[0]) for row in result)
+
+
+def _has_sort_step(dialect_name: str, plan: str) -> bool:
+    if dialect_name == "sqlite":
+        return "USE TEMP B-TREE FOR ORDER BY" in plan
+    return any(line.strip().lstrip("-> ").startswith(("Sort", "Incremental Sort")) for line in plan.splitlines())
+
+
+async def check_index_usage(conn: AsyncConnection) -> List[str]:
+    """Run every check and return a description of each failure (empty when all pass)."""
+    failures = []
+    for check in index_checks():
+        plan = await explain(conn, check.statement)
+        if check.index_name not in plan:
+            failures.append(f"{check.description}: expected {check.index_name}\n{plan}")
+        elif check.ordered and _has_sort_step(conn.dialect.name, plan):
+            failures.append(f"{check.description}: {check.index_name} is used but rows are sorted separately\n{plan}")
+    return failures
+
+
+async def main() -> int:
+    from core.database import db_manager
+
+    await db_manager.ensure_initialized()
+    try:
+        async with db_manager.engine.connect() as conn:
+            failures = await check_index_usage(conn)
+    finally:
+        await db_manager.close_db()
+
+    for failure in failures:
+        print(f"FAIL {failure}\n")
+    print(f"{len(index_checks()) - len(failures)}/{len(index_checks())} index checks passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
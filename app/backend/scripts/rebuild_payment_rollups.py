@@ -0,0 +1,28 @@
+"""
+Rebuild the payment revenue rollup (payment_revenue_daily) from the payments table.
+
+The rollup is kept current by PaymentsService on every write; run this after
+bulk imports or manual SQL changes to payments, or to correct any drift:
+
+    python -m scripts.rebuild_payment_rollups
+"""
+import asyncio
+import logging
+
+from core.database import db_manager
+from services.payment_rollups import PaymentRollupService
+
+
+async def rebuild_payment_rollups():
+    await db_manager.ensure_initialized()
+    try:
+        async with db_manager.async_session_maker() as session:
+            bucket_count = await PaymentRollupService(session).rebuild()
+        print(f"Rebuilt payment revenue rollup: {bucket_count} daily buckets")
+    finally:
+        await db_manager.close_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild_payment_rollups())
@@ -3,18 +3,45 @@ AI Hub service layer implementation.
 Provides Generate Text (gentxt) and Generate Image (genimg) capabilities using the OpenAI SDK.
 """
 
+import asyncio
 import base64
+import hashlib
 import io
 import logging
-from typing import AsyncGenerator
+import uuid
+from typing import AsyncGenerator, Optional, Tuple
 
-import httpx
 from core.config import settings
+from core.http_clients import IMAGES, http_clients
 from openai import AsyncOpenAI
-from schemas.aihub import GenImgRequest, GenImgResponse, GenTxtRequest, GenTxtResponse
+from schemas.aihub import GenImgObject, GenImgRequest, GenImgResponse, GenTxtRequest, GenTxtResponse
+from schemas.storage import FileUpDownRequest
+from services.aihub_cache import gentxt_cache_key, get_gentxt_cache
+from services.aihub_limits import ModelSlot, model_limiter, single_flight
+from services.storage import StorageService
 
 logger = logging.getLogger(__name__)
 
+_ai_client: Optional[AsyncOpenAI] = None
+
+
+def get_ai_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client, so its connection pool is reused across requests."""
+    global _ai_client
+    if _ai_client is None:
+        _ai_client = AsyncOpenAI(
+            api_key=settings.app_ai_key,
+            base_url=settings.app_ai_base_url.rstrip("/"),
+        )
+    return _ai_client
+
+
+async def close_ai_client() -> None:
+    global _ai_client
+    if _ai_client is not None:
+        await _ai_client.close()
+        _ai_client = None
+
 
 class InvalidImageInputError(ValueError):
     """Raised when the provided image input cannot be parsed."""
@@ -27,10 +54,7 @@ class AIHubService:
         if not settings.app_ai_base_url or not settings.app_ai_key:
             raise ValueError("AI service not configured. Set APP_AI_BASE_URL and APP_AI_KEY.")
 
-        self.client = AsyncOpenAI(
-            api_key=settings.app_ai_key,
-            base_url=settings.app_ai_base_url.rstrip("/"),
-        )
+        self.client = get_ai_client()
 
     def _convert_message(self, msg) -> dict:
         """Convert message format and support multimodal content."""
@@ -51,8 +75,25 @@ class AIHubService:
             Txt2TxtResponse: generated text response.
         """
         try:
-            messages = [self._convert_message(msg) for msg in request.messages]
+            cache_key = gentxt_cache_key(request)
+            if request.cache:
+                cached = await get_gentxt_cache().get(cache_key)
+                if cached is not None:
+                    return GenTxtResponse(**cached)
+
+            # Identical requests already in flight share one provider call; callers that opted out of
+            # the cache are never joined to a call whose result is cached, and the other way round
+            flight_key = ("gentxt", cache_key, request.cache)
+            return await single_flight.run(flight_key, lambda: self._complete_text(request, cache_key))
 
+        except Exception as e:
+            logger.error(f"gentxt error: {e}")
+            raise
+
+    async def _complete_text(self, request: GenTxtRequest, cache_key: str) -> GenTxtResponse:
+        messages = [self._convert_message(msg) for msg in request.messages]
+
+        async with await model_limiter.acquire(request.model):
             response = await self.client.chat.completions.create(
                 model=request.model,
                 messages=messages,
@@ -61,36 +102,71 @@ class AIHubService:
                 stream=False,
             )
 
-            content = response.choices[0].message.content or ""
-            usage = None
-            if response.usage:
-                usage = {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
-                }
-
-            return GenTxtResponse(
-                content=content,
-                model=request.model,
-                usage=usage,
-            )
+        content = response.choices[0].message.content or ""
+        usage = None
+        if response.usage:
+            usage = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            }
+
+        result = GenTxtResponse(
+            content=content,
+            model=request.model,
+            usage=usage,
+        )
+        if request.cache:
+            await get_gentxt_cache().set(cache_key, result.model_dump())
+        return result
 
-        except Exception as e:
-            logger.error(f"gentxt error: {e}")
-            raise
+    async def start_gentxt_stream(
+        self, request: GenTxtRequest
+    ) -> Tuple[AsyncGenerator[str, None], Optional[ModelSlot]]:
+        """
+        Reserve a model slot before streaming starts, so an overloaded model is reported
+        as an HTTP error instead of inside an already started event stream.
 
-    async def gentxt_stream(self, request: GenTxtRequest) -> AsyncGenerator[str, None]:
+        Returns:
+            The stream (`gentxt_stream` or a replay of a cached answer) and the slot it holds, if any.
+            The stream releases the slot when it ends, but a stream that is never iterated does not
+            run at all, so the caller must also release the slot once the response is over.
+        """
+        if request.cache:
+            cached = await get_gentxt_cache().get(gentxt_cache_key(request))
+            if cached is not None:
+                return self._replay(cached), None
+        slot = await model_limiter.acquire(request.model)
+        return self.gentxt_stream(request, slot=slot), slot
+
+    @staticmethod
+    async def _replay(cached: dict) -> AsyncGenerator[str, None]:
+        # Replay the cached answer as a single chunk
+        if cached["content"]:
+            yield cached["content"]
+
+    async def gentxt_stream(self, request: GenTxtRequest, slot: Optional[ModelSlot] = None) -> AsyncGenerator[str, None]:
         """
         Generate Text API (streaming), supports text and image input.
 
         Args:
             request: Generate text request parameters.
+            slot: Model slot already reserved by `start_gentxt_stream`; released when the stream ends.
 
         Yields:
             str: Generated text content chunk (plain text, not JSON).
         """
         try:
+            cache_key = gentxt_cache_key(request) if request.cache else None
+            if slot is None:
+                if cache_key:
+                    cached = await get_gentxt_cache().get(cache_key)
+                    if cached is not None:
+                        async for content in self._replay(cached):
+                            yield content
+                        return
+                slot = await model_limiter.acquire(request.model)
+
             messages = [self._convert_message(msg) for msg in request.messages]
 
             stream = await self.client.chat.completions.create(
@@ -101,33 +177,73 @@ class AIHubService:
                 stream=True,
             )
 
+            parts = []
             async for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta.content:
+                    if cache_key:
+                        parts.append(chunk.choices[0].delta.content)
                     yield chunk.choices[0].delta.content
 
+            # Only complete streams are cached; the usage of streamed answers is not reported
+            if cache_key:
+                await get_gentxt_cache().set(cache_key, {"content": "".join(parts), "model": request.model, "usage": None})
+
         except Exception as e:
             logger.error(f"gentxt_stream error: {e}")
             raise
+        finally:
+            if slot is not None:
+                slot.release()
+
+    async def _fetch_image(self, url: str) -> tuple[bytes, str]:
+        """Download an image, returning (bytes, content_type)."""
+        response = await http_clients.get(IMAGES).get(url)
+        response.raise_for_status()
+
+        # Get content-type, default to png
+        content_type = response.headers.get("content-type", "image/png")
+        if ";" in content_type:
+            content_type = content_type.split(";")[0].strip()
+        return response.content, content_type
 
     async def _url_to_base64(self, url: str) -> str:
         """Convert an image URL to a base64 data URI."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                # Get content-type, default to png
-                content_type = response.headers.get("content-type", "image/png")
-                if ";" in content_type:
-                    content_type = content_type.split(";")[0].strip()
-
-                # Convert to base64 data URI
-                b64_data = base64.b64encode(response.content).decode("utf-8")
-                return f"data:{content_type};base64,{b64_data}"
+            data, content_type = await self._fetch_image(url)
+
+            # Convert to base64 data URI
+            b64_data = base64.b64encode(data).decode("utf-8")
+            return f"data:{content_type};base64,{b64_data}"
         except Exception as e:
             logger.warning(f"Failed to convert URL to base64: {e}, returning original URL")
             return url
 
+    async def _item_to_data_uri(self, item) -> Optional[str]:
+        if item.b64_json:
+            # If the API returns base64 directly, use it as is
+            return f"data:image/png;base64,{item.b64_json}"
+        if item.url:
+            # If it is a URL, download and convert it to base64
+            return await self._url_to_base64(item.url)
+        return None
+
+    async def _store_image(self, storage: StorageService, item, bucket_name: str) -> Optional[tuple[str, GenImgObject]]:
+        """Write one generated image to object storage, returning (download URL, object)."""
+        if item.b64_json:
+            data, content_type = base64.b64decode(item.b64_json), "image/png"
+        elif item.url:
+            data, content_type = await self._fetch_image(item.url)
+        else:
+            return None
+
+        object_key = self._filename_from_content_type(content_type, name_prefix=f"genimg-{uuid.uuid4().hex}")
+        stored = await storage.put_object(
+            FileUpDownRequest(bucket_name=bucket_name, object_key=object_key), data, content_type
+        )
+        return stored.download_url, GenImgObject(
+            bucket_name=bucket_name, object_key=object_key, content_type=content_type, size=len(data)
+        )
+
     @staticmethod
     def _parse_data_uri(data_uri: str) -> tuple[bytes, str]:
         """Parse a base64 data URI and return (bytes, content_type)."""
@@ -218,10 +334,20 @@ class AIHubService:
             Txt2ImgResponse: generated image response, where `images` is a list of base64 data URIs.
         """
         try:
-            # If an input image is provided, use the image editing endpoint (img2img).
-            if request.image:
-                image_files = await self._image_input_to_upload_files(request.image)
-                image_param = image_files[0] if len(image_files) == 1 else image_files
+            # Identical requests already in flight share one provider call
+            key = hashlib.sha256(request.model_dump_json().encode("utf-8")).hexdigest()
+            return await single_flight.run(("genimg", key), lambda: self._generate_images(request))
+
+        except Exception as e:
+            logger.error(f"genimg error: {e}")
+            raise
+
+    async def _generate_images(self, request: GenImgRequest) -> GenImgResponse:
+        # If an input image is provided, use the image editing endpoint (img2img).
+        if request.image:
+            image_files = await self._image_input_to_upload_files(request.image)
+            image_param = image_files[0] if len(image_files) == 1 else image_files
+            async with await model_limiter.acquire(request.model):
                 response = await self.client.images.edit(
                     model=request.model,
                     image=image_param,
@@ -229,7 +355,8 @@ class AIHubService:
                     size=request.size,
                     n=request.n,
                 )
-            else:
+        else:
+            async with await model_limiter.acquire(request.model):
                 response = await self.client.images.generate(
                     model=request.model,
                     prompt=request.prompt,
@@ -238,25 +365,26 @@ class AIHubService:
                     n=request.n,
                 )
 
-            revised_prompt = response.data[0].revised_prompt if response.data else None
-
-            # Convert all URLs to base64 data URIs
-            images = []
-            for item in response.data:
-                if item.b64_json:
-                    # If the API returns base64 directly, use it as is
-                    images.append(f"data:image/png;base64,{item.b64_json}")
-                elif item.url:
-                    # If it is a URL, download and convert it to base64
-                    base64_uri = await self._url_to_base64(item.url)
-                    images.append(base64_uri)
-
-            return GenImgResponse(
-                images=images,
-                model=request.model,
-                revised_prompt=revised_prompt,
-            )
-
-        except Exception as e:
-            logger.error(f"genimg error: {e}")
-            raise
+        items = response.data or []
+        revised_prompt = items[0].revised_prompt if items else None
+
+        objects = None
+        if request.output == "url":
+            images = [item.url or f"data:image/png;base64,{item.b64_json}" for item in items if item.url or item.b64_json]
+        elif request.output == "storage":
+            storage = StorageService()
+            stored = await asyncio.gather(*(self._store_image(storage, item, request.bucket_name) for item in items))
+            stored = [entry for entry in stored if entry is not None]
+            images = [url for url, _ in stored]
+            objects = [obj for _, obj in stored]
+        else:
+            # Download all URL images concurrently and inline them as base64 data URIs
+            uris = await asyncio.gather(*(self._item_to_data_uri(item) for item in items))
+            images = [uri for uri in uris if uri is not None]
+
+        return GenImgResponse(
+            images=images,
+            model=request.model,
+            revised_prompt=revised_prompt,
+            objects=objects,
+        )
@@ -0,0 +1,198 @@
+"""
+Response cache for Generate Text requests.
+
+Clients opt in per request with `cache: true`. Answers are keyed by a SHA-256
+hash of the canonical JSON of everything that decides the output (model,
+messages, temperature, max_tokens), so byte-identical prompts such as
+templated product descriptions are answered once.
+
+The memory tier is an LRU bounded by entry count and by total content size.
+With `aihub_cache_dir` set, answers are also written to one JSON file per key;
+a memory miss falls back to disk and promotes the entry. The disk tier is
+bounded by `aihub_cache_max_disk_bytes`, evicting the oldest files first.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from core.config import settings
+from schemas.aihub import GenTxtRequest
+
+logger = logging.getLogger(__name__)
+
+
+def gentxt_cache_key(request: GenTxtRequest) -> str:
+    """Canonical hash of the parts of a request that decide the generated answer."""
+    canonical = request.model_dump(include={"model", "messages", "temperature", "max_tokens"}, mode="json")
+    return hashlib.sha256(orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class GenTxtResponseCache:
+    """Two-tier (memory LRU, optional disk) cache of generated answers."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 86400,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        # key -> (stored_at wall clock, size in bytes, response dict)
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes: Optional[int] = None
+        # Disk writes run in worker threads; this guards _disk_bytes and eviction
+        self._disk_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] + self.ttl > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self._drop(key)
+
+        if self.disk_dir:
+            stored = await asyncio.to_thread(self._read_disk, key)
+            if stored is not None:
+                self._store(key, stored["stored_at"], stored["response"])
+                self.hits += 1
+                return stored["response"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        stored_at = time.time()
+        self._store(key, stored_at, response)
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write_disk, key, stored_at, response)
+            except OSError as e:
+                logger.warning(f"Failed to write gentxt cache entry to disk: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "disk_bytes": self._disk_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _store(self, key: str, stored_at: float, response: Dict[str, Any]) -> None:
+        size = len(response.get("content") or "")
+        if size > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (stored_at, size, response)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "rb") as f:
+                stored = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Unreadable gentxt cache entry on disk: {e}")
+            return None
+        if stored.get("stored_at", 0) + self.ttl <= time.time():
+            self._remove_file(self._path(key))
+            return None
+        return stored
+
+    def _write_disk(self, key: str, stored_at: float, response: Dict[str, Any]) -> None:
+        data = orjson.dumps({"stored_at": stored_at, "response": response})
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        # Atomic so concurrent readers never see a partial file
+        os.replace(tmp_path, path)
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, _, size in self._disk_files())
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_files(self):
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        return files
+
+    def _evict_disk(self) -> None:
+        # Called with _disk_lock held
+        files = sorted(self._disk_files())
+        total = sum(size for _, _, size in files)
+        # Evict down to 90% of the limit so every write past the limit does not rescan the directory
+        target = self.max_disk_bytes * 0.9
+        for _, path, size in files:
+            if total <= target:
+                break
+            self._remove_file(path)
+            total -= size
+        self._disk_bytes = total
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_gentxt_cache: Optional[GenTxtResponseCache] = None
+
+
+def get_gentxt_cache() -> GenTxtResponseCache:
+    """Return the process-wide gentxt cache configured from settings."""
+    global _gentxt_cache
+    if _gentxt_cache is None:
+        _gentxt_cache = GenTxtResponseCache(
+            max_entries=settings.aihub_cache_max_entries,
+            max_bytes=settings.aihub_cache_max_bytes,
+            ttl=settings.aihub_cache_ttl_seconds,
+            disk_dir=settings.aihub_cache_dir or None,
+            max_disk_bytes=settings.aihub_cache_max_disk_bytes,
+        )
+    return _gentxt_cache
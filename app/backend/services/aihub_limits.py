@@ -0,0 +1,180 @@
+"""
+Backpressure for AI Hub calls.
+
+Each model gets a bounded number of concurrent provider calls
+(`aihub_max_concurrency`, overridable per model with `aihub_model_concurrency`).
+Callers beyond that wait in a bounded queue:
+
+- when `aihub_max_queue` callers are already waiting, new ones are shed at once
+  with 429 Too Many Requests;
+- a caller that waits longer than `aihub_queue_timeout_seconds` gets 503.
+
+Both carry a Retry-After estimated from recent call durations. Identical
+non-streaming requests that are in flight at the same time share one provider
+call (`SingleFlight`).
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+WAIT_SAMPLES = 1024
+
+
+class AIHubOverloadedError(Exception):
+    """Raised when a request is shed because its model is saturated."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+class ModelSlot:
+    """A held concurrency slot; release it exactly once."""
+
+    __slots__ = ("_limit", "_started_at", "_released")
+
+    def __init__(self, limit: "ModelLimit"):
+        self._limit = limit
+        self._started_at = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limit._release(time.monotonic() - self._started_at)
+
+    async def __aenter__(self) -> "ModelSlot":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+
+class ModelLimit:
+    """Concurrency limit, wait queue and metrics for one model."""
+
+    def __init__(self, model: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.queued = 0
+        self.accepted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        # Moving average of how long a slot is held, used for Retry-After
+        self.avg_call_seconds = 1.0
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain."""
+        return max(1, math.ceil(self.avg_call_seconds * (self.queued + 1) / self.max_concurrency))
+
+    async def acquire(self) -> ModelSlot:
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AIHubOverloadedError(f"Too many pending requests for model {self.model}", 429, self.retry_after())
+
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise AIHubOverloadedError(f"Model {self.model} is busy, timed out waiting", 503, self.retry_after())
+        finally:
+            self.queued -= 1
+
+        self._waits.append(time.monotonic() - started)
+        self.in_flight += 1
+        self.accepted += 1
+        return ModelSlot(self)
+
+    def _release(self, held_seconds: float) -> None:
+        self.in_flight -= 1
+        self.avg_call_seconds = 0.8 * self.avg_call_seconds + 0.2 * held_seconds
+        self._semaphore.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        p95 = waits[min(len(waits) - 1, math.ceil(len(waits) * 0.95) - 1)] if waits else 0.0
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "accepted": self.accepted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_call_seconds": round(self.avg_call_seconds, 3),
+            "wait_seconds_avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "wait_seconds_p95": round(p95, 3),
+            "wait_seconds_max": round(waits[-1], 3) if waits else 0.0,
+        }
+
+
+class ModelLimiter:
+    """Per-model `ModelLimit`s, created on first use from settings."""
+
+    def __init__(self):
+        self._limits: Dict[str, ModelLimit] = {}
+
+    def limit_for(self, model: str) -> ModelLimit:
+        limit = self._limits.get(model)
+        if limit is None:
+            limit = self._limits[model] = ModelLimit(
+                model,
+                max_concurrency=settings.aihub_model_concurrency.get(model, settings.aihub_max_concurrency),
+                max_queue=settings.aihub_max_queue,
+                queue_timeout=settings.aihub_queue_timeout_seconds,
+            )
+        return limit
+
+    async def acquire(self, model: str) -> ModelSlot:
+        """Wait for a slot for `model`, raising AIHubOverloadedError if the request is shed."""
+        return await self.limit_for(model).acquire()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {model: limit.metrics() for model, limit in self._limits.items()}
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers with the same key share its result."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+        else:
+            # A task of its own, so one caller disconnecting does not cancel the call for the others
+            future = self._calls[key] = asyncio.ensure_future(call())
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(future)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+model_limiter = ModelLimiter()
+single_flight = SingleFlight()
+
+
+def aihub_metrics() -> Dict[str, Any]:
+    """Queue and wait-time metrics for every model used so far."""
+    return {"models": model_limiter.metrics(), "in_flight_shared_calls": len(single_flight), "shared": single_flight.shared}
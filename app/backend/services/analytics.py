@@ -0,0 +1,80 @@
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.deliveries import Deliveries
+from models.inventory import Inventory
+from models.users_extended import Users_extended
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Dashboard aggregates are shared by all admins; write paths in the inventory,
+# users_extended and deliveries services clear this cache after they commit.
+ANALYTICS_CACHE_TTL_SECONDS = 30
+analytics_cache = TTLCache(ttl=ANALYTICS_CACHE_TTL_SECONDS, maxsize=8)
+
+ACTIVE_DELIVERY_STATUSES = ("PENDING", "IN_PROGRESS")
+
+
+def invalidate_analytics() -> None:
+    """Drop cached dashboard aggregates after a write to a table they are built from."""
+    analytics_cache.clear()
+
+
+class AnalyticsService:
+    """Service layer for admin dashboard aggregates"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_summary(self) -> Dict[str, Any]:
+        """Get inventory, affiliate and delivery counts, served from cache when fresh"""
+        cached = analytics_cache.get("summary")
+        if cached is not None:
+            return cached
+
+        generation = analytics_cache.generation
+        try:
+            summary = await self._compute_summary()
+        except Exception as e:
+            logger.error(f"Error computing analytics summary: {str(e)}")
+            raise
+        analytics_cache.set("summary", summary, generation=generation)
+        return summary
+
+    async def _compute_summary(self) -> Dict[str, Any]:
+        # One statement: per-status/per-role counts for each table, stacked with UNION ALL
+        inventory = (
+            select(literal("inventory").label("source"), Inventory.status.label("bucket"), func.count().label("n"))
+            .where(Inventory.deleted_at.is_(None))
+            .group_by(Inventory.status)
+        )
+        users = (
+            select(literal("users").label("source"), Users_extended.role.label("bucket"), func.count().label("n"))
+            .where(Users_extended.deleted_at.is_(None))
+            .group_by(Users_extended.role)
+        )
+        deliveries = (
+            select(literal("deliveries").label("source"), Deliveries.status.label("bucket"), func.count().label("n"))
+            .where(Deliveries.deleted_at.is_(None))
+            .group_by(Deliveries.status)
+        )
+        result = await self.db.execute(union_all(inventory, users, deliveries))
+
+        counts: Dict[str, Dict[str, int]] = {"inventory": {}, "users": {}, "deliveries": {}}
+        for source, bucket, n in result.all():
+            # Statuses are stored with mixed casing across clients, so fold them here
+            key = (bucket or "").upper()
+            counts[source][key] = counts[source].get(key, 0) + n
+
+        return {
+            "total_inventory": sum(counts["inventory"].values()),
+            "warehouse_count": counts["inventory"].get("WAREHOUSE", 0),
+            "consigned_count": counts["inventory"].get("CONSIGNED", 0),
+            "sold_count": counts["inventory"].get("SOLD", 0),
+            "total_affiliates": counts["users"].get("AFFILIATE", 0),
+            "active_deliveries": sum(counts["deliveries"].get(status, 0) for status in ACTIVE_DELIVERY_STATUSES),
+        }
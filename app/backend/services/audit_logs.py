@@ -1,10 +1,15 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.audit_logs import Audit_logs
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +35,29 @@ class Audit_logsService:
             logger.error(f"Error creating audit_logs: {str(e)}")
             raise
 
-    async def get_by_id(self, obj_id: int) -> Optional[Audit_logs]:
+    async def batch_create(self, items_data: List[Dict[str, Any]]) -> List[Audit_logs]:
+        """Create multiple audit_logs in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
+        try:
+            objs = await bulk_insert(self.db, Audit_logs, items_data)
+            await self.db.commit()
+            logger.info(f"Batch created {len(objs)} audit_logs")
+            return objs
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating audit_logs batch: {str(e)}")
+            raise
+
+    async def get_by_id(self, obj_id: int, fields: Optional[str] = None) -> Optional[Union[Audit_logs, Dict[str, Any]]]:
         """Get audit_logs by ID"""
         try:
+            field_names = parse_fields(Audit_logs, fields)
             query = select(Audit_logs).where(Audit_logs.id == obj_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Audit_logs, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -46,45 +70,80 @@ class Audit_logsService:
         limit: int = 20, 
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of audit_logss"""
         try:
+            validate_total_mode(total_mode)
             query = select(Audit_logs)
             count_query = select(func.count(Audit_logs.id))
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Audit_logs, field):
-                        query = query.where(getattr(Audit_logs, field) == value)
-                        count_query = count_query.where(getattr(Audit_logs, field) == value)
+                filters = compile_filters(Audit_logs, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Audit_logs, field_name):
-                        query = query.order_by(getattr(Audit_logs, field_name).desc())
-                else:
-                    if hasattr(Audit_logs, sort):
-                        query = query.order_by(getattr(Audit_logs, sort))
-            else:
-                query = query.order_by(Audit_logs.id.desc())
+            sort_keys = parse_sort(Audit_logs, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
+            else:
+                query = query.offset(skip)
+
+            field_names = parse_fields(Audit_logs, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Audit_logs, field_names, [column for column, _ in sort_keys]))
+
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
+
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Audit_logs, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching audit_logs list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming audit_logs export
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Audit_logs, fields) or [column.key for column in Audit_logs.__table__.c]
+        query = select(*select_columns(Audit_logs, field_names))
+        if query_dict:
+            query = query.where(*compile_filters(Audit_logs, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Audit_logs, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any]) -> Optional[Audit_logs]:
         """Update audit_logs"""
         try:
@@ -105,6 +164,22 @@ class Audit_logsService:
             logger.error(f"Error updating audit_logs {obj_id}: {str(e)}")
             raise
 
+    async def batch_update(self, items: List[Dict[str, Any]]) -> List[Audit_logs]:
+        """Batch update audit_logs items with one set-based UPDATE ... RETURNING"""
+        try:
+            updated_objects = await bulk_update(self.db, Audit_logs, items)
+            if not updated_objects:
+                logger.warning("No audit_logs items found for batch update")
+                return []
+
+            await self.db.commit()
+            logger.info(f"Batch updated {len(updated_objects)} audit_logs items")
+            return updated_objects
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch update: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int) -> bool:
         """Delete audit_logs"""
         try:
@@ -121,6 +196,18 @@ class Audit_logsService:
             logger.error(f"Error deleting audit_logs {obj_id}: {str(e)}")
             raise
 
+    async def delete_batch(self, obj_ids: List[int]) -> int:
+        """Delete multiple audit_logs items with a single DELETE"""
+        try:
+            deleted_count = await bulk_delete(self.db, Audit_logs, obj_ids)
+            await self.db.commit()
+            logger.info(f"Batch deleted {deleted_count} audit_logs items")
+            return deleted_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch delete: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Audit_logs]:
         """Get audit_logs by any field"""
         try:
@@ -6,8 +6,9 @@ from typing import Any, Dict, Optional, Tuple
 from core.auth import create_access_token
 from core.config import settings
 from core.database import db_manager
-from models.auth import OIDCState, User
-from sqlalchemy import delete, select
+from models.auth import User
+from services.oidc_state import get_oidc_state_store
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
@@ -70,37 +71,12 @@ class AuthService:
         return token, expires_at, claims
 
     async def store_oidc_state(self, state: str, nonce: str, code_verifier: str):
-        """Store OIDC state in database."""
-        # Clean up expired states first
-        await self.db.execute(delete(OIDCState).where(OIDCState.expires_at < datetime.now(timezone.utc)))
-
-        expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)  # 10 minute expiry
-
-        oidc_state = OIDCState(state=state, nonce=nonce, code_verifier=code_verifier, expires_at=expires_at)
-
-        self.db.add(oidc_state)
-        await self.db.commit()
+        """Store OIDC state in the configured state store."""
+        await get_oidc_state_store().put(state, nonce, code_verifier)
 
     async def get_and_delete_oidc_state(self, state: str) -> Optional[dict]:
-        """Get and delete OIDC state from database."""
-        # Clean up expired states first
-        await self.db.execute(delete(OIDCState).where(OIDCState.expires_at < datetime.now(timezone.utc)))
-
-        # Find and validate state
-        result = await self.db.execute(select(OIDCState).where(OIDCState.state == state))
-        oidc_state = result.scalar_one_or_none()
-
-        if not oidc_state:
-            return None
-
-        # Extract data before deleting
-        state_data = {"nonce": oidc_state.nonce, "code_verifier": oidc_state.code_verifier}
-
-        # Delete the used state (one-time use)
-        await self.db.delete(oidc_state)
-        await self.db.commit()
-
-        return state_data
+        """Get and delete OIDC state (one-time use); expired states are not returned."""
+        return await get_oidc_state_store().pop(state)
 
 
 async def initialize_admin_user():
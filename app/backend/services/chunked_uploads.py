@@ -0,0 +1,240 @@
+"""
+Resumable chunked uploads.
+
+A client starts an upload with the total size and then sends the file as a
+sequence of chunks, each tagged with its byte offset. Chunks are streamed
+straight into a staging file, and the size of that file is the upload's
+progress. A client that lost its connection asks for the status and resumes
+from `received` instead of starting over. A chunk that is sent again (its
+acknowledgement was lost) overwrites the bytes it already wrote. When every
+byte has arrived, the staging file is handed to the storage backend.
+
+Staging files live in `storage_upload_dir`, one `<upload_id>.part` file plus a
+`<upload_id>.json` with the upload's metadata, so uploads survive restarts and
+are shared by the workers of one host. Uploads not finished within
+`storage_upload_ttl_seconds` are removed by `sweep()`, which runs at most once
+per `UPLOAD_SWEEP_INTERVAL_SECONDS` when an upload starts.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+import weakref
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional
+
+import orjson
+from core.config import settings
+from schemas.storage import ChunkedUploadRequest, ChunkedUploadStatus, FileUpDownResponse
+from services.storage_backends import StorageBackend, guess_content_type
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_SWEEP_INTERVAL_SECONDS = 3600
+WRITE_BUFFER_SIZE = 1024 * 1024
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadNotFoundError(Exception):
+    """Raised for unknown, expired or foreign upload ids."""
+
+
+class UploadOffsetError(Exception):
+    """Raised when a chunk does not start at or before the bytes received so far."""
+
+    def __init__(self, message: str, received: int):
+        self.message = message
+        self.received = received
+        super().__init__(self.message)
+
+
+class ChunkedUploadStore:
+    """Staging files and metadata of in-progress uploads."""
+
+    def __init__(self, directory: str, chunk_size: int, max_size: int, ttl: float):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.ttl = ttl
+        self._last_sweep = 0.0
+        # Serializes chunks of the same upload within this process
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        os.makedirs(directory, exist_ok=True)
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.directory, f"{upload_id}.part")
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.directory, f"{upload_id}.json")
+
+    def _lock(self, upload_id: str) -> asyncio.Lock:
+        lock = self._locks.get(upload_id)
+        if lock is None:
+            lock = self._locks[upload_id] = asyncio.Lock()
+        return lock
+
+    def _status(self, upload_id: str, meta: Dict, received: int) -> ChunkedUploadStatus:
+        return ChunkedUploadStatus(
+            upload_id=upload_id,
+            bucket_name=meta["bucket_name"],
+            object_key=meta["object_key"],
+            size=meta["size"],
+            received=received,
+            chunk_size=self.chunk_size,
+            expires_at=datetime.fromtimestamp(meta["created_at"] + self.ttl, timezone.utc).isoformat(),
+        )
+
+    async def create(self, user_id: str, request: ChunkedUploadRequest) -> ChunkedUploadStatus:
+        if request.size > self.max_size:
+            raise ValueError(f"File too large, the limit is {self.max_size} bytes")
+        if time.monotonic() - self._last_sweep > UPLOAD_SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = time.monotonic()
+            await self.sweep()
+
+        upload_id = uuid.uuid4().hex
+        meta = {
+            "user_id": user_id,
+            "bucket_name": request.bucket_name,
+            "object_key": request.object_key,
+            "size": request.size,
+            "content_type": request.content_type or guess_content_type(request.object_key),
+            "created_at": time.time(),
+        }
+        await asyncio.to_thread(self._write_new, upload_id, meta)
+        return self._status(upload_id, meta, 0)
+
+    def _write_new(self, upload_id: str, meta: Dict) -> None:
+        open(self._part_path(upload_id), "wb").close()
+        tmp_path = f"{self._meta_path(upload_id)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(meta))
+        os.replace(tmp_path, self._meta_path(upload_id))
+
+    async def _load(self, upload_id: str, user_id: str) -> Dict:
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            raise UploadNotFoundError("Upload not found")
+        try:
+            meta = orjson.loads(await asyncio.to_thread(self._read_meta, upload_id))
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            raise UploadNotFoundError("Upload not found")
+        if meta["user_id"] != user_id or meta["created_at"] + self.ttl < time.time():
+            raise UploadNotFoundError("Upload not found")
+        return meta
+
+    def _read_meta(self, upload_id: str) -> bytes:
+        with open(self._meta_path(upload_id), "rb") as f:
+            return f.read()
+
+    async def _received(self, upload_id: str) -> int:
+        try:
+            return await asyncio.to_thread(os.path.getsize, self._part_path(upload_id))
+        except FileNotFoundError:
+            raise UploadNotFoundError("Upload not found")
+
+    async def status(self, upload_id: str, user_id: str) -> ChunkedUploadStatus:
+        meta = await self._load(upload_id, user_id)
+        return self._status(upload_id, meta, await self._received(upload_id))
+
+    async def write_chunk(
+        self, upload_id: str, user_id: str, offset: int, chunks: AsyncIterator[bytes]
+    ) -> ChunkedUploadStatus:
+        """Write a chunk starting at `offset`, streaming it to disk as it arrives."""
+        meta = await self._load(upload_id, user_id)
+        async with self._lock(upload_id):
+            received = await self._received(upload_id)
+            if offset > received:
+                raise UploadOffsetError(f"Chunk starts at {offset} but only {received} bytes were received", received)
+
+            f = await asyncio.to_thread(open, self._part_path(upload_id), "r+b")
+            try:
+                # A resent chunk replaces whatever followed its offset
+                await asyncio.to_thread(f.truncate, offset)
+                await asyncio.to_thread(f.seek, offset)
+                written = 0
+                buffer = bytearray()
+                async for data in chunks:
+                    written += len(data)
+                    if written > self.chunk_size:
+                        raise ValueError(f"Chunk too large, the limit is {self.chunk_size} bytes")
+                    if offset + written > meta["size"]:
+                        raise ValueError(f"Chunk exceeds the declared size of {meta['size']} bytes")
+                    buffer += data
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        await asyncio.to_thread(f.write, bytes(buffer))
+                        buffer.clear()
+                if buffer:
+                    await asyncio.to_thread(f.write, bytes(buffer))
+            except Exception:
+                # Keep only whole chunks: a partial chunk is resent from its offset
+                await asyncio.to_thread(f.truncate, offset)
+                raise
+            finally:
+                await asyncio.to_thread(f.close)
+
+        return self._status(upload_id, meta, offset + written)
+
+    async def complete(self, upload_id: str, user_id: str, backend: StorageBackend) -> FileUpDownResponse:
+        """Hand the finished file to `backend` and forget the upload."""
+        meta = await self._load(upload_id, user_id)
+        async with self._lock(upload_id):
+            received = await self._received(upload_id)
+            if received != meta["size"]:
+                raise UploadOffsetError(f"Upload incomplete, {received} of {meta['size']} bytes received", received)
+            response = await backend.store_file(
+                meta["bucket_name"], meta["object_key"], self._part_path(upload_id), meta["content_type"]
+            )
+            await asyncio.to_thread(self._remove, upload_id)
+        return response
+
+    async def abort(self, upload_id: str, user_id: str) -> None:
+        await self._load(upload_id, user_id)
+        async with self._lock(upload_id):
+            await asyncio.to_thread(self._remove, upload_id)
+
+    def _remove(self, upload_id: str) -> None:
+        for path in (self._part_path(upload_id), self._meta_path(upload_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def sweep(self) -> int:
+        """Remove uploads older than the TTL, returning how many were removed."""
+        return await asyncio.to_thread(self._sweep)
+
+    def _sweep(self) -> int:
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for entry in os.scandir(self.directory):
+            _, ext = os.path.splitext(entry.name)
+            if ext not in (".json", ".part", ".tmp") or not entry.is_file():
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += ext == ".json"
+            except FileNotFoundError:
+                pass
+        if removed:
+            logger.info(f"Removed {removed} expired chunked uploads")
+        return removed
+
+
+_upload_store: Optional[ChunkedUploadStore] = None
+
+
+def get_upload_store() -> ChunkedUploadStore:
+    """Return the process-wide upload store configured from settings."""
+    global _upload_store
+    if _upload_store is None:
+        _upload_store = ChunkedUploadStore(
+            directory=settings.storage_upload_dir or os.path.join(tempfile.gettempdir(), "chunked-uploads"),
+            chunk_size=settings.storage_upload_chunk_bytes,
+            max_size=settings.storage_upload_max_bytes,
+            ttl=settings.storage_upload_ttl_seconds,
+        )
+    return _upload_store
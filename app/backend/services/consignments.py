@@ -1,10 +1,15 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.consignments import Consignments
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,23 @@ class ConsignmentsService:
             logger.error(f"Error creating consignments: {str(e)}")
             raise
 
+    async def batch_create(self, items_data: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Consignments]:
+        """Create multiple consignments in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
+        try:
+            if user_id:
+                for data in items_data:
+                    data['user_id'] = user_id
+            objs = await bulk_insert(self.db, Consignments, items_data)
+            await self.db.commit()
+            logger.info(f"Batch created {len(objs)} consignments")
+            return objs
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating consignments batch: {str(e)}")
+            raise
+
     async def check_ownership(self, obj_id: int, user_id: str) -> bool:
         """Check if user owns this record"""
         try:
@@ -41,12 +63,17 @@ class ConsignmentsService:
             logger.error(f"Error checking ownership for consignments {obj_id}: {str(e)}")
             return False
 
-    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None) -> Optional[Consignments]:
+    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None, fields: Optional[str] = None) -> Optional[Union[Consignments, Dict[str, Any]]]:
         """Get consignments by ID (user can only see their own records)"""
         try:
+            field_names = parse_fields(Consignments, fields)
             query = select(Consignments).where(Consignments.id == obj_id)
             if user_id:
                 query = query.where(Consignments.user_id == user_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Consignments, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -60,9 +87,13 @@ class ConsignmentsService:
         user_id: Optional[str] = None,
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of consignmentss (user can only see their own records)"""
         try:
+            validate_total_mode(total_mode)
             query = select(Consignments)
             count_query = select(func.count(Consignments.id))
             
@@ -71,38 +102,72 @@ class ConsignmentsService:
                 count_query = count_query.where(Consignments.user_id == user_id)
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Consignments, field):
-                        query = query.where(getattr(Consignments, field) == value)
-                        count_query = count_query.where(getattr(Consignments, field) == value)
+                filters = compile_filters(Consignments, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Consignments, field_name):
-                        query = query.order_by(getattr(Consignments, field_name).desc())
-                else:
-                    if hasattr(Consignments, sort):
-                        query = query.order_by(getattr(Consignments, sort))
+            sort_keys = parse_sort(Consignments, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
+
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
             else:
-                query = query.order_by(Consignments.id.desc())
+                query = query.offset(skip)
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            field_names = parse_fields(Consignments, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Consignments, field_names, [column for column, _ in sort_keys]))
+
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
+
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Consignments, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching consignments list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        user_id: Optional[str] = None,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming consignments export (user can only see their own records)
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Consignments, fields) or [column.key for column in Consignments.__table__.c]
+        query = select(*select_columns(Consignments, field_names))
+        if user_id:
+            query = query.where(Consignments.user_id == user_id)
+        if query_dict:
+            query = query.where(*compile_filters(Consignments, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Consignments, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any], user_id: Optional[str] = None) -> Optional[Consignments]:
         """Update consignments (requires ownership)"""
         try:
@@ -123,6 +188,23 @@ class ConsignmentsService:
             logger.error(f"Error updating consignments {obj_id}: {str(e)}")
             raise
 
+    async def batch_update(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Consignments]:
+        """Batch update consignments items with one set-based UPDATE ... RETURNING (requires ownership)"""
+        try:
+            criteria = [Consignments.user_id == user_id] if user_id else []
+            updated_objects = await bulk_update(self.db, Consignments, items, *criteria, protected=("user_id",))
+            if not updated_objects:
+                logger.warning("No consignments items found for batch update")
+                return []
+
+            await self.db.commit()
+            logger.info(f"Batch updated {len(updated_objects)} consignments items")
+            return updated_objects
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch update: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int, user_id: Optional[str] = None) -> bool:
         """Delete consignments (requires ownership)"""
         try:
@@ -139,6 +221,19 @@ class ConsignmentsService:
             logger.error(f"Error deleting consignments {obj_id}: {str(e)}")
             raise
 
+    async def delete_batch(self, obj_ids: List[int], user_id: Optional[str] = None) -> int:
+        """Delete multiple consignments items with a single DELETE (requires ownership)"""
+        try:
+            criteria = [Consignments.user_id == user_id] if user_id else []
+            deleted_count = await bulk_delete(self.db, Consignments, obj_ids, *criteria)
+            await self.db.commit()
+            logger.info(f"Batch deleted {deleted_count} consignments items")
+            return deleted_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch delete: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Consignments]:
         """Get consignments by any field"""
         try:
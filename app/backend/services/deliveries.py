@@ -1,10 +1,16 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.deliveries import Deliveries
+from services.analytics import invalidate_analytics
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +30,7 @@ class DeliveriesService:
             obj = Deliveries(**data)
             self.db.add(obj)
             await self.db.commit()
+            invalidate_analytics()
             await self.db.refresh(obj)
             logger.info(f"Created deliveries with id: {obj.id}")
             return obj
@@ -32,6 +39,24 @@ class DeliveriesService:
             logger.error(f"Error creating deliveries: {str(e)}")
             raise
 
+    async def batch_create(self, items_data: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Deliveries]:
+        """Create multiple deliveries in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
+        try:
+            if user_id:
+                for data in items_data:
+                    data['user_id'] = user_id
+            objs = await bulk_insert(self.db, Deliveries, items_data)
+            await self.db.commit()
+            invalidate_analytics()
+            logger.info(f"Batch created {len(objs)} deliveries")
+            return objs
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating deliveries batch: {str(e)}")
+            raise
+
     async def check_ownership(self, obj_id: int, user_id: str) -> bool:
         """Check if user owns this record"""
         try:
@@ -41,12 +66,17 @@ class DeliveriesService:
             logger.error(f"Error checking ownership for deliveries {obj_id}: {str(e)}")
             return False
 
-    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None) -> Optional[Deliveries]:
+    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None, fields: Optional[str] = None) -> Optional[Union[Deliveries, Dict[str, Any]]]:
         """Get deliveries by ID (user can only see their own records)"""
         try:
+            field_names = parse_fields(Deliveries, fields)
             query = select(Deliveries).where(Deliveries.id == obj_id)
             if user_id:
                 query = query.where(Deliveries.user_id == user_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Deliveries, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -60,9 +90,13 @@ class DeliveriesService:
         user_id: Optional[str] = None,
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of deliveriess (user can only see their own records)"""
         try:
+            validate_total_mode(total_mode)
             query = select(Deliveries)
             count_query = select(func.count(Deliveries.id))
             
@@ -71,38 +105,72 @@ class DeliveriesService:
                 count_query = count_query.where(Deliveries.user_id == user_id)
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Deliveries, field):
-                        query = query.where(getattr(Deliveries, field) == value)
-                        count_query = count_query.where(getattr(Deliveries, field) == value)
+                filters = compile_filters(Deliveries, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Deliveries, field_name):
-                        query = query.order_by(getattr(Deliveries, field_name).desc())
-                else:
-                    if hasattr(Deliveries, sort):
-                        query = query.order_by(getattr(Deliveries, sort))
+            sort_keys = parse_sort(Deliveries, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
+
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
             else:
-                query = query.order_by(Deliveries.id.desc())
+                query = query.offset(skip)
+
+            field_names = parse_fields(Deliveries, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Deliveries, field_names, [column for column, _ in sort_keys]))
+
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Deliveries, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching deliveries list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        user_id: Optional[str] = None,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming deliveries export (user can only see their own records)
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Deliveries, fields) or [column.key for column in Deliveries.__table__.c]
+        query = select(*select_columns(Deliveries, field_names))
+        if user_id:
+            query = query.where(Deliveries.user_id == user_id)
+        if query_dict:
+            query = query.where(*compile_filters(Deliveries, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Deliveries, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any], user_id: Optional[str] = None) -> Optional[Deliveries]:
         """Update deliveries (requires ownership)"""
         try:
@@ -115,6 +183,7 @@ class DeliveriesService:
                     setattr(obj, key, value)
 
             await self.db.commit()
+            invalidate_analytics()
             await self.db.refresh(obj)
             logger.info(f"Updated deliveries {obj_id}")
             return obj
@@ -123,6 +192,24 @@ class DeliveriesService:
             logger.error(f"Error updating deliveries {obj_id}: {str(e)}")
             raise
 
+    async def batch_update(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Deliveries]:
+        """Batch update deliveries items with one set-based UPDATE ... RETURNING (requires ownership)"""
+        try:
+            criteria = [Deliveries.user_id == user_id] if user_id else []
+            updated_objects = await bulk_update(self.db, Deliveries, items, *criteria, protected=("user_id",))
+            if not updated_objects:
+                logger.warning("No deliveries items found for batch update")
+                return []
+
+            await self.db.commit()
+            invalidate_analytics()
+            logger.info(f"Batch updated {len(updated_objects)} deliveries items")
+            return updated_objects
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch update: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int, user_id: Optional[str] = None) -> bool:
         """Delete deliveries (requires ownership)"""
         try:
@@ -132,6 +219,7 @@ class DeliveriesService:
                 return False
             await self.db.delete(obj)
             await self.db.commit()
+            invalidate_analytics()
             logger.info(f"Deleted deliveries {obj_id}")
             return True
         except Exception as e:
@@ -140,17 +228,13 @@ class DeliveriesService:
             raise
 
     async def delete_batch(self, obj_ids: List[int], user_id: Optional[str] = None) -> int:
-        """Delete multiple deliveriess (requires ownership)"""
+        """Delete multiple deliveries items with a single DELETE (requires ownership)"""
         try:
-            stmt = delete(Deliveries).where(Deliveries.id.in_(obj_ids))
-            if user_id:
-                stmt = stmt.where(Deliveries.user_id == user_id)
-
-            result = await self.db.execute(stmt)
+            criteria = [Deliveries.user_id == user_id] if user_id else []
+            deleted_count = await bulk_delete(self.db, Deliveries, obj_ids, *criteria)
             await self.db.commit()
-
-            deleted_count = result.rowcount
-            logger.info(f"Batch deleted {deleted_count} deliveriess")
+            invalidate_analytics()
+            logger.info(f"Batch deleted {deleted_count} deliveries items")
             return deleted_count
         except Exception as e:
             await self.db.rollback()
@@ -1,10 +1,16 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.inventory import Inventory
+from services.analytics import invalidate_analytics
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,7 @@ class InventoryService:
             obj = Inventory(**data)
             self.db.add(obj)
             await self.db.commit()
+            invalidate_analytics()
             await self.db.refresh(obj)
             logger.info(f"Created inventory with id: {obj.id}")
             return obj
@@ -30,10 +37,30 @@ class InventoryService:
             logger.error(f"Error creating inventory: {str(e)}")
             raise
 
-    async def get_by_id(self, obj_id: int) -> Optional[Inventory]:
+    async def batch_create(self, items_data: List[Dict[str, Any]]) -> List[Inventory]:
+        """Create multiple inventory in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
+        try:
+            objs = await bulk_insert(self.db, Inventory, items_data)
+            await self.db.commit()
+            invalidate_analytics()
+            logger.info(f"Batch created {len(objs)} inventory")
+            return objs
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating inventory batch: {str(e)}")
+            raise
+
+    async def get_by_id(self, obj_id: int, fields: Optional[str] = None) -> Optional[Union[Inventory, Dict[str, Any]]]:
         """Get inventory by ID"""
         try:
+            field_names = parse_fields(Inventory, fields)
             query = select(Inventory).where(Inventory.id == obj_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Inventory, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -46,45 +73,80 @@ class InventoryService:
         limit: int = 20, 
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of inventorys"""
         try:
+            validate_total_mode(total_mode)
             query = select(Inventory)
             count_query = select(func.count(Inventory.id))
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Inventory, field):
-                        query = query.where(getattr(Inventory, field) == value)
-                        count_query = count_query.where(getattr(Inventory, field) == value)
+                filters = compile_filters(Inventory, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Inventory, field_name):
-                        query = query.order_by(getattr(Inventory, field_name).desc())
-                else:
-                    if hasattr(Inventory, sort):
-                        query = query.order_by(getattr(Inventory, sort))
-            else:
-                query = query.order_by(Inventory.id.desc())
+            sort_keys = parse_sort(Inventory, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
+            else:
+                query = query.offset(skip)
+
+            field_names = parse_fields(Inventory, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Inventory, field_names, [column for column, _ in sort_keys]))
+
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
+
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Inventory, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching inventory list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming inventory export
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Inventory, fields) or [column.key for column in Inventory.__table__.c]
+        query = select(*select_columns(Inventory, field_names))
+        if query_dict:
+            query = query.where(*compile_filters(Inventory, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Inventory, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any]) -> Optional[Inventory]:
         """Update inventory"""
         try:
@@ -97,6 +159,7 @@ class InventoryService:
                     setattr(obj, key, value)
 
             await self.db.commit()
+            invalidate_analytics()
             await self.db.refresh(obj)
             logger.info(f"Updated inventory {obj_id}")
             return obj
@@ -106,37 +169,15 @@ class InventoryService:
             raise
 
     async def batch_update(self, items: List[Dict[str, Any]]) -> List[Inventory]:
-        """Batch update inventory items"""
-        updated_objects = []
+        """Batch update inventory items with one set-based UPDATE ... RETURNING"""
         try:
-            item_ids = [item['id'] for item in items]
-
-            # Fetch all objects to be updated in a single query
-            query = select(Inventory).where(Inventory.id.in_(item_ids))
-            result = await self.db.execute(query)
-            objects_to_update = {obj.id: obj for obj in result.scalars().all()}
-
-            if not objects_to_update:
+            updated_objects = await bulk_update(self.db, Inventory, items)
+            if not updated_objects:
                 logger.warning("No inventory items found for batch update")
                 return []
 
-            for item in items:
-                obj_id = item['id']
-                update_data = item['updates']
-
-                if obj_id in objects_to_update:
-                    obj = objects_to_update[obj_id]
-                    for key, value in update_data.items():
-                        if hasattr(obj, key) and value is not None:
-                            setattr(obj, key, value)
-                    updated_objects.append(obj)
-
             await self.db.commit()
-
-            # Refresh each object to get the updated state from the DB
-            for obj in updated_objects:
-                await self.db.refresh(obj)
-
+            invalidate_analytics()
             logger.info(f"Batch updated {len(updated_objects)} inventory items")
             return updated_objects
         except Exception as e:
@@ -153,6 +194,7 @@ class InventoryService:
                 return False
             await self.db.delete(obj)
             await self.db.commit()
+            invalidate_analytics()
             logger.info(f"Deleted inventory {obj_id}")
             return True
         except Exception as e:
@@ -160,6 +202,19 @@ class InventoryService:
             logger.error(f"Error deleting inventory {obj_id}: {str(e)}")
             raise
 
+    async def delete_batch(self, obj_ids: List[int]) -> int:
+        """Delete multiple inventory items with a single DELETE"""
+        try:
+            deleted_count = await bulk_delete(self.db, Inventory, obj_ids)
+            await self.db.commit()
+            invalidate_analytics()
+            logger.info(f"Batch deleted {deleted_count} inventory items")
+            return deleted_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch delete: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Inventory]:
         """Get inventory by any field"""
         try:
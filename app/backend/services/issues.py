@@ -1,10 +1,15 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.issues import Issues
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,23 @@ class IssuesService:
             logger.error(f"Error creating issues: {str(e)}")
             raise
 
+    async def batch_create(self, items_data: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Issues]:
+        """Create multiple issues in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
+        try:
+            if user_id:
+                for data in items_data:
+                    data['user_id'] = user_id
+            objs = await bulk_insert(self.db, Issues, items_data)
+            await self.db.commit()
+            logger.info(f"Batch created {len(objs)} issues")
+            return objs
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating issues batch: {str(e)}")
+            raise
+
     async def check_ownership(self, obj_id: int, user_id: str) -> bool:
         """Check if user owns this record"""
         try:
@@ -41,12 +63,17 @@ class IssuesService:
             logger.error(f"Error checking ownership for issues {obj_id}: {str(e)}")
             return False
 
-    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None) -> Optional[Issues]:
+    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None, fields: Optional[str] = None) -> Optional[Union[Issues, Dict[str, Any]]]:
         """Get issues by ID (user can only see their own records)"""
         try:
+            field_names = parse_fields(Issues, fields)
             query = select(Issues).where(Issues.id == obj_id)
             if user_id:
                 query = query.where(Issues.user_id == user_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Issues, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -60,9 +87,13 @@ class IssuesService:
         user_id: Optional[str] = None,
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of issuess (user can only see their own records)"""
         try:
+            validate_total_mode(total_mode)
             query = select(Issues)
             count_query = select(func.count(Issues.id))
             
@@ -71,38 +102,72 @@ class IssuesService:
                 count_query = count_query.where(Issues.user_id == user_id)
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Issues, field):
-                        query = query.where(getattr(Issues, field) == value)
-                        count_query = count_query.where(getattr(Issues, field) == value)
+                filters = compile_filters(Issues, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Issues, field_name):
-                        query = query.order_by(getattr(Issues, field_name).desc())
-                else:
-                    if hasattr(Issues, sort):
-                        query = query.order_by(getattr(Issues, sort))
+            sort_keys = parse_sort(Issues, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
+
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
             else:
-                query = query.order_by(Issues.id.desc())
+                query = query.offset(skip)
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            field_names = parse_fields(Issues, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Issues, field_names, [column for column, _ in sort_keys]))
+
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
+
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Issues, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching issues list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        user_id: Optional[str] = None,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming issues export (user can only see their own records)
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Issues, fields) or [column.key for column in Issues.__table__.c]
+        query = select(*select_columns(Issues, field_names))
+        if user_id:
+            query = query.where(Issues.user_id == user_id)
+        if query_dict:
+            query = query.where(*compile_filters(Issues, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Issues, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any], user_id: Optional[str] = None) -> Optional[Issues]:
         """Update issues (requires ownership)"""
         try:
@@ -123,6 +188,23 @@ class IssuesService:
             logger.error(f"Error updating issues {obj_id}: {str(e)}")
             raise
 
+    async def batch_update(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Issues]:
+        """Batch update issues items with one set-based UPDATE ... RETURNING (requires ownership)"""
+        try:
+            criteria = [Issues.user_id == user_id] if user_id else []
+            updated_objects = await bulk_update(self.db, Issues, items, *criteria, protected=("user_id",))
+            if not updated_objects:
+                logger.warning("No issues items found for batch update")
+                return []
+
+            await self.db.commit()
+            logger.info(f"Batch updated {len(updated_objects)} issues items")
+            return updated_objects
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch update: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int, user_id: Optional[str] = None) -> bool:
         """Delete issues (requires ownership)"""
         try:
@@ -139,6 +221,19 @@ class IssuesService:
             logger.error(f"Error deleting issues {obj_id}: {str(e)}")
             raise
 
+    async def delete_batch(self, obj_ids: List[int], user_id: Optional[str] = None) -> int:
+        """Delete multiple issues items with a single DELETE (requires ownership)"""
+        try:
+            criteria = [Issues.user_id == user_id] if user_id else []
+            deleted_count = await bulk_delete(self.db, Issues, obj_ids, *criteria)
+            await self.db.commit()
+            logger.info(f"Batch deleted {deleted_count} issues items")
+            return deleted_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch delete: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Issues]:
         """Get issues by any field"""
         try:
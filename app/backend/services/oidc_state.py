@@ -0,0 +1,184 @@
+"""
+Storage for in-flight OIDC login state (state, nonce and PKCE code verifier).
+
+Two stores are available, chosen with the `oidc_state_store` setting:
+
+- `database` keeps states in the `oidc_states` table and works with any number
+  of workers or Lambda instances. Storing is one INSERT and consuming is one
+  DELETE ... RETURNING.
+- `memory` keeps states in a dict in the worker process. It only works when the
+  login and callback requests reach the same process (a single worker).
+
+Expired states are never returned. They are removed by `sweep()`, which the
+application runs periodically in the background instead of on every login.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from core.config import settings
+from core.database import db_manager
+from models.auth import OIDCState
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+OIDC_STATE_TTL_SECONDS = 600
+OIDC_STATE_SWEEP_INTERVAL_SECONDS = 300
+MEMORY_STORE_MAXSIZE = 10000
+
+STATE_STORES = ("database", "memory")
+
+
+class OIDCStateStore(ABC):
+    """Interface for OIDC state stores."""
+
+    @abstractmethod
+    async def put(self, state: str, nonce: str, code_verifier: str) -> None:
+        """Store the nonce and code verifier of a login started with `state`."""
+
+    @abstractmethod
+    async def pop(self, state: str) -> Optional[Dict[str, str]]:
+        """Return and remove the data stored for `state`, or None if it is unknown or expired."""
+
+    @abstractmethod
+    async def sweep(self) -> int:
+        """Remove expired states, returning how many were removed."""
+
+
+class MemoryOIDCStateStore(OIDCStateStore):
+    """OIDC states in a process-local dict, for single-worker deployments."""
+
+    def __init__(self, ttl: float = OIDC_STATE_TTL_SECONDS, maxsize: int = MEMORY_STORE_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Every entry has the same TTL, so insertion order is expiry order
+        self._states: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+
+    async def put(self, state: str, nonce: str, code_verifier: str) -> None:
+        self._states[state] = (time.monotonic() + self.ttl, {"nonce": nonce, "code_verifier": code_verifier})
+        while len(self._states) > self.maxsize:
+            self._states.popitem(last=False)
+
+    async def pop(self, state: str) -> Optional[Dict[str, str]]:
+        entry = self._states.pop(state, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        removed = 0
+        while self._states:
+            state, (expires_at, _) = next(iter(self._states.items()))
+            if expires_at > now:
+                break
+            del self._states[state]
+            removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+class DatabaseOIDCStateStore(OIDCStateStore):
+    """OIDC states in the oidc_states table, shared by all workers."""
+
+    def __init__(self, session_maker: Optional[Callable[[], AsyncSession]] = None, ttl: float = OIDC_STATE_TTL_SECONDS):
+        self._session_maker = session_maker
+        self.ttl = ttl
+
+    def _session(self) -> AsyncSession:
+        return (self._session_maker or db_manager.async_session_maker)()
+
+    async def put(self, state: str, nonce: str, code_verifier: str) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        async with self._session() as db:
+            await db.execute(
+                insert(OIDCState).values(state=state, nonce=nonce, code_verifier=code_verifier, expires_at=expires_at)
+            )
+            await db.commit()
+
+    async def pop(self, state: str) -> Optional[Dict[str, str]]:
+        # One-time use: the row is deleted by the same statement that reads it
+        async with self._session() as db:
+            result = await db.execute(
+                delete(OIDCState)
+                .where(OIDCState.state == state)
+                .returning(OIDCState.nonce, OIDCState.code_verifier, OIDCState.expires_at)
+            )
+            row = result.first()
+            await db.commit()
+
+        if row is None:
+            return None
+        expires_at = row.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at < datetime.now(timezone.utc):
+            return None
+        return {"nonce": row.nonce, "code_verifier": row.code_verifier}
+
+    async def sweep(self) -> int:
+        async with self._session() as db:
+            result = await db.execute(delete(OIDCState).where(OIDCState.expires_at < datetime.now(timezone.utc)))
+            await db.commit()
+        return result.rowcount or 0
+
+
+_state_store: Optional[OIDCStateStore] = None
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+def get_oidc_state_store() -> OIDCStateStore:
+    """Return the process-wide state store configured by `oidc_state_store`."""
+    global _state_store
+    if _state_store is None:
+        store_name = str(settings.oidc_state_store).lower()
+        if store_name not in STATE_STORES:
+            raise ValueError(f"Invalid oidc_state_store '{store_name}', expected one of {', '.join(STATE_STORES)}")
+        _state_store = MemoryOIDCStateStore() if store_name == "memory" else DatabaseOIDCStateStore()
+        logger.info(f"Using {store_name} OIDC state store")
+    return _state_store
+
+
+async def sweep_oidc_states() -> int:
+    """Remove expired states from the configured store, logging instead of raising on failure."""
+    try:
+        removed = await get_oidc_state_store().sweep()
+    except Exception as e:
+        logger.error(f"Error sweeping expired OIDC states: {str(e)}")
+        return 0
+    if removed:
+        logger.debug(f"Removed {removed} expired OIDC states")
+    return removed
+
+
+async def _sweep_periodically(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await sweep_oidc_states()
+
+
+def start_oidc_state_sweeper(interval: float = OIDC_STATE_SWEEP_INTERVAL_SECONDS) -> None:
+    """Start the background task that removes expired OIDC states."""
+    global _sweeper_task
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.create_task(_sweep_periodically(interval))
+
+
+async def stop_oidc_state_sweeper() -> None:
+    global _sweeper_task
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        try:
+            await _sweeper_task
+        except asyncio.CancelledError:
+            pass
+        _sweeper_task = None
@@ -0,0 +1,200 @@
+import logging
+from collections import defaultdict
+from datetime import date, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.payment_revenue_daily import Payment_revenue_daily
+from models.payments import Payments
+
+logger = logging.getLogger(__name__)
+
+# (day, affiliate_id, payment_type, status)
+RollupKey = Tuple[date, str, str, str]
+
+GRANULARITIES = ("day", "week", "month")
+DIMENSIONS = ("affiliate_id", "payment_type", "status")
+
+# Payment columns that decide which bucket a payment lands in and what it adds
+CONTRIBUTION_COLUMNS = (
+    Payments.id,
+    Payments.amount,
+    Payments.affiliate_id,
+    Payments.payment_type,
+    Payments.status,
+    Payments.payment_date,
+    Payments.created_at,
+    Payments.deleted_at,
+)
+
+UPSERT_CHUNK_SIZE = 1000
+
+
+def payment_bucket(payment: Any) -> Optional[RollupKey]:
+    """Return the rollup bucket a payment counts towards, or None if it is not counted.
+
+    Payments are bucketed by the UTC day of `payment_date`, falling back to
+    `created_at`. Soft-deleted and undated payments are left out.
+    """
+    if payment.deleted_at is not None:
+        return None
+    timestamp = payment.payment_date or payment.created_at
+    if timestamp is None:
+        return None
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return (timestamp.date(), payment.affiliate_id, payment.payment_type, payment.status)
+
+
+class RevenueDelta:
+    """Accumulates signed per-bucket changes to apply to the rollup table.
+
+    Contributions are computed when `add`/`remove` is called, so call `remove`
+    before mutating a payment and `add` afterwards.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[RollupKey, List[float]] = defaultdict(lambda: [0.0, 0])
+
+    def add(self, payment: Any, sign: int = 1) -> None:
+        key = payment_bucket(payment)
+        if key is None:
+            return
+        bucket = self._buckets[key]
+        bucket[0] += sign * (payment.amount or 0.0)
+        bucket[1] += sign
+
+    def remove(self, payment: Any) -> None:
+        self.add(payment, sign=-1)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "day": day,
+                "affiliate_id": affiliate_id,
+                "payment_type": payment_type,
+                "status": status,
+                "total_amount": amount,
+                "payment_count": count,
+            }
+            for (day, affiliate_id, payment_type, status), (amount, count) in self._buckets.items()
+            if count != 0 or amount != 0
+        ]
+
+
+class PaymentRollupService:
+    """Service layer for the payment revenue rollup"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply(self, delta: RevenueDelta) -> None:
+        """Upsert a delta into the rollup table (does not commit)"""
+        rows = delta.rows()
+        if not rows:
+            return
+
+        insert = pg_insert if self.db.bind.dialect.name == "postgresql" else sqlite_insert
+        R = Payment_revenue_daily
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(R).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[R.day, R.affiliate_id, R.payment_type, R.status],
+                set_={
+                    "total_amount": R.total_amount + stmt.excluded.total_amount,
+                    "payment_count": R.payment_count + stmt.excluded.payment_count,
+                },
+            )
+            await self.db.execute(stmt)
+
+        if any(row["payment_count"] < 0 for row in rows):
+            # Drop buckets whose last payment was moved or removed
+            await self.db.execute(delete(R).where(R.payment_count <= 0))
+
+    async def rebuild(self) -> int:
+        """Recompute the whole rollup from the payments table, returning the number of buckets"""
+        try:
+            delta = RevenueDelta()
+            result = await self.db.stream(select(*CONTRIBUTION_COLUMNS).execution_options(yield_per=UPSERT_CHUNK_SIZE))
+            async for row in result:
+                delta.add(row)
+
+            await self.db.execute(delete(Payment_revenue_daily))
+            await self.apply(delta)
+            await self.db.commit()
+            bucket_count = len(delta.rows())
+            logger.info(f"Rebuilt payment revenue rollup with {bucket_count} buckets")
+            return bucket_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error rebuilding payment revenue rollup: {str(e)}")
+            raise
+
+    def _period(self, granularity: str):
+        day = Payment_revenue_daily.day
+        if granularity == "day":
+            return day
+        if self.db.bind.dialect.name == "postgresql":
+            return cast(func.date_trunc(granularity, day), Date)
+        if granularity == "week":
+            # Monday of the week: next Sunday (or today if Sunday), minus six days
+            return func.date(day, "weekday 0", "-6 days")
+        return func.date(day, "start of month")
+
+    async def get_revenue(
+        self,
+        granularity: str = "day",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        group_by: Sequence[str] = DIMENSIONS,
+        affiliate_id: Optional[str] = None,
+        payment_type: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get revenue per period, broken down by the `group_by` dimensions"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Invalid granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+        unknown = [name for name in group_by if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Invalid group_by field(s): {', '.join(unknown)}")
+
+        try:
+            R = Payment_revenue_daily
+            period = self._period(granularity).label("period")
+            dimensions = [getattr(R, name) for name in group_by]
+            query = (
+                select(
+                    period,
+                    *dimensions,
+                    func.sum(R.total_amount).label("total_amount"),
+                    func.sum(R.payment_count).label("payment_count"),
+                )
+                .group_by(period, *dimensions)
+                .order_by(period, *dimensions)
+            )
+            if start:
+                query = query.where(R.day >= start)
+            if end:
+                query = query.where(R.day <= end)
+            if affiliate_id:
+                query = query.where(R.affiliate_id == affiliate_id)
+            if payment_type:
+                query = query.where(R.payment_type == payment_type)
+            if status:
+                query = query.where(R.status == status)
+
+            result = await self.db.execute(query)
+            items = []
+            for row in result.mappings():
+                item = dict(row)
+                if isinstance(item["period"], str):
+                    item["period"] = date.fromisoformat(item["period"])
+                items.append(item)
+            return items
+        except Exception as e:
+            logger.error(f"Error fetching payment revenue: {str(e)}")
+            raise
@@ -1,10 +1,16 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.payments import Payments
+from services.payment_rollups import CONTRIBUTION_COLUMNS, PaymentRollupService, RevenueDelta
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,9 @@ class PaymentsService:
                 data['user_id'] = user_id
             obj = Payments(**data)
             self.db.add(obj)
+            delta = RevenueDelta()
+            delta.add(obj)
+            await PaymentRollupService(self.db).apply(delta)
             await self.db.commit()
             await self.db.refresh(obj)
             logger.info(f"Created payments with id: {obj.id}")
@@ -33,22 +42,19 @@ class PaymentsService:
             raise
 
     async def batch_create(self, items_data: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Payments]:
-        """Create multiple payments in a single transaction"""
+        """Create multiple payments in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
         try:
-            objs = []
-            for data in items_data:
-                if user_id:
+            if user_id:
+                for data in items_data:
                     data['user_id'] = user_id
-                obj = Payments(**data)
-                objs.append(obj)
-
-            self.db.add_all(objs)
-            await self.db.commit()
-
-            # Refresh to populate IDs and other server-side defaults
+            objs = await bulk_insert(self.db, Payments, items_data)
+            delta = RevenueDelta()
             for obj in objs:
-                await self.db.refresh(obj)
-
+                delta.add(obj)
+            await PaymentRollupService(self.db).apply(delta)
+            await self.db.commit()
             logger.info(f"Batch created {len(objs)} payments")
             return objs
         except Exception as e:
@@ -65,12 +71,17 @@ class PaymentsService:
             logger.error(f"Error checking ownership for payments {obj_id}: {str(e)}")
             return False
 
-    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None) -> Optional[Payments]:
+    async def get_by_id(self, obj_id: int, user_id: Optional[str] = None, fields: Optional[str] = None) -> Optional[Union[Payments, Dict[str, Any]]]:
         """Get payments by ID (user can only see their own records)"""
         try:
+            field_names = parse_fields(Payments, fields)
             query = select(Payments).where(Payments.id == obj_id)
             if user_id:
                 query = query.where(Payments.user_id == user_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Payments, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -84,9 +95,13 @@ class PaymentsService:
         user_id: Optional[str] = None,
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of paymentss (user can only see their own records)"""
         try:
+            validate_total_mode(total_mode)
             query = select(Payments)
             count_query = select(func.count(Payments.id))
             
@@ -95,38 +110,72 @@ class PaymentsService:
                 count_query = count_query.where(Payments.user_id == user_id)
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Payments, field):
-                        query = query.where(getattr(Payments, field) == value)
-                        count_query = count_query.where(getattr(Payments, field) == value)
+                filters = compile_filters(Payments, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Payments, field_name):
-                        query = query.order_by(getattr(Payments, field_name).desc())
-                else:
-                    if hasattr(Payments, sort):
-                        query = query.order_by(getattr(Payments, sort))
+            sort_keys = parse_sort(Payments, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
+
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
             else:
-                query = query.order_by(Payments.id.desc())
+                query = query.offset(skip)
+
+            field_names = parse_fields(Payments, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Payments, field_names, [column for column, _ in sort_keys]))
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
+
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Payments, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching payments list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        user_id: Optional[str] = None,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming payments export (user can only see their own records)
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Payments, fields) or [column.key for column in Payments.__table__.c]
+        query = select(*select_columns(Payments, field_names))
+        if user_id:
+            query = query.where(Payments.user_id == user_id)
+        if query_dict:
+            query = query.where(*compile_filters(Payments, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Payments, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any], user_id: Optional[str] = None) -> Optional[Payments]:
         """Update payments (requires ownership)"""
         try:
@@ -134,10 +183,14 @@ class PaymentsService:
             if not obj:
                 logger.warning(f"Payments {obj_id} not found for update")
                 return None
+            delta = RevenueDelta()
+            delta.remove(obj)
             for key, value in update_data.items():
                 if hasattr(obj, key) and key != 'user_id':
                     setattr(obj, key, value)
+            delta.add(obj)
 
+            await PaymentRollupService(self.db).apply(delta)
             await self.db.commit()
             await self.db.refresh(obj)
             logger.info(f"Updated payments {obj_id}")
@@ -147,6 +200,33 @@ class PaymentsService:
             logger.error(f"Error updating payments {obj_id}: {str(e)}")
             raise
 
+    async def batch_update(self, items: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Payments]:
+        """Batch update payments items with one set-based UPDATE ... RETURNING (requires ownership)"""
+        try:
+            criteria = [Payments.user_id == user_id] if user_id else []
+            # Capture revenue contributions before the rows change
+            obj_ids = [item['id'] for item in items]
+            result = await self.db.execute(select(*CONTRIBUTION_COLUMNS).where(Payments.id.in_(obj_ids), *criteria))
+            previous = {row.id: row for row in result}
+
+            updated_objects = await bulk_update(self.db, Payments, items, *criteria, protected=("user_id",))
+            if not updated_objects:
+                logger.warning("No payments items found for batch update")
+                return []
+
+            delta = RevenueDelta()
+            for obj in updated_objects:
+                delta.remove(previous[obj.id])
+                delta.add(obj)
+            await PaymentRollupService(self.db).apply(delta)
+            await self.db.commit()
+            logger.info(f"Batch updated {len(updated_objects)} payments items")
+            return updated_objects
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch update: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int, user_id: Optional[str] = None) -> bool:
         """Delete payments (requires ownership)"""
         try:
@@ -154,6 +234,9 @@ class PaymentsService:
             if not obj:
                 logger.warning(f"Payments {obj_id} not found for deletion")
                 return False
+            delta = RevenueDelta()
+            delta.remove(obj)
+            await PaymentRollupService(self.db).apply(delta)
             await self.db.delete(obj)
             await self.db.commit()
             logger.info(f"Deleted payments {obj_id}")
@@ -163,6 +246,24 @@ class PaymentsService:
             logger.error(f"Error deleting payments {obj_id}: {str(e)}")
             raise
 
+    async def delete_batch(self, obj_ids: List[int], user_id: Optional[str] = None) -> int:
+        """Delete multiple payments items with a single DELETE (requires ownership)"""
+        try:
+            criteria = [Payments.user_id == user_id] if user_id else []
+            delta = RevenueDelta()
+            previous = await self.db.execute(select(*CONTRIBUTION_COLUMNS).where(Payments.id.in_(obj_ids), *criteria))
+            for row in previous:
+                delta.remove(row)
+            await PaymentRollupService(self.db).apply(delta)
+            deleted_count = await bulk_delete(self.db, Payments, obj_ids, *criteria)
+            await self.db.commit()
+            logger.info(f"Batch deleted {deleted_count} payments items")
+            return deleted_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch delete: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Payments]:
         """Get payments by any field"""
         try:
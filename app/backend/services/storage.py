@@ -1,11 +1,21 @@
+import asyncio
 import logging
-from typing import Literal, Optional, Union
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Literal, Optional, Union
 from urllib.parse import urljoin
 
 import httpx
 import mimetypes
 from core.config import settings
+from core.http_clients import OSS, http_clients
 from schemas.storage import (
+    BatchDeleteItem,
+    BatchDeleteRequest,
+    BatchDeleteResponse,
+    BatchPresignItem,
+    BatchPresignRequest,
+    BatchPresignResponse,
     BucketInfo,
     BucketListResponse,
     BucketRequest,
@@ -14,15 +24,62 @@ from schemas.storage import (
     FileUpDownRequest,
     FileUpDownResponse,
     ObjectInfo,
+    ObjectListRequest,
     ObjectListResponse,
     ObjectRequest,
-    OSSBaseModel,
     RenameRequest,
     RenameResponse,
 )
 
+from utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Pages with many thumbnails ask for the same presigned URLs and metadata over and over.
+# Download URLs are kept until shortly before their expires_at; metadata and the bucket
+# list for a short TTL. Renames, deletes and uploads drop the entries of the keys involved.
+DOWNLOAD_URL_EXPIRY_MARGIN_SECONDS = 60
+OBJECT_INFO_TTL_SECONDS = 30
+BUCKET_LIST_TTL_SECONDS = 60
+download_url_cache = TTLCache(ttl=0, maxsize=10000)
+object_info_cache = TTLCache(ttl=OBJECT_INFO_TTL_SECONDS, maxsize=10000)
+bucket_list_cache = TTLCache(ttl=BUCKET_LIST_TTL_SECONDS, maxsize=1)
+
+# Batch operations: how many OSS calls one batch may have in flight, and keys per delete call
+BATCH_CONCURRENCY = 8
+DELETE_CHUNK_SIZE = 100
+
+
+def _seconds_until(expires_at) -> Optional[float]:
+    """Seconds until an OSS `expires_at` (ISO 8601 or epoch seconds), or None if it cannot be parsed."""
+    if expires_at in (None, ""):
+        return None
+    try:
+        return float(expires_at) - time.time()
+    except (TypeError, ValueError):
+        pass
+    try:
+        moment = datetime.fromisoformat(str(expires_at).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - datetime.now(timezone.utc)).total_seconds()
+
+
+def invalidate_object(bucket_name: str, object_key: str) -> None:
+    """Drop cached download URLs and metadata of an object after it changed."""
+    download_url_cache.invalidate((bucket_name, object_key))
+    object_info_cache.invalidate((bucket_name, object_key))
+
+
+def storage_cache_stats() -> dict:
+    return {
+        "download_urls": download_url_cache.stats(),
+        "object_info": object_info_cache.stats(),
+        "buckets": bucket_list_cache.stats(),
+    }
+
 
 class StorageService:
     """Service for handling file upload and display with ObjectStorage service integration."""
@@ -44,6 +101,7 @@ class StorageService:
         payload = {"bucket_name": request.bucket_name, "visibility": request.visibility}
         try:
             result = await self._apost_oss_service(endpoint, payload)
+            bucket_list_cache.clear()
             return BucketResponse(bucket_name=result.get("bucket_name"), created_at=result.get("created_at"))
         except Exception as e:
             logger.error(f"Failed to create bucket: {e}")
@@ -53,25 +111,43 @@ class StorageService:
         """
         List buckets of the user
         """
+        cached = bucket_list_cache.get("buckets")
+        if cached is not None:
+            return cached
+
         endpoint = "api/v1/infra/client/oss/buckets"
         try:
+            generation = bucket_list_cache.generation
             result = await self._aget_oss_service(endpoint=endpoint, params={})
             list_buckets = BucketListResponse()
             for item in result["buckets"]:
                 list_buckets.buckets.append(BucketInfo(bucket_name=item["bucket_name"], visibility=item["visibility"]))
+            bucket_list_cache.set("buckets", list_buckets, generation=generation)
             return list_buckets
         except Exception as e:
             logger.error(f"Failed to list buckets: {e}")
             raise
 
-    async def list_objects(self, request: OSSBaseModel) -> ObjectListResponse:
+    async def list_objects(self, request: ObjectListRequest) -> ObjectListResponse:
         """
-        List objests from the bucket
+        List one page of objects from the bucket, filtered by prefix and delimiter
         """
         endpoint = f"api/v1/infra/client/oss/buckets/{request.bucket_name}/objects"
+        params = {"max_keys": request.max_keys}
+        if request.prefix:
+            params["prefix"] = request.prefix
+        if request.delimiter:
+            params["delimiter"] = request.delimiter
+        if request.continuation_token:
+            params["continuation_token"] = request.continuation_token
         try:
-            result = await self._aget_oss_service(endpoint=endpoint, params={})
-            list_objs = ObjectListResponse()
+            result = await self._aget_oss_service(endpoint=endpoint, params=params)
+            next_token = result.get("next_continuation_token") or None
+            list_objs = ObjectListResponse(
+                prefixes=result.get("common_prefixes") or [],
+                next_continuation_token=next_token,
+                is_truncated=bool(result.get("is_truncated", next_token is not None)),
+            )
             for item in result["objects"]:
                 list_objs.objects.append(
                     ObjectInfo(
@@ -87,21 +163,45 @@ class StorageService:
             logger.error(f"Failed to list bucket objects: {e}")
             raise
 
+    async def iter_objects(self, request: ObjectListRequest) -> AsyncIterator[ObjectListResponse]:
+        """
+        Yield the bucket listing page by page, following continuation tokens.
+
+        Only one page is held at a time, so memory stays bounded however large the bucket is.
+        """
+        page_request = request.model_copy()
+        seen_tokens = set()
+        while True:
+            page = await self.list_objects(page_request)
+            yield page
+            token = page.next_continuation_token
+            if not page.is_truncated or not token or token in seen_tokens:
+                return
+            seen_tokens.add(token)
+            page_request = page_request.model_copy(update={"continuation_token": token})
+
     async def get_object_info(self, request: ObjectRequest) -> ObjectInfo:
         """
         Get object metadata from the bucket
         """
+        cache_key = (request.bucket_name, request.object_key)
+        cached = object_info_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             endpoint = f"api/v1/infra/client/oss/buckets/{request.bucket_name}/objects/metadata"
             params = {"object_key": request.object_key}
             result = await self._aget_oss_service(endpoint, params)
-            return ObjectInfo(
+            info = ObjectInfo(
                 bucket_name=request.bucket_name,
                 object_key=result["key"],
                 size=result["size"],
                 last_modified=result["last_modified"],
                 etag=result["etag"],
             )
+            object_info_cache.set(cache_key, info)
+            return info
         except Exception as e:
             logger.error(f"Failed to get object metadata: {e}")
             raise
@@ -115,6 +215,8 @@ class StorageService:
         }
         try:
             await self._apost_oss_service(endpoint, payload)
+            invalidate_object(request.bucket_name, request.source_key)
+            invalidate_object(request.bucket_name, request.target_key)
             return RenameResponse(success=True)
         except Exception as e:
             logger.error(f"Failed to rename object: {e}")
@@ -125,11 +227,63 @@ class StorageService:
         payload = {"object_keys": [request.object_key]}
         try:
             await self._adelete_oss_service(endpoint, payload)
+            invalidate_object(request.bucket_name, request.object_key)
             return DeleteResponse(success=True)
         except Exception as e:
             logger.error(f"Failed to rename object: {e}")
             raise
 
+    async def delete_objects(self, request: BatchDeleteRequest) -> BatchDeleteResponse:
+        """
+        Delete many keys of a bucket in chunks of DELETE_CHUNK_SIZE, reporting the result per key.
+        """
+        endpoint = f"api/v1/infra/client/oss/buckets/{request.bucket_name}/objects"
+        object_keys = list(dict.fromkeys(request.object_keys))
+        chunks = [object_keys[i : i + DELETE_CHUNK_SIZE] for i in range(0, len(object_keys), DELETE_CHUNK_SIZE)]
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def delete_chunk(chunk: list) -> list:
+            async with semaphore:
+                try:
+                    await self._adelete_oss_service(endpoint, {"object_keys": chunk})
+                except Exception as e:
+                    logger.error(f"Failed to delete {len(chunk)} objects: {e}")
+                    return [BatchDeleteItem(object_key=key, error=str(e)) for key in chunk]
+            for key in chunk:
+                invalidate_object(request.bucket_name, key)
+            return [BatchDeleteItem(object_key=key, success=True) for key in chunk]
+
+        results = await asyncio.gather(*(delete_chunk(chunk) for chunk in chunks))
+        items = [item for chunk_items in results for item in chunk_items]
+        deleted = sum(1 for item in items if item.success)
+        return BatchDeleteResponse(deleted=deleted, failed=len(items) - deleted, items=items)
+
+    async def presign_many(self, request: BatchPresignRequest) -> BatchPresignResponse:
+        """
+        Create presigned upload or download URLs for many objects, at most BATCH_CONCURRENCY at a time.
+
+        A failure only affects its own item, which is returned with `error` set.
+        """
+        create_url = self.create_upload_url if request.operation == "upload" else self.create_download_url
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def presign(item: FileUpDownRequest) -> BatchPresignItem:
+            async with semaphore:
+                try:
+                    result = await create_url(item)
+                except Exception as e:
+                    return BatchPresignItem(bucket_name=item.bucket_name, object_key=item.object_key, error=str(e))
+            return BatchPresignItem(
+                bucket_name=item.bucket_name,
+                object_key=item.object_key,
+                upload_url=result.upload_url,
+                download_url=result.download_url,
+                expires_at=result.expires_at,
+            )
+
+        items = await asyncio.gather(*(presign(item) for item in request.items))
+        return BatchPresignResponse(items=list(items))
+
     async def create_upload_url(self, request: FileUpDownRequest) -> FileUpDownResponse:
         """
         Create presigned URL for file upload with access URL.
@@ -138,6 +292,8 @@ class StorageService:
         payload = {"expires_in": 0, "object_key": request.object_key}
         try:
             result = await self._apost_oss_service(endpoint, payload)
+            # The object is about to be (over)written, so its cached metadata is stale
+            object_info_cache.invalidate((request.bucket_name, request.object_key))
             # Format response according to ObjectStorage service response
             return FileUpDownResponse(
                 upload_url=result.get("upload_url"),
@@ -151,6 +307,11 @@ class StorageService:
         """
         Create presigned URL for file download with access URL.
         """
+        cache_key = (request.bucket_name, request.object_key)
+        cached = download_url_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         endpoint = f"/api/v1/infra/client/oss/buckets/{request.bucket_name}/objects/download_url"
         content_type, _ = mimetypes.guess_type(str(request.object_key))
         if not content_type:
@@ -163,15 +324,47 @@ class StorageService:
         try:
             result = await self._apost_oss_service(endpoint, payload)
             # Format response according to ObjectStorage service response
-            return FileUpDownResponse(
+            response = FileUpDownResponse(
                 download_url=result.get("download_url"),
                 expires_at=result.get("expires_at"),
             )
+            # Cache until shortly before the URL expires; URLs without a readable expiry are not cached
+            remaining = _seconds_until(response.expires_at)
+            if remaining is not None and remaining > DOWNLOAD_URL_EXPIRY_MARGIN_SECONDS:
+                download_url_cache.set(cache_key, response, ttl=remaining - DOWNLOAD_URL_EXPIRY_MARGIN_SECONDS)
+            return response
 
         except Exception as e:
             logger.error(f"Failed to create upload URL: {e}")
             raise
 
+    async def put_object(
+        self,
+        request: FileUpDownRequest,
+        data: Union[bytes, AsyncIterator[bytes]],
+        content_type: str,
+        content_length: Optional[int] = None,
+    ) -> FileUpDownResponse:
+        """
+        Upload bytes (or a stream of bytes of `content_length`) through a presigned upload URL
+        and return a presigned download URL.
+        """
+        headers = {"Content-Type": content_type}
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        try:
+            upload = await self.create_upload_url(request)
+            response = await http_clients.get(OSS).put(upload.upload_url, content=data, headers=headers)
+            response.raise_for_status()
+            return await self.create_download_url(request)
+        except httpx.HTTPStatusError as e:
+            error_msg = f"ObjectStorage upload HTTP error: {e.response.status_code} - {e.response.text}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        except Exception as e:
+            logger.error(f"Failed to upload object: {e}")
+            raise
+
     async def _aget_oss_service(self, endpoint: str, params: dict) -> dict:
         return await self._arequest_oss_service("GET", endpoint, params=params)
 
@@ -192,24 +385,23 @@ class StorageService:
         url = urljoin(settings.oss_service_url, endpoint)
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=self.headers,
-                    params=params,
-                    json=payload,
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await http_clients.get(OSS).request(
+                method=method,
+                url=url,
+                headers=self.headers,
+                params=params,
+                json=payload,
+            )
+            response.raise_for_status()
+            result = response.json()
 
-                if result.get("code") != 0:
-                    logger.warning(f"ObjectStorage service error: {result}")
-                    error_msg = result.get("error", "Unknown error")
-                    message = result.get("message", "")
-                    raise ValueError(f"ObjectStorage service error: {error_msg}. {message}")
+            if result.get("code") != 0:
+                logger.warning(f"ObjectStorage service error: {result}")
+                error_msg = result.get("error", "Unknown error")
+                message = result.get("message", "")
+                raise ValueError(f"ObjectStorage service error: {error_msg}. {message}")
 
-                return result.get("data", [])
+            return result.get("data", [])
         except httpx.HTTPStatusError as e:
             error_msg = f"ObjectStorage service HTTP error: {e.response.status_code} - {e.response.text}"
             logger.error(error_msg)
@@ -0,0 +1,147 @@
+"""
+Storage backends for objects assembled from chunked uploads.
+
+The backend is chosen with the `storage_backend` setting:
+
+- `oss` stores objects in the ObjectStorage service. A finished upload is
+  streamed from the staging file to a presigned PUT URL.
+- `local` stores objects as files under `storage_local_dir`, so the app can run
+  on-prem without an ObjectStorage service. A finished upload is moved into
+  place without copying. Downloads use HMAC-signed URLs served by
+  `GET /api/v1/storage/files/...` as plain file responses.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import mimetypes
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from urllib.parse import quote, urljoin
+
+from core.config import settings
+from schemas.storage import FileUpDownRequest, FileUpDownResponse
+from services.storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKENDS = ("oss", "local")
+FILE_READ_SIZE = 1024 * 1024
+
+
+def guess_content_type(object_key: str) -> str:
+    content_type, _ = mimetypes.guess_type(object_key)
+    return content_type or "application/octet-stream"
+
+
+async def read_file(path: str, chunk_size: int = FILE_READ_SIZE) -> AsyncIterator[bytes]:
+    """Read a file in chunks without blocking the event loop."""
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+class StorageBackend(ABC):
+    """Interface for storage backends."""
+
+    name = ""
+
+    @abstractmethod
+    async def store_file(self, bucket_name: str, object_key: str, path: str, content_type: str) -> FileUpDownResponse:
+        """Store the file at `path` as the object, taking ownership of the file, and return a download URL."""
+
+    @abstractmethod
+    async def create_download_url(self, bucket_name: str, object_key: str) -> FileUpDownResponse:
+        """Return a download URL for an existing object."""
+
+
+class OSSStorageBackend(StorageBackend):
+    """Objects in the ObjectStorage service."""
+
+    name = "oss"
+
+    async def store_file(self, bucket_name: str, object_key: str, path: str, content_type: str) -> FileUpDownResponse:
+        request = FileUpDownRequest(bucket_name=bucket_name, object_key=object_key)
+        size = await asyncio.to_thread(os.path.getsize, path)
+        response = await StorageService().put_object(request, read_file(path), content_type, content_length=size)
+        await asyncio.to_thread(os.remove, path)
+        return response
+
+    async def create_download_url(self, bucket_name: str, object_key: str) -> FileUpDownResponse:
+        request = FileUpDownRequest(bucket_name=bucket_name, object_key=object_key)
+        return await StorageService().create_download_url(request)
+
+
+class LocalStorageBackend(StorageBackend):
+    """Objects as files under a local directory, downloaded through signed URLs."""
+
+    name = "local"
+
+    def __init__(self, root: str, url_ttl: int = 3600):
+        self.root = os.path.abspath(root)
+        self.url_ttl = url_ttl
+
+    def object_path(self, bucket_name: str, object_key: str) -> str:
+        # Bucket names and object keys are sanitized by the request schemas; this guards direct callers
+        path = os.path.abspath(os.path.join(self.root, bucket_name, object_key))
+        if os.path.dirname(os.path.dirname(path)) != self.root:
+            raise ValueError("Invalid bucket_name or object_key")
+        return path
+
+    async def store_file(self, bucket_name: str, object_key: str, path: str, content_type: str) -> FileUpDownResponse:
+        target = self.object_path(bucket_name, object_key)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(target), exist_ok=True)
+        # A rename when staging and storage share a filesystem, a copy otherwise
+        await asyncio.to_thread(shutil.move, path, target)
+        return await self.create_download_url(bucket_name, object_key)
+
+    async def create_download_url(self, bucket_name: str, object_key: str) -> FileUpDownResponse:
+        if not await asyncio.to_thread(os.path.isfile, self.object_path(bucket_name, object_key)):
+            raise ValueError(f"Object {object_key} not found in bucket {bucket_name}")
+        expires = int(time.time()) + self.url_ttl
+        signature = self.sign(bucket_name, object_key, expires)
+        path = f"/api/v1/storage/files/{quote(bucket_name)}/{quote(object_key)}?expires={expires}&signature={signature}"
+        return FileUpDownResponse(
+            download_url=urljoin(settings.backend_url, path),
+            expires_at=datetime.fromtimestamp(expires, timezone.utc).isoformat(),
+        )
+
+    def sign(self, bucket_name: str, object_key: str, expires: int) -> str:
+        if not settings.jwt_secret_key:
+            raise ValueError("JWT secret key is not configured, cannot sign download URLs")
+        message = f"{bucket_name}/{object_key}:{expires}".encode("utf-8")
+        return hmac.new(settings.jwt_secret_key.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+    def verify(self, bucket_name: str, object_key: str, expires: int, signature: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.sign(bucket_name, object_key, expires), signature)
+
+
+_storage_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the process-wide backend configured by `storage_backend`."""
+    global _storage_backend
+    if _storage_backend is None:
+        name = str(settings.storage_backend).lower()
+        if name not in STORAGE_BACKENDS:
+            raise ValueError(f"Invalid storage_backend '{name}', expected one of {', '.join(STORAGE_BACKENDS)}")
+        if name == "local":
+            _storage_backend = LocalStorageBackend(settings.storage_local_dir, settings.storage_local_url_ttl_seconds)
+        else:
+            _storage_backend = OSSStorageBackend()
+        logger.info(f"Using {name} storage backend")
+    return _storage_backend
@@ -0,0 +1,45 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.users_extended import Users_extended
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Profile roles used for authorization checks. Write paths that can change a
+# profile (users_extended service, admin user management) clear this cache
+# after they commit; the TTL bounds staleness across worker processes.
+ROLE_CACHE_TTL_SECONDS = 60
+role_cache = TTLCache(ttl=ROLE_CACHE_TTL_SECONDS, maxsize=10000)
+
+# Cached for users without a profile, so unknown ids are not looked up on every request
+NO_PROFILE = ""
+
+
+def invalidate_user_roles() -> None:
+    """Drop cached roles after a write to users_extended."""
+    role_cache.clear()
+
+
+class UserRoleService:
+    """Service layer for cached profile role lookups"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_role(self, user_id: str) -> Optional[str]:
+        """Get the users_extended role of a user, or None if they have no profile"""
+        role = role_cache.get(user_id)
+        if role is None:
+            generation = role_cache.generation
+            try:
+                result = await self.db.execute(select(Users_extended.role).where(Users_extended.id == user_id))
+            except Exception as e:
+                logger.error(f"Error fetching role for user: {str(e)}")
+                raise
+            role = result.scalar_one_or_none() or NO_PROFILE
+            role_cache.set(user_id, role, generation=generation)
+        return role or None
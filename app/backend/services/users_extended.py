@@ -1,10 +1,17 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.users_extended import Users_extended
+from services.analytics import invalidate_analytics
+from services.user_roles import invalidate_user_roles
+from utils.bulk import bulk_delete, bulk_insert, bulk_update
+from utils.counting import count_total, total_over, validate_total_mode
+from utils.filters import compile_filters
+from utils.pagination import decode_cursor, keyset_predicate, next_cursor, order_by_clauses, parse_sort
+from utils.projection import parse_fields, select_columns, slim_row
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +29,8 @@ class Users_extendedService:
             obj = Users_extended(**data)
             self.db.add(obj)
             await self.db.commit()
+            invalidate_analytics()
+            invalidate_user_roles()
             await self.db.refresh(obj)
             logger.info(f"Created users_extended with id: {obj.id}")
             return obj
@@ -30,10 +39,31 @@ class Users_extendedService:
             logger.error(f"Error creating users_extended: {str(e)}")
             raise
 
-    async def get_by_id(self, obj_id: int) -> Optional[Users_extended]:
+    async def batch_create(self, items_data: List[Dict[str, Any]]) -> List[Users_extended]:
+        """Create multiple users_extended in one transaction with a multi-row INSERT ... RETURNING"""
+        if not items_data:
+            return []
+        try:
+            objs = await bulk_insert(self.db, Users_extended, items_data)
+            await self.db.commit()
+            invalidate_analytics()
+            invalidate_user_roles()
+            logger.info(f"Batch created {len(objs)} users_extended")
+            return objs
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error creating users_extended batch: {str(e)}")
+            raise
+
+    async def get_by_id(self, obj_id: int, fields: Optional[str] = None) -> Optional[Union[Users_extended, Dict[str, Any]]]:
         """Get users_extended by ID"""
         try:
+            field_names = parse_fields(Users_extended, fields)
             query = select(Users_extended).where(Users_extended.id == obj_id)
+            if field_names:
+                result = await self.db.execute(query.with_only_columns(*select_columns(Users_extended, field_names)))
+                row = result.first()
+                return slim_row(row, field_names) if row else None
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except Exception as e:
@@ -46,45 +76,80 @@ class Users_extendedService:
         limit: int = 20, 
         query_dict: Optional[Dict[str, Any]] = None,
         sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        total_mode: str = "exact",
     ) -> Dict[str, Any]:
         """Get paginated list of users_extendeds"""
         try:
+            validate_total_mode(total_mode)
             query = select(Users_extended)
             count_query = select(func.count(Users_extended.id))
             
             if query_dict:
-                for field, value in query_dict.items():
-                    if hasattr(Users_extended, field):
-                        query = query.where(getattr(Users_extended, field) == value)
-                        count_query = count_query.where(getattr(Users_extended, field) == value)
+                filters = compile_filters(Users_extended, query_dict)
+                query = query.where(*filters)
+                count_query = count_query.where(*filters)
             
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            if sort:
-                if sort.startswith('-'):
-                    field_name = sort[1:]
-                    if hasattr(Users_extended, field_name):
-                        query = query.order_by(getattr(Users_extended, field_name).desc())
-                else:
-                    if hasattr(Users_extended, sort):
-                        query = query.order_by(getattr(Users_extended, sort))
-            else:
-                query = query.order_by(Users_extended.id.desc())
+            sort_keys = parse_sort(Users_extended, sort)
+            query = query.order_by(*order_by_clauses(sort_keys))
 
-            result = await self.db.execute(query.offset(skip).limit(limit))
-            items = result.scalars().all()
+            if cursor:
+                # Keyset mode: seek past the last row of the previous page instead of OFFSET
+                query = query.where(keyset_predicate(sort_keys, decode_cursor(sort_keys, cursor, sort)))
+            else:
+                query = query.offset(skip)
+
+            field_names = parse_fields(Users_extended, fields)
+            if field_names:
+                # Column-only select: rows are plain tuples, not ORM objects in the identity map.
+                # Sort keys are selected too so the next cursor can be built from the last row.
+                query = query.with_only_columns(*select_columns(Users_extended, field_names, [column for column, _ in sort_keys]))
+
+            windowed = total_mode == "exact" and not cursor
+            if windowed:
+                # Exact total from a window column, in the same round trip as the page
+                query = query.add_columns(total_over())
+
+            result = await self.db.execute(query.limit(limit))
+            rows = result.all()
+            if windowed and rows:
+                total = rows[0].total_count
+            else:
+                total = await count_total(self.db, Users_extended, count_query, total_mode)
+            items = rows if field_names else [row[0] for row in rows]
+            page_cursor = next_cursor(sort_keys, items, limit, sort)
+            if field_names:
+                items = [slim_row(row, field_names) for row in items]
 
             return {
                 "items": items,
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": page_cursor,
             }
         except Exception as e:
             logger.error(f"Error fetching users_extended list: {str(e)}")
             raise
 
+    def export_query(
+        self,
+        query_dict: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Any, List[str]]:
+        """Build the column-only query for a streaming users_extended export
+
+        Filters are compiled here so invalid queries fail before the response starts.
+        """
+        field_names = parse_fields(Users_extended, fields) or [column.key for column in Users_extended.__table__.c]
+        query = select(*select_columns(Users_extended, field_names))
+        if query_dict:
+            query = query.where(*compile_filters(Users_extended, query_dict))
+        query = query.order_by(*order_by_clauses(parse_sort(Users_extended, sort)))
+        return query, field_names
+
     async def update(self, obj_id: int, update_data: Dict[str, Any]) -> Optional[Users_extended]:
         """Update users_extended"""
         try:
@@ -97,6 +162,8 @@ class Users_extendedService:
                     setattr(obj, key, value)
 
             await self.db.commit()
+            invalidate_analytics()
+            invalidate_user_roles()
             await self.db.refresh(obj)
             logger.info(f"Updated users_extended {obj_id}")
             return obj
@@ -105,6 +172,24 @@ class Users_extendedService:
             logger.error(f"Error updating users_extended {obj_id}: {str(e)}")
             raise
 
+    async def batch_update(self, items: List[Dict[str, Any]]) -> List[Users_extended]:
+        """Batch update users_extended items with one set-based UPDATE ... RETURNING"""
+        try:
+            updated_objects = await bulk_update(self.db, Users_extended, items)
+            if not updated_objects:
+                logger.warning("No users_extended items found for batch update")
+                return []
+
+            await self.db.commit()
+            invalidate_analytics()
+            invalidate_user_roles()
+            logger.info(f"Batch updated {len(updated_objects)} users_extended items")
+            return updated_objects
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch update: {str(e)}")
+            raise
+
     async def delete(self, obj_id: int) -> bool:
         """Delete users_extended"""
         try:
@@ -114,6 +199,8 @@ class Users_extendedService:
                 return False
             await self.db.delete(obj)
             await self.db.commit()
+            invalidate_analytics()
+            invalidate_user_roles()
             logger.info(f"Deleted users_extended {obj_id}")
             return True
         except Exception as e:
@@ -121,6 +208,20 @@ class Users_extendedService:
             logger.error(f"Error deleting users_extended {obj_id}: {str(e)}")
             raise
 
+    async def delete_batch(self, obj_ids: List[str]) -> int:
+        """Delete multiple users_extended items with a single DELETE"""
+        try:
+            deleted_count = await bulk_delete(self.db, Users_extended, obj_ids)
+            await self.db.commit()
+            invalidate_analytics()
+            invalidate_user_roles()
+            logger.info(f"Batch deleted {deleted_count} users_extended items")
+            return deleted_count
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error in batch delete: {str(e)}")
+            raise
+
     async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Users_extended]:
         """Get users_extended by any field"""
         try:
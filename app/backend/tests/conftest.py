@@ -0,0 +1,45 @@
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core.database import Base
+
+
+class StatementCounter:
+    """Counts SQL statements sent to the database while the context is active."""
+
+    def __init__(self, session):
+        self.engine = session.bind.sync_engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Async session bound to a fresh in-memory SQLite database with all entity tables."""
+    import models.audit_logs  # noqa: F401
+    import models.auth  # noqa: F401
+    import models.consignments  # noqa: F401
+    import models.deliveries  # noqa: F401
+    import models.inventory  # noqa: F401
+    import models.issues  # noqa: F401
+    import models.payment_revenue_daily  # noqa: F401
+    import models.payments  # noqa: F401
+    import models.users_extended  # noqa: F401
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        yield session
+    await engine.dispose()
@@ -0,0 +1,87 @@
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from core.config import settings
+from core.database import get_db
+from dependencies.auth import get_current_user
+from models.users_extended import Users_extended
+from routers.admin import router
+from schemas.auth import UserResponse
+from services.user_roles import role_cache
+from services.users_extended import Users_extendedService
+from tests.conftest import StatementCounter
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    role_cache.clear()
+    db_session.add_all(
+        [
+            Users_extended(id="admin1", role="admin", status="active", full_name="Admin"),
+            Users_extended(id="aff1", role="affiliate", status="active", full_name="Affiliate"),
+        ]
+    )
+    await db_session.commit()
+    yield db_session
+    role_cache.clear()
+
+
+def _client(db, user_id, token_role="user"):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        id=user_id, email=f"{user_id}@example.com", name=user_id, role=token_role
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_role_lookup_is_cached(db):
+    async with _client(db, "admin1") as client:
+        first = await client.get("/api/v1/admin/audit-logs")
+        with StatementCounter(db) as counter:
+            second = await client.get("/api/v1/admin/audit-logs")
+
+    assert first.status_code == second.status_code == 200
+    # Only the audit log query itself
+    assert counter.count == 1
+
+
+@pytest.mark.asyncio
+async def test_non_admin_and_unknown_users_are_rejected(db):
+    for user_id in ("aff1", "nobody", "nobody"):
+        async with _client(db, user_id, token_role="admin") as client:
+            response = await client.get("/api/v1/admin/audit-logs")
+        assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_profile_writes_invalidate_roles(db):
+    async with _client(db, "aff1") as client:
+        assert (await client.get("/api/v1/admin/audit-logs")).status_code == 403
+
+        await Users_extendedService(db).update("aff1", {"role": "admin"})
+        assert (await client.get("/api/v1/admin/audit-logs")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_update_user_status_invalidates_roles(db):
+    assert len(role_cache) == 0
+    async with _client(db, "admin1") as client:
+        response = await client.post("/api/v1/admin/users/update-status", json={"user_id": "aff1", "status": "suspended"})
+    assert response.status_code == 200
+    assert len(role_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_trusted_token_role_skips_lookup(db, monkeypatch):
+    monkeypatch.setattr(settings, "admin_trust_token_role", True)
+    async with _client(db, "nobody", token_role="admin") as client:
+        with StatementCounter(db) as counter:
+            response = await client.get("/api/v1/admin/audit-logs")
+
+    assert response.status_code == 200
+    assert counter.count == 1
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import services.aihub as aihub
+import services.aihub_cache as aihub_cache
+from core.config import settings
+from schemas.aihub import GenTxtRequest
+from services.aihub import AIHubService
+from services.aihub_cache import GenTxtResponseCache, gentxt_cache_key
+from services.aihub_limits import SingleFlight
+
+
+def _request(**overrides):
+    return GenTxtRequest(**{"messages": [{"role": "user", "content": "Describe SKU1"}], **overrides})
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, stream=False, **kwargs):
+        self.calls += 1
+        if not stream:
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="A fine product"))],
+                usage=SimpleNamespace(prompt_tokens=3, completion_tokens=3, total_tokens=6),
+            )
+
+        async def chunks():
+            for text in ("A fine ", "product"):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+        return chunks()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "app_ai_base_url", "http://ai.test")
+    monkeypatch.setitem(settings.__dict__, "app_ai_key", "key")
+    monkeypatch.setattr(aihub, "_ai_client", None)
+    monkeypatch.setattr(aihub_cache, "_gentxt_cache", GenTxtResponseCache())
+    service = AIHubService()
+    completions = FakeCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service, completions
+
+
+def test_cache_key_covers_only_generation_inputs():
+    assert gentxt_cache_key(_request()) == gentxt_cache_key(_request(stream=True, cache=True))
+    assert gentxt_cache_key(_request()) != gentxt_cache_key(_request(temperature=0.2))
+    assert gentxt_cache_key(_request()) != gentxt_cache_key(_request(messages=[{"role": "user", "content": "SKU2"}]))
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded_by_entries_and_bytes():
+    cache = GenTxtResponseCache(max_entries=2, max_bytes=10)
+    await cache.set("a", {"content": "1234"})
+    await cache.set("b", {"content": "1234"})
+    await cache.get("a")
+    await cache.set("c", {"content": "1234"})
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+
+    await cache.set("d", {"content": "12345678"})
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(monkeypatch):
+    cache = GenTxtResponseCache(ttl=60)
+    await cache.set("a", {"content": "x"})
+    real_time = time.time
+    monkeypatch.setattr(aihub_cache.time, "time", lambda: real_time() + 61)
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart_and_is_bounded(tmp_path):
+    cache = GenTxtResponseCache(disk_dir=str(tmp_path))
+    await cache.set("a", {"content": "cached", "model": "m", "usage": None})
+
+    restarted = GenTxtResponseCache(disk_dir=str(tmp_path))
+    assert (await restarted.get("a"))["content"] == "cached"
+    assert restarted.stats()["entries"] == 1
+
+    small = GenTxtResponseCache(disk_dir=str(tmp_path), max_disk_bytes=200)
+    for key in "bcdefg":
+        await small.set(key, {"content": "x" * 50})
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 200
+
+
+@pytest.mark.asyncio
+async def test_concurrent_disk_writes_keep_accounting_exact(tmp_path):
+    cache = GenTxtResponseCache(disk_dir=str(tmp_path))
+    await cache.set("first", {"content": "x"})
+    await asyncio.gather(*(cache.set(f"k{i}", {"content": "y" * i}) for i in range(50)))
+    assert cache.stats()["disk_bytes"] == sum(f.stat().st_size for f in tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_gentxt_is_cached_only_when_requested(service):
+    service, completions = service
+    await service.gentxt(_request())
+    await service.gentxt(_request())
+    assert completions.calls == 2
+
+    first = await service.gentxt(_request(cache=True))
+    second = await service.gentxt(_request(cache=True))
+    assert completions.calls == 3
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_cached_answer(service):
+    service, completions = service
+    await service.gentxt(_request(cache=True))
+
+    chunks = [chunk async for chunk in service.gentxt_stream(_request(stream=True, cache=True))]
+    assert chunks == ["A fine product"]
+    assert completions.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_completed_stream_is_cached(service):
+    service, completions = service
+    streamed = [chunk async for chunk in service.gentxt_stream(_request(stream=True, cache=True))]
+    assert streamed == ["A fine ", "product"]
+
+    response = await service.gentxt(_request(cache=True))
+    assert response.content == "A fine product"
+    assert completions.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_uncached_request_is_not_joined_to_cached_call(service, monkeypatch):
+    service, completions = service
+    monkeypatch.setattr(aihub, "single_flight", SingleFlight())
+    original = completions.create
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.01)
+        return await original(**kwargs)
+
+    monkeypatch.setattr(completions, "create", slow_create)
+    await asyncio.gather(
+        service.gentxt(_request(cache=True)), service.gentxt(_request(cache=True)), service.gentxt(_request())
+    )
+    # The two cached callers share one call; the uncached one gets its own
+    assert completions.calls == 2
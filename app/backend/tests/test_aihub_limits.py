@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import services.aihub as aihub
+from core.config import settings
+from routers.aihub import generate_text, router
+from schemas.aihub import GenTxtRequest
+from services.aihub_limits import AIHubOverloadedError, ModelLimit, ModelLimiter, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_shed_with_429():
+    limit = ModelLimit("m", max_concurrency=1, max_queue=1, queue_timeout=5)
+    held = await limit.acquire()
+    waiter = asyncio.create_task(limit.acquire())
+    await asyncio.sleep(0)
+    assert limit.queued == 1
+
+    with pytest.raises(AIHubOverloadedError) as exc:
+        await limit.acquire()
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after >= 1
+
+    await asyncio.sleep(0.01)
+    held.release()
+    (await waiter).release()
+    metrics = limit.metrics()
+    assert (metrics["in_flight"], metrics["queued"], metrics["accepted"], metrics["rejected_queue_full"]) == (0, 0, 2, 1)
+    assert metrics["wait_seconds_max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline_gives_503():
+    limit = ModelLimit("m", max_concurrency=1, max_queue=4, queue_timeout=0.01)
+    async with await limit.acquire():
+        with pytest.raises(AIHubOverloadedError) as exc:
+            await limit.acquire()
+    assert exc.value.status_code == 503
+    assert limit.metrics()["rejected_timeout"] == 1
+
+    # The slot was returned, so the next caller gets in immediately
+    (await limit.acquire()).release()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.run("key", call) for _ in range(5)))
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+    assert await flight.run("key", call) == "result"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_gentxt_returns_retry_after_when_saturated(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "app_ai_base_url", "http://ai.test")
+    monkeypatch.setitem(settings.__dict__, "app_ai_key", "key")
+    monkeypatch.setattr(aihub, "_ai_client", None)
+    limiter = ModelLimiter()
+    monkeypatch.setattr(aihub, "model_limiter", limiter)
+    monkeypatch.setattr(settings, "aihub_max_concurrency", 1)
+    monkeypatch.setattr(settings, "aihub_max_queue", 0)
+    held = await limiter.acquire("deepseek-v3.2")
+
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        body = {"messages": [{"role": "user", "content": "hi"}]}
+        response = await client.post("/api/v1/aihub/gentxt", json=body)
+        streamed = await client.post("/api/v1/aihub/gentxt", json={**body, "stream": True})
+
+    held.release()
+    assert response.status_code == streamed.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_stream_slot_released_when_response_never_iterated(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "app_ai_base_url", "http://ai.test")
+    monkeypatch.setitem(settings.__dict__, "app_ai_key", "key")
+    monkeypatch.setattr(aihub, "_ai_client", None)
+    limiter = ModelLimiter()
+    monkeypatch.setattr(aihub, "model_limiter", limiter)
+
+    request = GenTxtRequest(messages=[{"role": "user", "content": "hi"}], stream=True)
+    response = await generate_text(request)
+    assert limiter.metrics()["deepseek-v3.2"]["in_flight"] == 1
+
+    # The client left before the first event: the body is never iterated, only the background task runs
+    await response.background()
+    assert limiter.metrics()["deepseek-v3.2"]["in_flight"] == 0
+    # Releasing is idempotent, so a stream that also ends on its own does not free the slot twice
+    await response.background()
+    assert limiter.metrics()["deepseek-v3.2"]["in_flight"] == 0
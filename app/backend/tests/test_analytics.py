@@ -0,0 +1,83 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime, timezone
+
+from models.deliveries import Deliveries
+from models.inventory import Inventory
+from models.users_extended import Users_extended
+from services.analytics import AnalyticsService, analytics_cache
+from services.inventory import InventoryService
+from tests.conftest import StatementCounter
+
+
+def _item(i, status, deleted=False):
+    return Inventory(
+        id=i,
+        sku=f"SKU{i}",
+        product_name="P",
+        unit_cost=1.0,
+        retail_price=2.0,
+        status=status,
+        deleted_at=datetime(2026, 1, 1, tzinfo=timezone.utc) if deleted else None,
+    )
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    analytics_cache.clear()
+    db_session.add_all(
+        [
+            _item(1, "WAREHOUSE"),
+            _item(2, "warehouse"),
+            _item(3, "CONSIGNED"),
+            _item(4, "SOLD"),
+            _item(5, "SOLD", deleted=True),
+            Users_extended(id="a1", role="affiliate", status="active", full_name="A"),
+            Users_extended(id="a2", role="affiliate", status="active", full_name="B"),
+            Users_extended(id="d1", role="driver", status="active", full_name="C"),
+        ]
+        + [
+            Deliveries(
+                id=i,
+                user_id="u1",
+                driver_id="d1",
+                consignment_id=i,
+                delivery_address="x",
+                status=status,
+                route_priority=1,
+            )
+            for i, status in enumerate(["PENDING", "IN_PROGRESS", "pending", "DELIVERED"], start=1)
+        ]
+    )
+    await db_session.commit()
+    yield db_session
+    analytics_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_summary_counts(db):
+    summary = await AnalyticsService(db).get_summary()
+
+    assert summary == {
+        "total_inventory": 4,
+        "warehouse_count": 2,
+        "consigned_count": 1,
+        "sold_count": 1,
+        "total_affiliates": 2,
+        "active_deliveries": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_summary_is_cached_until_a_write(db):
+    service = AnalyticsService(db)
+    with StatementCounter(db) as counter:
+        await service.get_summary()
+        await service.get_summary()
+    assert counter.count == 1
+
+    await InventoryService(db).create({"sku": "N", "product_name": "P", "unit_cost": 1.0, "retail_price": 2.0, "status": "SOLD"})
+
+    summary = await service.get_summary()
+    assert summary["sold_count"] == 2
+    assert summary["total_inventory"] == 5
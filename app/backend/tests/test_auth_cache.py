@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import core.auth as auth
+from core.auth import AccessTokenError, clear_access_token_cache, create_access_token, verify_access_token
+from core.config import settings
+from dependencies.auth import get_current_user
+
+
+@pytest.fixture(autouse=True)
+def jwt_settings(monkeypatch):
+    # Settings reads these lazily from the environment and caches them in __dict__
+    monkeypatch.setitem(settings.__dict__, "jwt_secret_key", "test-secret")
+    monkeypatch.setitem(settings.__dict__, "jwt_algorithm", "HS256")
+    monkeypatch.setitem(settings.__dict__, "jwt_expire_minutes", "60")
+    clear_access_token_cache()
+    yield
+    clear_access_token_cache()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    original = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_repeat_token_skips_verification(decode_calls):
+    token = create_access_token({"sub": "u1", "email": "u1@example.com", "role": "admin"})
+
+    first = await get_current_user(token)
+    second = await get_current_user(token)
+
+    assert len(decode_calls) == 1
+    assert second == first
+    assert (first.id, first.email, first.role) == ("u1", "u1@example.com", "admin")
+
+    # Each request gets its own instance
+    first.role = "user"
+    assert (await get_current_user(token)).role == "admin"
+
+
+def test_entry_expires_at_token_exp(decode_calls, monkeypatch):
+    token = create_access_token({"sub": "u1"}, expires_minutes=1)
+    verify_access_token(token)
+    verify_access_token(token)
+    assert len(decode_calls) == 1
+
+    # Past the token's exp the cached entry is gone and the token is verified again
+    real_monotonic = time.monotonic
+    monkeypatch.setattr("utils.cache.time.monotonic", lambda: real_monotonic() + 61)
+    verify_access_token(token)
+    assert len(decode_calls) == 2
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(auth._access_token_cache, "maxsize", 2)
+    tokens = [create_access_token({"sub": f"u{i}"}) for i in range(3)]
+    for token in tokens:
+        verify_access_token(token)
+
+    assert len(auth._access_token_cache) == 2
+    assert auth._access_token_cache.get(auth._token_digest(tokens[0])) is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_not_cached():
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user("not-a-jwt")
+    assert exc.value.status_code == 401
+    assert len(auth._access_token_cache) == 0
+
+
+def test_secret_rotation_invalidates_cached_tokens(monkeypatch):
+    token = create_access_token({"sub": "u1"})
+    verify_access_token(token)
+
+    monkeypatch.setitem(settings.__dict__, "jwt_secret_key", "rotated-secret")
+    with pytest.raises(AccessTokenError):
+        verify_access_token(token)
@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from models.inventory import Inventory
+from models.users_extended import Users_extended
+from services.deliveries import DeliveriesService
+from services.inventory import InventoryService
+from tests.conftest import StatementCounter
+from utils.bulk import bulk_insert
+
+
+def _inventory_rows(count):
+    return [
+        {
+            "sku": f"SKU-{i:04d}",
+            "product_name": f"Product {i}",
+            "unit_cost": 10.0 + i,
+            "retail_price": 20.0 + i,
+            "status": "warehouse",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_create_returns_objects_in_input_order(db_session):
+    service = InventoryService(db_session)
+
+    with StatementCounter(db_session) as counter:
+        created = await service.batch_create(_inventory_rows(500))
+
+    assert [obj.sku for obj in created] == [f"SKU-{i:04d}" for i in range(500)]
+    assert all(obj.id is not None for obj in created)
+    assert len({obj.id for obj in created}) == 500
+    # One multi-row INSERT ... RETURNING regardless of batch size
+    assert counter.count <= 2
+
+
+@pytest.mark.asyncio
+async def test_batch_create_keeps_input_order_for_given_primary_keys(db_session):
+    ids = ["user-c", "user-a", "user-d", "user-b"]
+    rows = [{"id": user_id, "role": "driver", "status": "active", "full_name": user_id} for user_id in ids]
+
+    created = await bulk_insert(db_session, Users_extended, rows)
+
+    assert [obj.id for obj in created] == ids
+    assert [obj.full_name for obj in created] == ids
+
+
+@pytest.mark.asyncio
+async def test_batch_create_keeps_input_order_with_mixed_primary_keys(db_session):
+    rows = _inventory_rows(4)
+    rows[1]["id"] = 100
+    rows[3]["id"] = 50
+
+    created = await bulk_insert(db_session, Inventory, rows)
+
+    assert [obj.sku for obj in created] == [row["sku"] for row in rows]
+    assert created[1].id == 100 and created[3].id == 50
+
+
+@pytest.mark.asyncio
+async def test_batch_create_is_all_or_nothing(db_session):
+    service = InventoryService(db_session)
+    rows = _inventory_rows(10)
+    rows[7]["product_name"] = None
+
+    with pytest.raises(IntegrityError):
+        await service.batch_create(rows)
+
+    total = await db_session.scalar(select(func.count(Inventory.id)))
+    assert total == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_create_sets_owner(db_session):
+    service = DeliveriesService(db_session)
+    rows = [
+        {"driver_id": "d1", "consignment_id": i, "delivery_address": "x", "status": "pending", "route_priority": 1}
+        for i in range(3)
+    ]
+
+    created = await service.batch_create(rows, user_id="owner-1")
+
+    assert [obj.user_id for obj in created] == ["owner-1"] * 3
+    assert await service.batch_create([]) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_update_and_delete_respect_ownership(db_session):
+    service = DeliveriesService(db_session)
+    rows = [
+        {"driver_id": "d1", "consignment_id": i, "delivery_address": "x", "status": "pending", "route_priority": 1}
+        for i in range(4)
+    ]
+    mine = await service.batch_create(rows[:2], user_id="owner-1")
+    theirs = await service.batch_create(rows[2:], user_id="owner-2")
+
+    with StatementCounter(db_session) as counter:
+        updated = await service.batch_update(
+            [
+                {"id": mine[1].id, "updates": {"status": "delivered", "user_id": "owner-2"}},
+                {"id": theirs[0].id, "updates": {"status": "delivered"}},
+                {"id": mine[0].id, "updates": {"route_priority": 5}},
+            ],
+            user_id="owner-1",
+        )
+
+    assert [obj.id for obj in updated] == [mine[1].id, mine[0].id]
+    assert updated[0].status == "delivered" and updated[0].user_id == "owner-1"
+    assert updated[1].route_priority == 5 and updated[1].status == "pending"
+    assert counter.count == 1
+
+    deleted = await service.delete_batch([obj.id for obj in mine + theirs], user_id="owner-2")
+    assert deleted == 2
@@ -0,0 +1,129 @@
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import services.chunked_uploads as chunked_uploads
+import services.storage_backends as storage_backends
+from core.config import settings
+from dependencies.auth import get_current_user
+from routers.storage_uploads import router
+from schemas.auth import UserResponse
+from schemas.storage import ChunkedUploadRequest, FileUpDownResponse
+from services.chunked_uploads import ChunkedUploadStore
+from services.storage import StorageService
+from services.storage_backends import LocalStorageBackend, OSSStorageBackend
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def local(monkeypatch, tmp_path):
+    monkeypatch.setitem(settings.__dict__, "jwt_secret_key", "secret")
+    store = ChunkedUploadStore(str(tmp_path / "staging"), chunk_size=4096, max_size=len(DATA) * 2, ttl=3600)
+    backend = LocalStorageBackend(str(tmp_path / "objects"))
+    monkeypatch.setattr(chunked_uploads, "_upload_store", store)
+    monkeypatch.setattr(storage_backends, "_storage_backend", backend)
+    return store, backend
+
+
+@pytest.fixture
+def client(local):
+    app = FastAPI()
+    app.include_router(router)
+    user = {"id": "u1"}
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id=user["id"], email="u@test")
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    client.user = user
+    return client
+
+
+async def _start(client):
+    response = await client.post(
+        "/api/v1/storage/uploads", json={"bucket_name": "damages", "object_key": "dent.jpg", "size": len(DATA)}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_to_local_backend(client, local):
+    async with client:
+        upload = await _start(client)
+        url = f"/api/v1/storage/uploads/{upload['upload_id']}"
+        assert (upload["received"], upload["chunk_size"]) == (0, 4096)
+
+        assert (await client.put(url, params={"offset": 0}, content=DATA[:4096])).json()["received"] == 4096
+        # Skipping ahead is refused with the offset to resume from
+        gap = await client.put(url, params={"offset": 8192}, content=DATA[8192:])
+        assert gap.status_code == 409
+        assert gap.headers["Upload-Offset"] == "4096"
+        # A chunk resent after a lost acknowledgement overwrites itself
+        assert (await client.put(url, params={"offset": 0}, content=DATA[:4096])).json()["received"] == 4096
+        assert (await client.put(url, params={"offset": 4096}, content=DATA[4096:8192])).json()["received"] == 8192
+
+        early = await client.post(f"{url}/complete")
+        assert early.status_code == 409
+        assert (await client.get(url)).json()["received"] == 8192
+        await client.put(url, params={"offset": 8192}, content=DATA[8192:])
+
+        done = await client.post(f"{url}/complete")
+        assert done.status_code == 200
+        download_url = urlsplit(done.json()["download_url"])
+        file_response = await client.get(f"{download_url.path}?{download_url.query}")
+        assert file_response.status_code == 200
+        assert file_response.content == DATA
+        assert file_response.headers["content-type"] == "image/jpeg"
+
+        forged = await client.get(download_url.path, params={"expires": 9999999999, "signature": "0" * 64})
+        assert forged.status_code == 403
+        assert (await client.get(url)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_chunk_limits_and_ownership(client):
+    async with client:
+        upload = await _start(client)
+        url = f"/api/v1/storage/uploads/{upload['upload_id']}"
+
+        too_big = await client.put(url, params={"offset": 0}, content=b"x" * 5000)
+        assert too_big.status_code == 400
+        # The rejected chunk left nothing behind
+        assert (await client.get(url)).json()["received"] == 0
+
+        client.user["id"] = "someone-else"
+        assert (await client.get(url)).status_code == 404
+        assert (await client.get("/api/v1/storage/uploads/not-an-id")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_expired_uploads(local, monkeypatch):
+    store, _ = local
+    monkeypatch.setattr(store, "ttl", -1)
+    status = await store.create("u1", ChunkedUploadRequest(bucket_name="damages", object_key="a.jpg", size=1))
+    assert await store.sweep() == 1
+    with pytest.raises(chunked_uploads.UploadNotFoundError):
+        await store.status(status.upload_id, "u1")
+
+
+@pytest.mark.asyncio
+async def test_oss_backend_streams_file(monkeypatch, tmp_path):
+    path = tmp_path / "upload.part"
+    path.write_bytes(DATA)
+    received = {}
+
+    async def fake_put_object(self, request, data, content_type, content_length=None):
+        received["body"] = b"".join([chunk async for chunk in data])
+        received["length"] = content_length
+        return FileUpDownResponse(download_url="https://oss.test/dent.jpg", expires_at="")
+
+    monkeypatch.setitem(settings.__dict__, "oss_service_url", "http://oss.test")
+    monkeypatch.setitem(settings.__dict__, "oss_api_key", "key")
+    monkeypatch.setattr(StorageService, "put_object", fake_put_object)
+    monkeypatch.setattr(storage_backends, "FILE_READ_SIZE", 1000)
+
+    response = await OSSStorageBackend().store_file("damages", "dent.jpg", str(path), "image/jpeg")
+    assert response.download_url == "https://oss.test/dent.jpg"
+    assert received == {"body": DATA, "length": len(DATA)}
+    assert not path.exists()
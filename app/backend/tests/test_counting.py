@@ -0,0 +1,91 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from models.inventory import Inventory
+from services.deliveries import DeliveriesService
+from services.inventory import InventoryService
+from tests.conftest import StatementCounter
+from utils.counting import count_cache
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    db_session.add_all(
+        [
+            Inventory(
+                id=i,
+                sku=f"SKU-{i}",
+                product_name="P",
+                unit_cost=1.0,
+                retail_price=2.0,
+                status="WAREHOUSE" if i % 2 else "SOLD",
+            )
+            for i in range(1, 13)
+        ]
+    )
+    await db_session.commit()
+    count_cache.clear()
+    yield db_session
+    count_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_exact_total_uses_one_statement(db):
+    service = InventoryService(db)
+
+    with StatementCounter(db) as counter:
+        page = await service.get_list(limit=5, query_dict={"status": "WAREHOUSE"})
+    assert counter.count == 1
+    assert page["total"] == 6 and len(page["items"]) == 5
+    assert isinstance(page["items"][0], Inventory)
+
+    projected = await service.get_list(limit=5, fields="sku")
+    assert projected["total"] == 12
+    assert set(projected["items"][0]) == {"id", "sku"}
+
+
+@pytest.mark.asyncio
+async def test_exact_total_falls_back_to_count(db):
+    service = InventoryService(db)
+
+    past_end = await service.get_list(skip=50, limit=5)
+    assert past_end["items"] == [] and past_end["total"] == 12
+
+    first = await service.get_list(limit=5)
+    with StatementCounter(db) as counter:
+        second = await service.get_list(limit=5, cursor=first["next_cursor"])
+    # The window count would only see rows after the cursor, so COUNT runs separately
+    assert counter.count == 2
+    assert second["total"] == 12
+
+
+@pytest.mark.asyncio
+async def test_no_total(db):
+    with StatementCounter(db) as counter:
+        page = await InventoryService(db).get_list(limit=5, total_mode="none")
+    assert counter.count == 1
+    assert page["total"] is None and len(page["items"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_estimated_total(db):
+    service = InventoryService(db)
+
+    # Without statistics the estimate is a cached exact count
+    assert (await service.get_list(limit=1, total_mode="estimate"))["total"] == 12
+    await service.delete_batch([1, 2])
+    assert (await service.get_list(limit=1, total_mode="estimate"))["total"] == 12
+
+    # Planner statistics are used for unfiltered lists once they exist
+    await db.execute(text("ANALYZE"))
+    assert (await service.get_list(limit=1, total_mode="estimate"))["total"] == 10
+
+    filtered = await service.get_list(limit=1, total_mode="estimate", query_dict={"status": "SOLD"})
+    assert filtered["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_invalid_total_mode(db):
+    with pytest.raises(ValueError):
+        await DeliveriesService(db).get_list(total_mode="approximate")
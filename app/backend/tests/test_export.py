@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from models.deliveries import Deliveries
+from models.inventory import Inventory
+from routers.deliveries import router as deliveries_router
+from routers.inventory import router as inventory_router
+from schemas.auth import UserResponse
+from services.inventory import InventoryService
+from utils.export import export_response, stream_rows
+
+
+@pytest_asyncio.fixture
+async def client(db_session):
+    db_session.add_all(
+        [
+            Inventory(
+                id=i,
+                sku=f"SKU-{i}",
+                product_name=f"Product, {i}",
+                unit_cost=1.0,
+                retail_price=2.0,
+                status="SOLD" if i % 3 == 0 else "WAREHOUSE",
+            )
+            for i in range(1, 2501)
+        ]
+        + [
+            Deliveries(
+                id=i,
+                user_id="u1" if i % 2 else "u2",
+                driver_id="d1",
+                consignment_id=i,
+                delivery_address="x",
+                status="PENDING",
+                route_priority=1,
+            )
+            for i in range(1, 11)
+        ]
+    )
+    await db_session.commit()
+
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.include_router(deliveries_router)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u1@example.com", name="U1", role="user")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export(client):
+    response = await client.get(
+        "/api/v1/entities/inventory/export",
+        params={"query": json.dumps({"status": "SOLD"}), "sort": "id", "fields": "sku,status"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 833
+    assert rows[0] == {"id": 3, "sku": "SKU-3", "status": "SOLD"}
+    assert rows[-1]["id"] == 2499
+
+
+@pytest.mark.asyncio
+async def test_csv_export(client):
+    response = await client.get("/api/v1/entities/inventory/export", params={"format": "csv", "sort": "-id"})
+
+    assert response.status_code == 200
+    assert 'filename="inventory.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2500
+    assert rows[0]["id"] == "2500" and rows[0]["product_name"] == "Product, 2500"
+    assert rows[0]["description"] == ""
+
+    empty = await client.get(
+        "/api/v1/entities/inventory/export", params={"format": "csv", "fields": "sku", "query": json.dumps({"status": "LOST"})}
+    )
+    assert empty.text.splitlines() == ["id,sku"]
+
+
+@pytest.mark.asyncio
+async def test_export_respects_ownership(client):
+    response = await client.get("/api/v1/entities/deliveries/export", params={"fields": "user_id"})
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [9, 7, 5, 3, 1]
+    assert {row["user_id"] for row in rows} == {"u1"}
+
+
+@pytest.mark.asyncio
+async def test_invalid_export_requests(client):
+    bad_format = await client.get("/api/v1/entities/inventory/export", params={"format": "xml"})
+    bad_query = await client.get("/api/v1/entities/inventory/export", params={"query": json.dumps({"status": {"$regex": "x"}})})
+
+    assert bad_format.status_code == 400
+    assert bad_query.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_rows_stream_in_batches(client, db_session):
+    query, _ = InventoryService(db_session).export_query(fields="sku")
+
+    sizes = [len(batch) async for batch in stream_rows(db_session, query, batch_size=1000)]
+
+    assert sizes == [1000, 1000, 500]
+
+
+@pytest.mark.asyncio
+async def test_export_with_yield_dependency_session(db_session):
+    db_session.add_all([Inventory(id=i, sku=f"SKU-{i}", product_name="p", unit_cost=1.0, retail_price=2.0, status="WAREHOUSE") for i in range(1, 6)])
+    await db_session.commit()
+    closed = []
+
+    async def yield_db():
+        # Like get_db: the session is closed when the dependency exits, which may be before the body is sent
+        async with AsyncSession(bind=db_session.bind) as session:
+            yield session
+        closed.append(session)
+
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.dependency_overrides[get_db] = yield_db
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u1@example.com", name="U1", role="user")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/entities/inventory/export", params={"fields": "sku"})
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 5
+    assert len(closed) == 1
+
+    # The stream does not depend on the request session still being open
+    async with AsyncSession(bind=db_session.bind) as request_session:
+        query, columns = InventoryService(request_session).export_query(fields="sku")
+        export = export_response(request_session, query, columns, "ndjson", "inventory")
+    body = b"".join([chunk async for chunk in export.body_iterator])
+    assert len(body.splitlines()) == 5
+    # ...and leaves no transaction (with its connection) open on it
+    assert not request_session.in_transaction()
@@ -0,0 +1,90 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+
+from models.deliveries import Deliveries
+from services.deliveries import DeliveriesService
+from utils.filters import InvalidQueryError
+from utils.pagination import parse_sort
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    base = datetime(2026, 1, 1)
+    for i in range(1, 11):
+        db_session.add(
+            Deliveries(
+                id=i,
+                user_id="u1",
+                driver_id=f"d{i % 2}",
+                consignment_id=i,
+                delivery_address=f"{i} Main St" if i % 2 else f"{i} High Rd",
+                scheduled_date=None if i % 5 == 0 else base + timedelta(days=i),
+                status=["pending", "in_transit", "delivered"][i % 3],
+                route_priority=i,
+            )
+        )
+    await db_session.commit()
+    return db_session
+
+
+async def _ids(db, query, sort="id"):
+    result = await DeliveriesService(db).get_list(limit=100, query_dict=query, sort=sort)
+    ids = [item.id for item in result["items"]]
+    assert result["total"] == len(ids)
+    return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ({"status": "delivered"}, [2, 5, 8]),
+        ({"status": {"$in": ["pending", "delivered"]}}, [2, 3, 5, 6, 8, 9]),
+        ({"status": ["pending"]}, [3, 6, 9]),
+        ({"status": {"$nin": ["pending", "delivered"]}}, [1, 4, 7, 10]),
+        ({"route_priority": {"$gt": 3, "$lte": 6}}, [4, 5, 6]),
+        ({"route_priority": {"$between": [2, 4]}}, [2, 3, 4]),
+        ({"scheduled_date": {"$gte": "2026-01-08T00:00:00"}}, [7, 8, 9]),
+        ({"scheduled_date": {"$is_null": True}}, [5, 10]),
+        ({"delivery_address": {"$like": "%High%"}, "driver_id": {"$ne": "d0"}}, []),
+        ({"delivery_address": {"$ilike": "%high rd"}}, [2, 4, 6, 8, 10]),
+        ({"not_a_column": 1, "status": "pending"}, [3, 6, 9]),
+    ],
+)
+async def test_operator_filters(db, query, expected):
+    assert await _ids(db, query) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"status": {"$regex": "x"}},
+        {"route_priority": {"$like": "1%"}},
+        {"route_priority": {"$between": [1]}},
+        {"status": {"$in": "pending"}},
+        {"scheduled_date": {"$gt": "yesterday"}},
+        {"scheduled_date": {"$is_null": "yes"}},
+        {"status": {}},
+    ],
+)
+async def test_invalid_operators_rejected(db, query):
+    with pytest.raises(InvalidQueryError):
+        await DeliveriesService(db).get_list(query_dict=query)
+
+
+@pytest.mark.asyncio
+async def test_multi_field_sort(db):
+    assert await _ids(db, None, sort="-status,route_priority") == [3, 6, 9, 1, 4, 7, 10, 2, 5, 8]
+
+
+def test_parse_sort_multi_field():
+    c = Deliveries.__table__.c
+    assert parse_sort(Deliveries, "-status, route_priority,status,bogus") == [
+        (c.status, True),
+        (c.route_priority, False),
+        (c.id, True),
+    ]
+    assert parse_sort(Deliveries, "status,id,route_priority") == [(c.status, False), (c.id, False)]
+    assert parse_sort(Deliveries, "bogus") == [(c.id, True)]
@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import services.aihub as aihub
+from core.config import settings
+from routers.aihub import router
+from schemas.aihub import GenImgRequest
+from schemas.storage import FileUpDownResponse
+from services.aihub import AIHubService
+from services.aihub_limits import ModelLimiter
+
+
+class FakeImages:
+    async def generate(self, **kwargs):
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(url=f"https://img.test/{i}.png", b64_json=None, revised_prompt="p")
+                for i in range(kwargs["n"])
+            ]
+        )
+
+
+class FakeStorage:
+    uploads = []
+
+    async def put_object(self, request, data, content_type):
+        self.uploads.append((request.bucket_name, request.object_key, data, content_type))
+        return FileUpDownResponse(download_url=f"https://oss.test/{request.object_key}", expires_at="")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "app_ai_base_url", "http://ai.test")
+    monkeypatch.setitem(settings.__dict__, "app_ai_key", "key")
+    monkeypatch.setattr(aihub, "_ai_client", None)
+    monkeypatch.setattr(aihub, "model_limiter", ModelLimiter())
+    FakeStorage.uploads = []
+    monkeypatch.setattr(aihub, "StorageService", FakeStorage)
+
+    service = AIHubService()
+    service.client = SimpleNamespace(images=FakeImages())
+    fetching = {"now": 0, "max": 0}
+
+    async def fetch_image(url):
+        fetching["now"] += 1
+        fetching["max"] = max(fetching["max"], fetching["now"])
+        await asyncio.sleep(0.01)
+        fetching["now"] -= 1
+        return b"png-bytes", "image/png"
+
+    monkeypatch.setattr(service, "_fetch_image", fetch_image)
+    return service, fetching
+
+
+@pytest.mark.asyncio
+async def test_base64_images_are_fetched_concurrently(service):
+    service, fetching = service
+    response = await service.genimg(GenImgRequest(prompt="p", n=4))
+
+    assert response.images == ["data:image/png;base64,cG5nLWJ5dGVz"] * 4
+    assert fetching["max"] == 4
+
+
+@pytest.mark.asyncio
+async def test_url_output_skips_download(service):
+    service, fetching = service
+    response = await service.genimg(GenImgRequest(prompt="p", n=2, output="url"))
+
+    assert response.images == ["https://img.test/0.png", "https://img.test/1.png"]
+    assert fetching["max"] == 0
+
+
+@pytest.mark.asyncio
+async def test_storage_output_uploads_and_returns_keys(service):
+    service, _ = service
+    response = await service.genimg(GenImgRequest(prompt="p", n=2, output="storage", bucket_name="media"))
+
+    assert [obj.object_key for obj in response.objects] == [upload[1] for upload in FakeStorage.uploads]
+    assert all(obj.size == len(b"png-bytes") and obj.object_key.endswith(".png") for obj in response.objects)
+    assert response.images == [f"https://oss.test/{obj.object_key}" for obj in response.objects]
+
+
+@pytest.mark.asyncio
+async def test_storage_output_requires_bucket_and_auth():
+    app = FastAPI()
+    app.include_router(router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        no_bucket = await client.post("/api/v1/aihub/genimg", json={"prompt": "p", "output": "storage"})
+        no_auth = await client.post(
+            "/api/v1/aihub/genimg", json={"prompt": "p", "output": "storage", "bucket_name": "media"}
+        )
+
+    assert no_bucket.status_code == 422
+    assert no_auth.status_code == 401
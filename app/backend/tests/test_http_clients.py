@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from core.http_clients import HTTPClientManager
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Minimal keep-alive HTTP/1.1 server that records how many connections it accepted."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    srv = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = srv.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/", connections
+    srv.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reuses_connections(server):
+    url, connections = server
+    clients = HTTPClientManager()
+    try:
+        client = clients.get("images")
+        for _ in range(3):
+            response = await clients.get("images").get(url)
+            assert response.text == "ok"
+
+        assert clients.get("images") is client
+        assert len(connections) == 1
+        stats = clients.pool_stats()["images"]
+        assert stats["requests"] == 3
+        assert (stats["connections"], stats["idle"], stats["active"], stats["queued"]) == (1, 1, 0, 0)
+    finally:
+        await clients.close_all()
+    assert clients.pool_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_closed_client_is_recreated():
+    clients = HTTPClientManager()
+    client = clients.get("oss")
+    await client.aclose()
+
+    assert clients.get("oss") is not client
+    assert clients.get("oss").timeout.read == 120.0
+    await clients.close_all()
@@ -0,0 +1,11 @@
+import pytest
+
+from scripts.check_index_usage import check_index_usage
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes(db_session):
+    async with db_session.bind.connect() as conn:
+        failures = await check_index_usage(conn)
+
+    assert failures == [], "\n\n".join(failures)
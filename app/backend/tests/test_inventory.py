@@ -1,51 +1,60 @@
 import pytest
-from unittest.mock import AsyncMock, patch
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from services.inventory import InventoryService
 from models.inventory import Inventory
 
+
 @pytest.mark.asyncio
-async def test_batch_update_success():
-    mock_db = AsyncMock(spec=AsyncSession)
-    service = InventoryService(mock_db)
+async def test_batch_update_success(db_session):
+    db_session.add_all([
+        Inventory(id=1, sku="A", product_name="Old Name 1", unit_cost=10.0, retail_price=50.0, status="warehouse"),
+        Inventory(id=2, sku="B", product_name="Product 2", unit_cost=10.0, retail_price=75.0, status="warehouse"),
+    ])
+    await db_session.commit()
+    service = InventoryService(db_session)
 
     items_to_update = [
         {"id": 1, "updates": {"product_name": "New Name 1"}},
-        {"id": 2, "updates": {"retail_price": 99.99}},
+        {"id": 2, "updates": {"retail_price": 99.99, "product_name": None}},
     ]
 
-    mock_inventory1 = Inventory(id=1, product_name="Old Name 1", retail_price=50.0)
-    mock_inventory2 = Inventory(id=2, product_name="Product 2", retail_price=75.0)
-
-    # Mock the database execute call to return our mock objects
-    mock_result = AsyncMock()
-    mock_result.scalars.return_value.all.return_value = [mock_inventory1, mock_inventory2]
-    mock_db.execute.return_value = mock_result
-
     updated_items = await service.batch_update(items_to_update)
 
     assert len(updated_items) == 2
     assert updated_items[0].product_name == "New Name 1"
+    assert updated_items[0].retail_price == 50.0
     assert updated_items[1].retail_price == 99.99
-    mock_db.commit.assert_called_once()
-    assert mock_db.refresh.call_count == 2
+    # None values leave the column untouched
+    assert updated_items[1].product_name == "Product 2"
+
+    stored = (await db_session.execute(select(Inventory).order_by(Inventory.id))).scalars().all()
+    assert [(i.product_name, i.retail_price) for i in stored] == [("New Name 1", 50.0), ("Product 2", 99.99)]
+
 
 @pytest.mark.asyncio
-async def test_batch_update_no_items_found():
-    mock_db = AsyncMock(spec=AsyncSession)
-    service = InventoryService(mock_db)
+async def test_batch_update_no_items_found(db_session):
+    service = InventoryService(db_session)
 
     items_to_update = [
         {"id": 1, "updates": {"product_name": "New Name 1"}},
     ]
 
-    # Mock the database to return no items
-    mock_result = AsyncMock()
-    mock_result.scalars.return_value.all.return_value = []
-    mock_db.execute.return_value = mock_result
-
     updated_items = await service.batch_update(items_to_update)
 
     assert len(updated_items) == 0
-    mock_db.commit.assert_not_called()
-    mock_db.rollback.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_batch(db_session):
+    db_session.add_all([
+        Inventory(id=i, sku=str(i), product_name="P", unit_cost=1.0, retail_price=2.0, status="warehouse")
+        for i in range(1, 6)
+    ])
+    await db_session.commit()
+    service = InventoryService(db_session)
+
+    deleted_count = await service.delete_batch([1, 3, 5, 42])
+
+    assert deleted_count == 3
+    remaining = (await db_session.execute(select(Inventory.id).order_by(Inventory.id))).scalars().all()
+    assert remaining == [2, 4]
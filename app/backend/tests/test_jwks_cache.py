@@ -0,0 +1,126 @@
+import asyncio
+import base64
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+import core.auth as auth
+from core.auth import IDTokenValidationError, JWKSCache, parse_cache_control_max_age, validate_id_token
+from core.config import settings
+
+
+def _b64(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _signing_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    numbers = private_key.public_key().public_numbers()
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return pem, {"kty": "RSA", "kid": kid, "use": "sig", "alg": "RS256", "n": _b64(numbers.n), "e": _b64(numbers.e)}
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return {kid: _signing_key(kid) for kid in ("k1", "k2")}
+
+
+@pytest.fixture
+def issuer(monkeypatch, keys):
+    """Fake issuer: publishes the keys listed in `published` and counts fetches."""
+
+    class Issuer:
+        published = ["k1"]
+        max_age = None
+        fetches = 0
+        delay = 0.0
+
+        def token(self, kid, **claims):
+            claims = {"sub": "u1", "iss": "https://issuer.test", "aud": "client", **claims}
+            return jwt.encode(claims, keys[kid][0], algorithm="RS256", headers={"kid": kid})
+
+    fake = Issuer()
+
+    async def fetch():
+        fake.fetches += 1
+        await asyncio.sleep(fake.delay)
+        return {"keys": [keys[kid][1] for kid in fake.published]}, fake.max_age
+
+    monkeypatch.setattr(auth, "_fetch_jwks", fetch)
+    monkeypatch.setattr(auth, "jwks_cache", JWKSCache())
+    monkeypatch.setitem(settings.__dict__, "oidc_issuer_url", "https://issuer.test")
+    monkeypatch.setitem(settings.__dict__, "oidc_client_id", "client")
+    return fake
+
+
+def test_parse_cache_control_max_age():
+    assert parse_cache_control_max_age("public, max-age=600, must-revalidate") == 600
+    assert parse_cache_control_max_age("no-store") == 0
+    assert parse_cache_control_max_age("s-maxage=10") is None
+    assert parse_cache_control_max_age(None) is None
+
+
+@pytest.mark.asyncio
+async def test_keys_are_fetched_once(issuer):
+    for _ in range(3):
+        claims = await validate_id_token(issuer.token("k1"))
+        assert claims["sub"] == "u1"
+    assert issuer.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_unknown_kid_is_single_flight(issuer, monkeypatch):
+    await validate_id_token(issuer.token("k1"))
+    issuer.published = ["k1", "k2"]
+    issuer.delay = 0.01
+    real_monotonic = auth.time.monotonic
+    monkeypatch.setattr(auth.time, "monotonic", lambda: real_monotonic() + auth.JWKS_MIN_REFRESH_SECONDS + 1)
+
+    results = await asyncio.gather(*(validate_id_token(issuer.token("k2")) for _ in range(10)))
+
+    assert all(claims["sub"] == "u1" for claims in results)
+    assert issuer.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetch_is_rate_limited(issuer):
+    await validate_id_token(issuer.token("k1"))
+
+    for _ in range(5):
+        with pytest.raises(IDTokenValidationError) as exc:
+            await validate_id_token(issuer.token("k2"))
+        assert exc.value.error_type == "key_not_found"
+    assert issuer.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_refresh_after_max_age(issuer, monkeypatch):
+    issuer.max_age = 120
+    await validate_id_token(issuer.token("k1"))
+
+    real_monotonic = auth.time.monotonic
+    monkeypatch.setattr(auth.time, "monotonic", lambda: real_monotonic() + 121)
+    await validate_id_token(issuer.token("k1"))
+    assert issuer.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_cached_keys(issuer, monkeypatch):
+    await validate_id_token(issuer.token("k1"))
+
+    async def failing_fetch():
+        issuer.fetches += 1
+        raise Exception("Unable to retrieve authentication keys")
+
+    monkeypatch.setattr(auth, "_fetch_jwks", failing_fetch)
+    real_monotonic = auth.time.monotonic
+    monkeypatch.setattr(auth.time, "monotonic", lambda: real_monotonic() + auth.JWKS_DEFAULT_TTL_SECONDS + 1)
+
+    claims = await validate_id_token(issuer.token("k1"))
+    assert claims["sub"] == "u1"
+    assert issuer.fetches == 2
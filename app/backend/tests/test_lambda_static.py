@@ -0,0 +1,87 @@
+import base64
+import gzip
+
+import pytest
+
+import lambda_handler
+from lambda_handler import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, build_static_manifest, serve_static_file
+
+SCRIPT = b"console.log('hello');\n" * 200
+
+
+@pytest.fixture
+def manifest(monkeypatch, tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-BuVJVs3k.js").write_bytes(SCRIPT)
+    (tmp_path / "assets" / "inter-7f3a9c21.woff2").write_bytes(b"wOF2" + bytes(100))
+    (tmp_path / "favicon.svg").write_bytes(b"<svg/>")
+    (tmp_path / "notes.md").write_bytes(b"ignored")
+    manifest = build_static_manifest(str(tmp_path))
+    monkeypatch.setattr(lambda_handler, "static_manifest", manifest)
+    return manifest
+
+
+def test_manifest_precomputes_assets(manifest):
+    assert set(manifest) == {"/assets/index-BuVJVs3k.js", "/assets/inter-7f3a9c21.woff2", "/favicon.svg"}
+    script = manifest["/assets/index-BuVJVs3k.js"]
+    assert script["cache_control"] == IMMUTABLE_CACHE_CONTROL
+    assert "gzip" in script["variants"]
+    font = manifest["/assets/inter-7f3a9c21.woff2"]
+    assert font["content_type"] == "font/woff2"
+    # Already compressed formats and files that do not shrink keep only the raw body
+    assert list(font["variants"]) == ["identity"]
+    assert list(manifest["/favicon.svg"]["variants"]) == ["identity"]
+    assert manifest["/favicon.svg"]["cache_control"] == REVALIDATE_CACHE_CONTROL
+
+
+def test_serves_compressed_variant_and_304(manifest, monkeypatch):
+    # Warm requests are served from memory
+    monkeypatch.setattr(lambda_handler.os.path, "exists", lambda path: pytest.fail("filesystem accessed"))
+
+    response = serve_static_file("/assets/index-BuVJVs3k.js", {"Accept-Encoding": "gzip, deflate, br;q=0"})
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(base64.b64decode(response["body"])) == SCRIPT
+
+    plain = serve_static_file("/assets/index-BuVJVs3k.js", {})
+    assert "Content-Encoding" not in plain["headers"]
+    assert base64.b64decode(plain["body"]) == SCRIPT
+
+    etag = response["headers"]["ETag"]
+    assert etag.endswith('-gz"')
+    assert plain["headers"]["ETag"] == etag.replace("-gz", "")
+    cached = serve_static_file(
+        "/assets/index-BuVJVs3k.js", {"if-none-match": f'W/{etag}, "other"', "accept-encoding": "gzip"}
+    )
+    assert (cached["statusCode"], cached["body"]) == (304, "")
+    assert cached["headers"]["ETag"] == etag
+    # The gzip validator does not confirm the uncompressed body
+    assert serve_static_file("/assets/index-BuVJVs3k.js", {"if-none-match": etag})["statusCode"] == 200
+
+    assert serve_static_file("/assets/missing.js", {})["statusCode"] == 404
+
+
+def test_lambda_handler_routes_fonts(manifest):
+    event = {"httpMethod": "GET", "path": "/assets/inter-7f3a9c21.woff2", "headers": {}}
+    response = lambda_handler.lambda_handler(event, None)
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+
+@pytest.mark.parametrize(
+    "url_path, hashed",
+    [
+        ("/assets/index-BuVJVs3k.js", True),
+        ("/assets/index-abcdefgh.js", True),
+        ("/assets/react-vendor-D4f_9xQ2.js", True),
+        ("/assets/banner-v2-large.jpg", False),
+        ("/assets/roboto-v30-latin-regular.woff2", False),
+        ("/assets/proof-of-delivery-1.png", False),
+        ("/images/logo-BuVJVs3k.png", False),
+        ("/favicon.svg", False),
+    ],
+)
+def test_hashed_asset_detection(url_path, hashed):
+    assert lambda_handler.is_hashed_asset(url_path) is hashed
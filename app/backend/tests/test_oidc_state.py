@@ -0,0 +1,94 @@
+import time
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import services.oidc_state as oidc_state
+from models.auth import OIDCState
+from services.oidc_state import DatabaseOIDCStateStore, MemoryOIDCStateStore, OIDCStateStore
+from tests.conftest import StatementCounter
+
+
+@pytest.fixture
+def later(monkeypatch):
+    """Move the monotonic clock seen by the memory store forward."""
+
+    def advance(seconds):
+        real_monotonic = time.monotonic
+        monkeypatch.setattr(oidc_state.time, "monotonic", lambda: real_monotonic() + seconds)
+
+    return advance
+
+
+@pytest.mark.asyncio
+async def test_memory_store_is_one_time_use():
+    store = MemoryOIDCStateStore()
+    await store.put("s1", "n1", "v1")
+
+    assert await store.pop("s1") == {"nonce": "n1", "code_verifier": "v1"}
+    assert await store.pop("s1") is None
+    assert await store.pop("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expiry_and_sweep(later):
+    store = MemoryOIDCStateStore(ttl=10)
+    await store.put("s1", "n1", "v1")
+    await store.put("s2", "n2", "v2")
+
+    later(11)
+    assert await store.pop("s1") is None
+    await store.put("s3", "n3", "v3")
+    assert await store.sweep() == 1
+    assert len(store) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_store_is_bounded():
+    store = MemoryOIDCStateStore(maxsize=2)
+    for i in range(3):
+        await store.put(f"s{i}", "n", "v")
+
+    assert len(store) == 2
+    assert await store.pop("s0") is None
+
+
+@pytest.mark.asyncio
+async def test_database_store_round_trip_is_one_statement_each(db_session):
+    store = DatabaseOIDCStateStore(async_sessionmaker(db_session.bind, expire_on_commit=False))
+
+    with StatementCounter(db_session) as counter:
+        await store.put("s1", "n1", "v1")
+    assert counter.count == 1
+
+    with StatementCounter(db_session) as counter:
+        assert await store.pop("s1") == {"nonce": "n1", "code_verifier": "v1"}
+    assert counter.count == 1
+    assert await store.pop("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_database_store_expiry_and_sweep(db_session):
+    store = DatabaseOIDCStateStore(async_sessionmaker(db_session.bind, expire_on_commit=False))
+    expired = DatabaseOIDCStateStore(store._session_maker, ttl=-60)
+    await expired.put("old1", "n", "v")
+    await expired.put("old2", "n", "v")
+    await store.put("fresh", "n", "v")
+
+    assert await store.pop("old1") is None
+    assert await store.sweep() == 1
+    remaining = await db_session.execute(select(func.count()).select_from(OIDCState))
+    assert remaining.scalar() == 1
+
+
+def test_incomplete_store_fails_on_creation():
+    class NoSweepStore(OIDCStateStore):
+        async def put(self, state, nonce, code_verifier):
+            pass
+
+        async def pop(self, state):
+            return None
+
+    with pytest.raises(TypeError):
+        NoSweepStore()
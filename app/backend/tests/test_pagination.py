@@ -0,0 +1,71 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta, timezone
+
+from models.deliveries import Deliveries
+from services.deliveries import DeliveriesService
+from utils.pagination import InvalidCursorError
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(1, 26):
+        db_session.add(
+            Deliveries(
+                id=i,
+                user_id="u1" if i % 5 else "u2",
+                driver_id="d1",
+                consignment_id=i,
+                delivery_address=f"{i} Main St",
+                # Every fourth row has no schedule, and pairs share a date to exercise the id tie-break
+                scheduled_date=None if i % 4 == 0 else base + timedelta(days=i // 2),
+                status="pending",
+                route_priority=i % 3,
+            )
+        )
+    await db_session.commit()
+    return db_session
+
+
+async def _walk(service, sort, limit, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = await service.get_list(limit=limit, sort=sort, cursor=cursor, **kwargs)
+        ids.extend(item.id for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", [None, "id", "-id", "route_priority", "-route_priority", "scheduled_date", "-scheduled_date", "route_priority,-scheduled_date", "-route_priority,scheduled_date"])
+async def test_cursor_walk_matches_offset_order(db, sort):
+    service = DeliveriesService(db)
+
+    full = await service.get_list(limit=100, sort=sort)
+    expected = [item.id for item in full["items"]]
+
+    assert await _walk(service, sort, limit=4) == expected
+    assert len(expected) == 25
+
+
+@pytest.mark.asyncio
+async def test_cursor_respects_ownership_filter(db):
+    service = DeliveriesService(db)
+
+    ids = await _walk(service, "-scheduled_date", limit=3, user_id="u1")
+
+    assert len(ids) == 20
+    assert all(i % 5 for i in ids)
+
+
+@pytest.mark.asyncio
+async def test_cursor_rejects_mismatched_sort(db):
+    service = DeliveriesService(db)
+    page = await service.get_list(limit=5, sort="route_priority")
+
+    with pytest.raises(InvalidCursorError):
+        await service.get_list(limit=5, sort="-id", cursor=page["next_cursor"])
+    with pytest.raises(InvalidCursorError):
+        await service.get_list(limit=5, cursor="not-a-cursor")
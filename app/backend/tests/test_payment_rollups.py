@@ -0,0 +1,124 @@
+import pytest
+from datetime import date, datetime, timezone
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from models.payment_revenue_daily import Payment_revenue_daily
+from services.payment_rollups import PaymentRollupService
+from routers.payments import router as payments_router
+from schemas.auth import UserResponse
+from services.payments import PaymentsService
+
+
+def _payment(day, amount, affiliate_id="aff-1", payment_type="SALE", status="COMPLETED"):
+    return {
+        "affiliate_id": affiliate_id,
+        "amount": amount,
+        "payment_type": payment_type,
+        "status": status,
+        "payment_date": datetime(2026, 3, day, 12, tzinfo=timezone.utc),
+    }
+
+
+async def _rollup(db):
+    result = await db.execute(select(Payment_revenue_daily))
+    return sorted(
+        (r.day, r.affiliate_id, r.payment_type, r.status, round(r.total_amount, 2), r.payment_count)
+        for r in result.scalars()
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_keep_rollup_in_sync_with_rebuild(db_session):
+    service = PaymentsService(db_session)
+
+    first = await service.create(_payment(2, 100.0), user_id="u1")
+    created = await service.batch_create(
+        [_payment(2, 50.0), _payment(3, 20.0, payment_type="FEE"), _payment(9, 10.0, affiliate_id="aff-2")],
+        user_id="u1",
+    )
+    await service.update(first.id, {"status": "REFUNDED"}, user_id="u1")
+    await service.batch_update(
+        [
+            {"id": created[1].id, "updates": {"amount": 25.0}},
+            {"id": created[2].id, "updates": {"notes": "no revenue change"}},
+        ],
+        user_id="u1",
+    )
+    await service.delete(created[0].id, user_id="u1")
+    await service.batch_create([_payment(4, 5.0), _payment(4, 7.0)], user_id="u1")
+
+    assert await _rollup(db_session) == [
+        (date(2026, 3, 2), "aff-1", "SALE", "REFUNDED", 100.0, 1),
+        (date(2026, 3, 3), "aff-1", "FEE", "COMPLETED", 25.0, 1),
+        (date(2026, 3, 4), "aff-1", "SALE", "COMPLETED", 12.0, 2),
+        (date(2026, 3, 9), "aff-2", "SALE", "COMPLETED", 10.0, 1),
+    ]
+
+    incremental = await _rollup(db_session)
+    assert await PaymentRollupService(db_session).rebuild() == 4
+    assert await _rollup(db_session) == incremental
+
+    deleted = await service.delete_batch([p.id for p in created], user_id="u1")
+    assert deleted == 2
+    assert [row[0] for row in await _rollup(db_session)] == [date(2026, 3, 2), date(2026, 3, 4)]
+
+
+@pytest.mark.asyncio
+async def test_revenue_by_period(db_session):
+    service = PaymentsService(db_session)
+    # 2026-03-02 is a Monday; the 8th is the Sunday closing that week
+    await service.batch_create(
+        [
+            _payment(2, 10.0),
+            _payment(8, 20.0),
+            _payment(9, 40.0, affiliate_id="aff-2"),
+            _payment(31, 80.0, status="PENDING"),
+        ],
+        user_id="u1",
+    )
+    rollups = PaymentRollupService(db_session)
+
+    weekly = await rollups.get_revenue("week", group_by=[])
+    assert [(r["period"], r["total_amount"], r["payment_count"]) for r in weekly] == [
+        (date(2026, 3, 2), 30.0, 2),
+        (date(2026, 3, 9), 40.0, 1),
+        (date(2026, 3, 30), 80.0, 1),
+    ]
+
+    monthly = await rollups.get_revenue("month", group_by=["affiliate_id"], status="COMPLETED")
+    assert [(r["period"], r["affiliate_id"], r["total_amount"]) for r in monthly] == [
+        (date(2026, 3, 1), "aff-1", 30.0),
+        (date(2026, 3, 1), "aff-2", 40.0),
+    ]
+
+    daily = await rollups.get_revenue("day", start=date(2026, 3, 8), end=date(2026, 3, 9))
+    assert [(r["period"], r["affiliate_id"], r["payment_type"], r["status"]) for r in daily] == [
+        (date(2026, 3, 8), "aff-1", "SALE", "COMPLETED"),
+        (date(2026, 3, 9), "aff-2", "SALE", "COMPLETED"),
+    ]
+
+    with pytest.raises(ValueError):
+        await rollups.get_revenue("year")
+    with pytest.raises(ValueError):
+        await rollups.get_revenue("day", group_by=["amount"])
+
+
+@pytest.mark.asyncio
+async def test_revenue_endpoint_is_admin_only(db_session):
+    app = FastAPI()
+    app.include_router(payments_router)
+    app.dependency_overrides[get_db] = lambda: db_session
+    user = {"role": "user"}
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u1@example.com", role=user["role"])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        denied = await client.get("/api/v1/entities/payments/revenue")
+        user["role"] = "admin"
+        allowed = await client.get("/api/v1/entities/payments/revenue")
+
+    assert denied.status_code == 403
+    assert allowed.status_code == 200
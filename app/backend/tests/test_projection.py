@@ -0,0 +1,77 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from models.deliveries import Deliveries
+from services.deliveries import DeliveriesService
+
+
+@pytest_asyncio.fixture
+async def db(db_session):
+    for i in range(1, 8):
+        db_session.add(
+            Deliveries(
+                id=i,
+                user_id="u1",
+                driver_id="d1",
+                consignment_id=i,
+                delivery_address=f"{i} Main St",
+                status="pending",
+                route_priority=i % 3,
+                notes="x" * 1000,
+            )
+        )
+    await db_session.commit()
+    db_session.expunge_all()
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_list_projection_selects_only_requested_columns(db):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        page = await DeliveriesService(db).get_list(limit=3, fields="status, bogus", sort="route_priority", user_id="u1")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert page["items"] == [{"id": 3, "status": "pending"}, {"id": 6, "status": "pending"}, {"id": 1, "status": "pending"}]
+    assert "notes" not in statements[-1] and "delivery_address" not in statements[-1]
+    # Slim rows never enter the identity map
+    assert len(db.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test_projection_cursor_walk_matches_full_rows(db):
+    service = DeliveriesService(db)
+    full = await service.get_list(limit=100, sort="-route_priority")
+    expected = [item.id for item in full["items"]]
+
+    ids, cursor = [], None
+    while True:
+        page = await service.get_list(limit=2, sort="-route_priority", cursor=cursor, fields="driver_id")
+        assert all(set(item) == {"id", "driver_id"} for item in page["items"])
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == expected
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_projection(db):
+    service = DeliveriesService(db)
+
+    assert await service.get_by_id(2, user_id="u1", fields="consignment_id,status") == {
+        "id": 2,
+        "consignment_id": 2,
+        "status": "pending",
+    }
+    assert await service.get_by_id(2, user_id="u2", fields="status") is None
+    assert isinstance(await service.get_by_id(2), Deliveries)
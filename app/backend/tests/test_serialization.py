@@ -0,0 +1,59 @@
+import json
+
+import httpx
+import pytest
+from datetime import datetime, timezone
+from fastapi import FastAPI
+
+from core.database import get_db
+from models.inventory import Inventory
+from routers.inventory import InventoryListResponse, InventoryResponse, router as inventory_router
+from services.inventory import InventoryService
+from utils.serialization import list_response
+
+
+def _item(i):
+    return Inventory(
+        id=i,
+        sku=f"SKU-{i}",
+        product_name=f"Product {i}",
+        unit_cost=1.5,
+        retail_price=3.0,
+        status="WAREHOUSE",
+        created_at=datetime(2026, 1, i, 8, 30, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_validated_response(db_session):
+    db_session.add_all([_item(i) for i in range(1, 4)])
+    await db_session.commit()
+    result = await InventoryService(db_session).get_list(limit=10)
+
+    fast = json.loads(list_response(InventoryResponse, result).body)
+    validated = InventoryListResponse.model_validate(result).model_dump(mode="json")
+
+    assert fast == validated
+
+
+@pytest.mark.asyncio
+async def test_entity_router_uses_fast_path(db_session):
+    db_session.add_all([_item(i) for i in range(1, 4)])
+    await db_session.commit()
+
+    app = FastAPI()
+    app.include_router(inventory_router)
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        page = await client.get("/api/v1/entities/inventory", params={"limit": 2, "sort": "id"})
+        projected = await client.get("/api/v1/entities/inventory/all", params={"fields": "sku", "total": "none"})
+        single = await client.get("/api/v1/entities/inventory/2")
+
+    assert page.status_code == 200
+    body = page.json()
+    assert [item["sku"] for item in body["items"]] == ["SKU-1", "SKU-2"]
+    assert body["total"] == 3 and body["next_cursor"]
+    assert projected.json()["items"][0] == {"id": 3, "sku": "SKU-3"}
+    assert projected.json()["total"] is None
+    assert single.json()["product_name"] == "Product 2"
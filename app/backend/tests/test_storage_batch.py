@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import services.storage as storage
+from core.config import settings
+from dependencies.auth import get_current_user
+from routers.storage import router
+from schemas.auth import UserResponse
+from schemas.storage import BatchDeleteRequest, BatchPresignRequest
+from services.storage import StorageService
+from utils.cache import TTLCache
+
+
+class FakeOSS:
+    def __init__(self):
+        self.deletes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def post(self, endpoint, payload):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if payload["object_key"].startswith("bad"):
+                raise ValueError("upstream rejected key")
+            kind = "upload_url" if endpoint.endswith("upload_url") else "download_url"
+            return {kind: f"https://oss.test/{payload['object_key']}", "expires_at": ""}
+        finally:
+            self.in_flight -= 1
+
+    async def delete(self, endpoint, payload):
+        self.deletes.append(payload["object_keys"])
+        if "bad" in payload["object_keys"]:
+            raise ValueError("chunk failed")
+        return {}
+
+
+@pytest.fixture
+def oss(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "oss_service_url", "http://oss.test")
+    monkeypatch.setitem(settings.__dict__, "oss_api_key", "key")
+    monkeypatch.setattr(storage, "download_url_cache", TTLCache(ttl=0))
+    monkeypatch.setattr(storage, "object_info_cache", TTLCache(ttl=storage.OBJECT_INFO_TTL_SECONDS))
+    fake = FakeOSS()
+    monkeypatch.setattr(StorageService, "_apost_oss_service", lambda self, endpoint, payload: fake.post(endpoint, payload))
+    monkeypatch.setattr(StorageService, "_adelete_oss_service", lambda self, endpoint, payload: fake.delete(endpoint, payload))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_presign_many_bounded_with_per_item_errors(oss):
+    keys = [f"photo-{i}.jpg" for i in range(20)] + ["bad.jpg"]
+    request = BatchPresignRequest(
+        operation="upload", items=[{"bucket_name": "damages", "object_key": key} for key in keys]
+    )
+    response = await StorageService().presign_many(request)
+
+    assert [item.object_key for item in response.items] == keys
+    assert all(item.upload_url == f"https://oss.test/{item.object_key}" for item in response.items[:-1])
+    assert response.items[-1].error == "upstream rejected key"
+    assert response.items[-1].upload_url == ""
+    assert 1 < oss.max_in_flight <= storage.BATCH_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_delete_objects_in_chunks(oss, monkeypatch):
+    monkeypatch.setattr(storage, "DELETE_CHUNK_SIZE", 2)
+    request = BatchDeleteRequest(bucket_name="damages", object_keys=["a", "b", "a", "bad", "c"])
+    response = await StorageService().delete_objects(request)
+
+    assert sorted(map(tuple, oss.deletes)) == [("a", "b"), ("bad", "c")]
+    assert (response.deleted, response.failed) == (2, 2)
+    assert {item.object_key: item.success for item in response.items} == {"a": True, "b": True, "bad": False, "c": False}
+
+
+@pytest.mark.asyncio
+async def test_batch_presign_endpoint(oss):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u@test", name="u", role="user")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/storage/batch-presign",
+            json={"operation": "download", "items": [{"bucket_name": "signatures", "object_key": "s.png"}]},
+        )
+        empty = await client.post("/api/v1/storage/batch-presign", json={"operation": "download", "items": []})
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["download_url"] == "https://oss.test/s.png"
+    assert empty.status_code == 422
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import services.storage as storage
+from core.config import settings
+from schemas.storage import FileUpDownRequest, ObjectRequest, RenameRequest
+from services.storage import StorageService
+from utils.cache import TTLCache
+
+
+class FakeOSS:
+    def __init__(self, expires_in=3600):
+        self.calls = []
+        self.expires_in = expires_in
+
+    async def get(self, endpoint, params):
+        self.calls.append(("get", endpoint))
+        if endpoint.endswith("/metadata"):
+            return {"key": params["object_key"], "size": 10, "last_modified": "2024-01-01T00:00:00Z", "etag": "e"}
+        return {"buckets": [{"bucket_name": "media", "visibility": "private"}]}
+
+    async def post(self, endpoint, payload):
+        self.calls.append(("post", endpoint))
+        if endpoint.endswith("download_url"):
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.expires_in)
+            return {"download_url": f"https://oss.test/{payload['object_key']}", "expires_at": expires_at.isoformat()}
+        return {}
+
+    async def delete(self, endpoint, payload):
+        self.calls.append(("delete", endpoint))
+        return {}
+
+
+@pytest.fixture
+def oss(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "oss_service_url", "http://oss.test")
+    monkeypatch.setitem(settings.__dict__, "oss_api_key", "key")
+    monkeypatch.setattr(storage, "download_url_cache", TTLCache(ttl=0))
+    monkeypatch.setattr(storage, "object_info_cache", TTLCache(ttl=storage.OBJECT_INFO_TTL_SECONDS))
+    monkeypatch.setattr(storage, "bucket_list_cache", TTLCache(ttl=storage.BUCKET_LIST_TTL_SECONDS, maxsize=1))
+    fake = FakeOSS()
+    monkeypatch.setattr(StorageService, "_aget_oss_service", lambda self, endpoint, params: fake.get(endpoint, params))
+    monkeypatch.setattr(StorageService, "_apost_oss_service", lambda self, endpoint, payload: fake.post(endpoint, payload))
+    monkeypatch.setattr(StorageService, "_adelete_oss_service", lambda self, endpoint, payload: fake.delete(endpoint, payload))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_download_url_cached_until_shortly_before_expiry(oss, monkeypatch):
+    service = StorageService()
+    request = FileUpDownRequest(bucket_name="media", object_key="a.png")
+    first = await service.create_download_url(request)
+    second = await service.create_download_url(request)
+    assert second is first
+    assert len(oss.calls) == 1
+
+    now = storage.time.monotonic()
+    monkeypatch.setattr("utils.cache.time.monotonic", lambda: now + 3600 - storage.DOWNLOAD_URL_EXPIRY_MARGIN_SECONDS + 1)
+    await service.create_download_url(request)
+    assert len(oss.calls) == 2
+    assert storage.storage_cache_stats()["download_urls"]["hit_rate"] == round(1 / 3, 3)
+
+
+@pytest.mark.asyncio
+async def test_short_lived_or_unparseable_urls_are_not_cached(oss, monkeypatch):
+    oss.expires_in = storage.DOWNLOAD_URL_EXPIRY_MARGIN_SECONDS - 1
+    service = StorageService()
+    request = FileUpDownRequest(bucket_name="media", object_key="a.png")
+    await service.create_download_url(request)
+    await service.create_download_url(request)
+    assert len(oss.calls) == 2
+    assert storage._seconds_until("not a date") is None
+    assert storage._seconds_until("") is None
+
+
+@pytest.mark.asyncio
+async def test_metadata_and_buckets_cached(oss):
+    service = StorageService()
+    request = ObjectRequest(bucket_name="media", object_key="a.png")
+    await service.get_object_info(request)
+    await service.get_object_info(request)
+    await service.list_buckets()
+    await service.list_buckets()
+    assert [call[0] for call in oss.calls] == ["get", "get"]
+
+
+@pytest.mark.asyncio
+async def test_rename_and_delete_invalidate(oss):
+    service = StorageService()
+    for key in ("a.png", "c.png"):
+        await service.get_object_info(ObjectRequest(bucket_name="media", object_key=key))
+        await service.create_download_url(FileUpDownRequest(bucket_name="media", object_key=key))
+    assert len(storage.object_info_cache) == 2
+    assert len(storage.download_url_cache) == 2
+
+    await service.rename_object(RenameRequest(bucket_name="media", source_key="a.png", target_key="d.png"))
+    assert ("media", "a.png") not in storage.object_info_cache._data
+    assert ("media", "a.png") not in storage.download_url_cache._data
+
+    await service.delete_object(ObjectRequest(bucket_name="media", object_key="c.png"))
+    assert len(storage.object_info_cache) == 0
+    assert len(storage.download_url_cache) == 0
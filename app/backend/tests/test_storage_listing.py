@@ -0,0 +1,71 @@
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from core.config import settings
+from dependencies.auth import get_current_user
+from routers.storage import router
+from schemas.auth import UserResponse
+from schemas.storage import ObjectListRequest
+from services.storage import StorageService
+
+PAGES = {
+    None: {"objects": [{"key": "2024/a.png", "size": 1, "last_modified": "", "etag": "a"}], "next_continuation_token": "t1", "is_truncated": True},
+    "t1": {"objects": [{"key": "2024/b.png", "size": 2, "last_modified": "", "etag": "b"}], "common_prefixes": ["2024/x/"], "next_continuation_token": "t2", "is_truncated": True},
+    "t2": {"objects": [{"key": "2024/c.png", "size": 3, "last_modified": "", "etag": "c"}], "is_truncated": False},
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    monkeypatch.setitem(settings.__dict__, "oss_service_url", "http://oss.test")
+    monkeypatch.setitem(settings.__dict__, "oss_api_key", "key")
+    calls = []
+
+    async def fake_get(self, endpoint, params):
+        calls.append(params)
+        if params.get("prefix") == "missing/":
+            raise ValueError("bucket not found")
+        return PAGES[params.get("continuation_token")]
+
+    monkeypatch.setattr(StorageService, "_aget_oss_service", fake_get)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_list_objects_passes_filters_and_token(calls):
+    page = await StorageService().list_objects(
+        ObjectListRequest(bucket_name="damages", prefix="2024/", delimiter="/", max_keys=1, continuation_token="t1")
+    )
+    assert calls == [{"max_keys": 1, "prefix": "2024/", "delimiter": "/", "continuation_token": "t1"}]
+    assert [obj.object_key for obj in page.objects] == ["2024/b.png"]
+    assert page.prefixes == ["2024/x/"]
+    assert (page.next_continuation_token, page.is_truncated) == ("t2", True)
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u@test")
+    return app
+
+
+@pytest.mark.asyncio
+async def test_stream_objects_follows_pages(calls, app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/storage/list-objects/stream", params={"bucket_name": "damages", "prefix": "2024/"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [line.get("object_key", line.get("prefix")) for line in lines] == ["2024/a.png", "2024/x/", "2024/b.png", "2024/c.png"]
+    assert [params.get("continuation_token") for params in calls] == [None, "t1", "t2"]
+
+
+@pytest.mark.asyncio
+async def test_stream_objects_error_before_streaming(calls, app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/storage/list-objects/stream", params={"bucket_name": "damages", "prefix": "missing/"})
+    assert response.status_code == 400
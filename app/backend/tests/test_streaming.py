@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from utils.streaming import coalesce_text
+
+
+async def _source(chunks, delay=0.0, fail=False):
+    for chunk in chunks:
+        if delay:
+            await asyncio.sleep(delay)
+        yield chunk
+    if fail:
+        raise RuntimeError("provider went away")
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_fast_deltas_are_coalesced_by_size():
+    out = await _collect(coalesce_text(_source(["a"] * 10), interval=60, max_chars=4))
+    # The first delta goes out at once, then buffered text every 4 chars, then the remainder
+    assert out == ["a", "aaaa", "aaaa", "a"]
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_flushed_on_interval_without_new_deltas():
+    async def stalled():
+        yield "first"
+        yield "b"
+        yield "c"
+        await asyncio.sleep(0.2)
+        yield "late"
+
+    loop = asyncio.get_running_loop()
+    stamps = []
+    async for chunk in coalesce_text(stalled(), interval=0.02, max_chars=1000):
+        stamps.append((chunk, loop.time()))
+
+    assert [chunk for chunk, _ in stamps] == ["first", "bc", "late"]
+    # "bc" was sent after the interval, not held until "late" arrived
+    assert stamps[1][1] - stamps[0][1] < 0.15
+
+
+@pytest.mark.asyncio
+async def test_slow_deltas_pass_through_undelayed():
+    out = await _collect(coalesce_text(_source(["x", "y", "z"], delay=0.03), interval=0.01, max_chars=1000))
+    assert out == ["x", "y", "z"]
+
+
+@pytest.mark.asyncio
+async def test_zero_interval_disables_coalescing():
+    out = await _collect(coalesce_text(_source(["a", "b"]), interval=0, max_chars=256))
+    assert out == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_buffered_text_is_sent_before_error():
+    received = []
+    with pytest.raises(RuntimeError):
+        async for chunk in coalesce_text(_source(["a", "b", "c"], fail=True), interval=60, max_chars=100):
+            received.append(chunk)
+    assert received == ["a", "bc"]
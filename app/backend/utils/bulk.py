@@ -0,0 +1,114 @@
+"""
+Set-based write helpers shared by the entity services.
+
+These issue one statement per batch of rows instead of one ORM flush, commit and
+refresh per row. They do not commit; callers own the transaction so a batch is
+all-or-nothing.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import case, delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def bulk_insert(db: AsyncSession, model, rows: Sequence[Dict[str, Any]]) -> List[Any]:
+    """Insert `rows` with multi-row INSERT ... RETURNING and return ORM objects in input order.
+
+    PostgreSQL batches the rows into a few statements and correlates RETURNING rows
+    back to the parameter order. SQLite cannot do that correlation, so a single
+    unordered INSERT ... RETURNING is used and the objects are put back in input
+    order by primary key: rows that pass an `id` are matched on it, and the others
+    take the generated ids in ascending order, which SQLite assigns sequentially.
+    """
+    if not rows:
+        return []
+
+    ordered_returning = db.bind.dialect.name != "sqlite"
+    stmt = insert(model).returning(model, sort_by_parameter_order=ordered_returning)
+    result = await db.scalars(stmt, list(rows))
+    objs = list(result.all())
+
+    if ordered_returning:
+        return objs
+    return _in_input_order(objs, rows)
+
+
+def _in_input_order(objs: List[Any], rows: Sequence[Dict[str, Any]]) -> List[Any]:
+    by_pk = {obj.id: obj for obj in objs}
+    given = [row.get("id") for row in rows]
+    given_pks = {pk for pk in given if pk is not None}
+    generated = iter(sorted(pk for pk in by_pk if pk not in given_pks))
+    return [by_pk[pk] if pk is not None else by_pk[next(generated)] for pk in given]
+
+
+def _merge_updates(items: Sequence[Dict[str, Any]], columns, protected: Sequence[str]) -> Dict[Any, Dict[str, Any]]:
+    """Collapse `[{"id": ..., "updates": {...}}]` into {id: {column: value}}, dropping unknown,
+    protected and None values. Later items win when an id is repeated."""
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for item in items:
+        values = merged.setdefault(item["id"], {})
+        for key, value in (item.get("updates") or {}).items():
+            if value is None or key == "id" or key in protected or key not in columns:
+                continue
+            values[key] = value
+    return {obj_id: values for obj_id, values in merged.items() if values}
+
+
+async def bulk_update(
+    db: AsyncSession,
+    model,
+    items: Sequence[Dict[str, Any]],
+    *criteria,
+    protected: Sequence[str] = (),
+    chunk_size: int = 500,
+) -> List[Any]:
+    """Apply per-row partial updates by primary key and return the updated ORM objects.
+
+    Neither asyncpg nor aiosqlite can return rows from an executemany UPDATE, so each
+    chunk of rows becomes a single `UPDATE ... SET col = CASE id WHEN ... END WHERE id
+    IN (...) RETURNING *`. Extra `criteria` (such as an ownership filter) are added to
+    the WHERE clause, and rows that do not match them are left untouched.
+    """
+    columns = model.__table__.c
+    merged = _merge_updates(items, columns, protected)
+    if not merged:
+        return []
+
+    pk = columns.id
+    updated: Dict[Any, Any] = {}
+    obj_ids = list(merged)
+    for start in range(0, len(obj_ids), chunk_size):
+        chunk = obj_ids[start : start + chunk_size]
+        touched = {key for obj_id in chunk for key in merged[obj_id]}
+        values = {}
+        for key in sorted(touched):
+            whens = {obj_id: merged[obj_id][key] for obj_id in chunk if key in merged[obj_id]}
+            values[key] = case(whens, value=pk, else_=columns[key])
+
+        stmt = (
+            update(model)
+            .where(pk.in_(chunk), *criteria)
+            .values(values)
+            .returning(model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await db.scalars(stmt)
+        for obj in result.all():
+            updated[obj.id] = obj
+
+    # Preserve the request order
+    return [updated[obj_id] for obj_id in obj_ids if obj_id in updated]
+
+
+async def bulk_delete(db: AsyncSession, model, obj_ids: Sequence[Any], *criteria) -> int:
+    """Delete rows by primary key with a single `DELETE ... WHERE id IN (...)` and return the count."""
+    if not obj_ids:
+        return 0
+    stmt = (
+        delete(model)
+        .where(model.__table__.c.id.in_(list(obj_ids)), *criteria)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    return result.rowcount
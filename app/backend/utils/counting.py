@@ -0,0 +1,81 @@
+"""
+Total-count strategies for the entity list endpoints.
+
+Clients choose how `total` is computed with the `total` query parameter:
+
+- `exact`    the precise filtered count. Offset pages get it from a
+             `count(*) OVER ()` column in the page query itself (one round
+             trip); cursor pages and empty pages fall back to a COUNT query.
+- `estimate` planner statistics for unfiltered lists (`pg_class.reltuples`,
+             or `sqlite_stat1` once ANALYZE has run), otherwise an exact count
+             that is cached in-process for a short time.
+- `none`     no count at all; `total` is null. For infinite-scroll clients.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.cache import TTLCache
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+ESTIMATE_CACHE_TTL_SECONDS = 60
+count_cache = TTLCache(ttl=ESTIMATE_CACHE_TTL_SECONDS, maxsize=1024)
+
+
+def validate_total_mode(total_mode: str) -> str:
+    if total_mode not in TOTAL_MODES:
+        raise ValueError(f"Invalid total mode '{total_mode}', expected one of {', '.join(TOTAL_MODES)}")
+    return total_mode
+
+
+def total_over():
+    """Window column carrying the filtered row count on every row of a page."""
+    return func.count().over().label("total_count")
+
+
+async def table_row_estimate(db: AsyncSession, table_name: str) -> Optional[int]:
+    """Row count estimate from planner statistics, or None if none are available."""
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table_name},
+        )
+        estimate = result.scalar()
+        # reltuples is -1 for tables that have never been vacuumed or analyzed
+        return int(estimate) if estimate is not None and estimate >= 0 else None
+    if dialect == "sqlite":
+        has_stats = await db.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"))
+        if has_stats.scalar() is None:
+            return None
+        result = await db.execute(text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table_name LIMIT 1"), {"table_name": table_name})
+        stat = result.scalar()
+        # The first number of every sqlite_stat1 entry is the table's row count
+        return int(stat.split()[0]) if stat else None
+    return None
+
+
+async def cached_count(db: AsyncSession, count_query) -> int:
+    compiled = count_query.compile(dialect=db.bind.dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    total = count_cache.get(key)
+    if total is None:
+        total = (await db.execute(count_query)).scalar()
+        count_cache.set(key, total)
+    return total
+
+
+async def count_total(db: AsyncSession, model, count_query, total_mode: str) -> Optional[int]:
+    """Compute `total` for a list query with the requested strategy."""
+    if total_mode == "none":
+        return None
+    if total_mode == "estimate":
+        if count_query.whereclause is None:
+            estimate = await table_row_estimate(db, model.__tablename__)
+            if estimate is not None:
+                return estimate
+        return await cached_count(db, count_query)
+    return (await db.execute(count_query)).scalar()
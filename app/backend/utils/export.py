@@ -0,0 +1,103 @@
+"""
+Streaming exports for the entity endpoints.
+
+An export runs one column-only query with `yield_per`, so the driver fetches
+rows in batches through a server-side cursor (PostgreSQL) and nothing is held
+beyond the current batch. Each batch is encoded as NDJSON or CSV and written to
+the client as it arrives, giving constant memory regardless of table size.
+
+The body is sent after the handler returns, and depending on the FastAPI
+version the request's `get_db` session may already be closed by then. The
+stream therefore runs on a session of its own on the same engine, which it
+closes when the body is finished.
+"""
+
+import csv
+import io
+import logging
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.serialization import ORJSON_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_BATCH_SIZE = 1000
+
+
+def validate_export_format(export_format: str) -> str:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid export format '{export_format}', expected one of {', '.join(EXPORT_FORMATS)}")
+    return export_format
+
+
+async def stream_rows(db: AsyncSession, query, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield the rows of a column-only query as batches of dicts."""
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield [dict(row._mapping) for row in partition]
+
+
+async def _stream_rows_in_own_session(bind, query) -> AsyncIterator[List[Dict[str, Any]]]:
+    async with AsyncSession(bind=bind, expire_on_commit=False) as session:
+        async for batch in stream_rows(session, query):
+            yield batch
+
+
+async def encode_ndjson(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    option = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+    async for batch in batches:
+        yield b"".join(orjson.dumps(row, option=option) for row in batch)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def encode_csv(batches: AsyncIterator[List[Dict[str, Any]]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        for row in batch:
+            writer.writerow([_csv_value(row[name]) for name in columns])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there were no rows
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def _logged(chunks: AsyncIterator[bytes], filename: str) -> AsyncIterator[bytes]:
+    # The status line has already been sent once streaming starts, so failures can only be logged
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        logger.error(f"Error streaming export {filename}: {str(e)}", exc_info=True)
+        raise
+
+
+def export_response(db: AsyncSession, query, columns: Sequence[str], export_format: str, name: str) -> StreamingResponse:
+    """Stream the rows of `query` as a downloadable NDJSON or CSV file."""
+    batches = _stream_rows_in_own_session(db.bind, query)
+    chunks = encode_csv(batches, columns) if export_format == "csv" else encode_ndjson(batches)
+    filename = f"{name}.{export_format}"
+    return StreamingResponse(
+        _logged(chunks, filename),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
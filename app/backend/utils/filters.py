@@ -0,0 +1,141 @@
+"""
+Operator-based filters for the `query` JSON parameter of the entity list endpoints.
+
+A query is a JSON object mapping field names to either a plain value (equality)
+or an operator object, e.g.
+
+    {"status": {"$in": ["pending", "in_transit"]},
+     "scheduled_date": {"$gte": "2026-01-01T00:00:00"},
+     "notes": {"$is_null": false}}
+
+Each condition compiles to a SQLAlchemy column expression so that filtering
+happens in the database and can use the indexes on the filtered columns.
+Which operators a field accepts is decided by its column type.
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Integer, Numeric, String, Text
+
+
+class InvalidQueryError(ValueError):
+    """Raised when a query object uses an unknown or disallowed operator or value."""
+
+
+EQUALITY_OPERATORS = frozenset({"$eq", "$ne", "$in", "$nin", "$is_null"})
+RANGE_OPERATORS = frozenset({"$gt", "$gte", "$lt", "$lte", "$between"})
+PATTERN_OPERATORS = frozenset({"$like", "$ilike"})
+
+# Maximum number of values accepted by $in / $nin
+MAX_IN_VALUES = 1000
+
+
+def allowed_operators(column: Column) -> FrozenSet[str]:
+    """Operators a column accepts, based on its type."""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return EQUALITY_OPERATORS
+    if isinstance(column_type, (String, Text)):
+        return EQUALITY_OPERATORS | RANGE_OPERATORS | PATTERN_OPERATORS
+    if isinstance(column_type, (Integer, Float, Numeric, DateTime, Date)):
+        return EQUALITY_OPERATORS | RANGE_OPERATORS
+    return EQUALITY_OPERATORS
+
+
+def _coerce(column: Column, value: Any) -> Any:
+    """Convert JSON values to the Python type expected by the column."""
+    if value is None:
+        return None
+    try:
+        if isinstance(column.type, DateTime) and isinstance(value, str):
+            return datetime.fromisoformat(value)
+        if isinstance(column.type, Date) and isinstance(value, str):
+            return date.fromisoformat(value)
+    except ValueError as e:
+        raise InvalidQueryError(f"Invalid date value for '{column.key}': {value}") from e
+    if isinstance(value, (dict, list)):
+        raise InvalidQueryError(f"Invalid value for '{column.key}'")
+    return value
+
+
+def _value_list(column: Column, operator: str, value: Any) -> List[Any]:
+    if not isinstance(value, list):
+        raise InvalidQueryError(f"'{operator}' on '{column.key}' expects a list")
+    if len(value) > MAX_IN_VALUES:
+        raise InvalidQueryError(f"'{operator}' on '{column.key}' accepts at most {MAX_IN_VALUES} values")
+    return [_coerce(column, v) for v in value]
+
+
+def _between(column: Column, value: Any):
+    if not isinstance(value, list) or len(value) != 2:
+        raise InvalidQueryError(f"'$between' on '{column.key}' expects [low, high]")
+    low, high = (_coerce(column, v) for v in value)
+    return column.between(low, high)
+
+
+def _is_null(column: Column, value: Any):
+    if not isinstance(value, bool):
+        raise InvalidQueryError(f"'$is_null' on '{column.key}' expects true or false")
+    return column.is_(None) if value else column.isnot(None)
+
+
+_OPERATORS: Dict[str, Callable[[Column, Any], Any]] = {
+    "$eq": lambda c, v: c.is_(None) if v is None else c == _coerce(c, v),
+    "$ne": lambda c, v: c.isnot(None) if v is None else c != _coerce(c, v),
+    "$gt": lambda c, v: c > _coerce(c, v),
+    "$gte": lambda c, v: c >= _coerce(c, v),
+    "$lt": lambda c, v: c < _coerce(c, v),
+    "$lte": lambda c, v: c <= _coerce(c, v),
+    "$in": lambda c, v: c.in_(_value_list(c, "$in", v)),
+    "$nin": lambda c, v: c.not_in(_value_list(c, "$nin", v)),
+    "$between": _between,
+    "$like": lambda c, v: c.like(_coerce(c, v)),
+    "$ilike": lambda c, v: c.ilike(_coerce(c, v)),
+    "$is_null": _is_null,
+}
+
+
+def _compile_condition(column: Column, condition: Any) -> list:
+    if isinstance(condition, list):
+        # A bare list is shorthand for $in
+        condition = {"$in": condition}
+    if not isinstance(condition, dict):
+        return [_OPERATORS["$eq"](column, condition)]
+
+    if not condition:
+        raise InvalidQueryError(f"Empty operator object for '{column.key}'")
+
+    allowed = allowed_operators(column)
+    clauses = []
+    for operator, value in condition.items():
+        if operator not in _OPERATORS:
+            raise InvalidQueryError(f"Unknown operator '{operator}'")
+        if operator not in allowed:
+            raise InvalidQueryError(f"Operator '{operator}' is not supported on '{column.key}'")
+        if value is None and operator not in ("$eq", "$ne"):
+            raise InvalidQueryError(f"'{operator}' on '{column.key}' requires a value")
+        clauses.append(_OPERATORS[operator](column, value))
+    return clauses
+
+
+def compile_filters(model, query_dict: Optional[Dict[str, Any]]) -> list:
+    """Compile a query object into a list of WHERE clauses for `model`.
+
+    Fields that are not columns of the model are ignored, matching the previous
+    equality-only behaviour. Unknown operators, operators that do not apply to a
+    column's type and malformed values raise InvalidQueryError.
+    """
+    if not query_dict:
+        return []
+    if not isinstance(query_dict, dict):
+        raise InvalidQueryError("Query must be a JSON object")
+
+    columns = model.__table__.c
+    clauses = []
+    for field, condition in query_dict.items():
+        column = columns.get(field)
+        if column is None:
+            continue
+        clauses.extend(_compile_condition(column, condition))
+    return clauses
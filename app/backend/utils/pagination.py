@@ -0,0 +1,157 @@
+"""
+Keyset (cursor) pagination helpers shared by the entity services.
+
+A cursor is an opaque, URL-safe token that records the sort key values of the
+last row on a page. The next page seeks past that row with a WHERE clause on
+the sort key plus `id`, so the database can walk an index instead of counting
+and discarding `skip` rows, and deep pages cost the same as the first one.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, Date, DateTime, and_, or_
+
+# (column, descending)
+SortKey = Tuple[Column, bool]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+
+
+def parse_sort(model, sort: Optional[str]) -> List[SortKey]:
+    """Resolve a sort expression into sort keys, always ending with the primary key.
+
+    `sort` is a comma-separated list of field names, each optionally prefixed
+    with '-' for descending order (e.g. "-status,created_at"). Unknown and
+    repeated fields are ignored; if no field is usable the default `-id`
+    ordering is used instead.
+    """
+    pk = model.__table__.c.id
+    keys: List[SortKey] = []
+    seen = set()
+
+    for part in (sort or "").split(","):
+        part = part.strip()
+        descending = part.startswith("-")
+        field_name = part[1:] if descending else part
+        column = model.__table__.c.get(field_name) if field_name else None
+        if column is None or field_name in seen:
+            continue
+        seen.add(field_name)
+        keys.append((column, descending))
+        if column is pk:
+            # id is unique, later keys can never break a tie
+            return keys
+
+    if not keys:
+        return [(pk, True)]
+
+    # Tie-break on id in the direction of the leading key so the order is total
+    keys.append((pk, keys[0][1]))
+    return keys
+
+
+def order_by_clauses(keys: Sequence[SortKey]) -> list:
+    """Build ORDER BY clauses for the sort keys.
+
+    NULLs are placed as the largest value (last ascending, first descending) on
+    every dialect, which matches PostgreSQL's default and keeps the seek
+    predicate in `keyset_predicate` consistent with the ordering.
+    """
+    clauses = []
+    for column, descending in keys:
+        clause = column.desc() if descending else column.asc()
+        if column.nullable:
+            clause = clause.nulls_first() if descending else clause.nulls_last()
+        clauses.append(clause)
+    return clauses
+
+
+def _after(column: Column, descending: bool, value: Any):
+    """Rows that sort strictly after `value` on a single column."""
+    if value is None:
+        # NULL is the largest value: nothing follows it ascending,
+        # every non-NULL value follows it descending
+        return column.isnot(None) if descending else None
+    if descending:
+        return column < value
+    if column.nullable:
+        return or_(column > value, column.is_(None))
+    return column > value
+
+
+def _equal(column: Column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def keyset_predicate(keys: Sequence[SortKey], values: Sequence[Any]):
+    """Build the WHERE clause selecting rows that sort after the cursor row.
+
+    For keys (k1, k2, ..., kn) this is the lexicographic comparison
+    k1 > v1 OR (k1 = v1 AND k2 > v2) OR ... expanded so that each branch can
+    use an index on the sort columns.
+    """
+    branches = []
+    for i, (column, descending) in enumerate(keys):
+        after = _after(column, descending, values[i])
+        if after is None:
+            continue
+        prefix = [_equal(keys[j][0], values[j]) for j in range(i)]
+        branches.append(and_(*prefix, after) if prefix else after)
+    return or_(*branches)
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _deserialize(column: Column, value: Any) -> Any:
+    if value is None or not isinstance(value, str):
+        return value
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def encode_cursor(keys: Sequence[SortKey], row: Any, sort: Optional[str] = None) -> str:
+    """Encode the sort key values of `row` into an opaque cursor string."""
+    payload = {
+        "s": sort or "",
+        "v": [_serialize(getattr(row, column.key)) for column, _ in keys],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(keys: Sequence[SortKey], cursor: str, sort: Optional[str] = None) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor` for the same sort expression."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+        cursor_sort = payload.get("s", "")
+    except Exception as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if cursor_sort != (sort or "") or not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursorError("Cursor does not match the requested sort")
+
+    try:
+        return [_deserialize(column, value) for (column, _), value in zip(keys, values)]
+    except ValueError as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def next_cursor(keys: Sequence[SortKey], items: Sequence[Any], limit: int, sort: Optional[str] = None) -> Optional[str]:
+    """Return the cursor for the page after `items`, or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(keys, items[-1], sort)
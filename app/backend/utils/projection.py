@@ -0,0 +1,47 @@
+"""
+Column projection for the `fields` parameter of the entity read endpoints.
+
+When a client asks for a subset of fields, the services select only those
+columns instead of whole ORM entities. Column-only rows are plain tuples: they
+are not hydrated into model instances or tracked in the session identity map,
+which keeps wide tables (addresses, notes, URLs) out of the read path.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Column
+
+
+def parse_fields(model, fields: Optional[str]) -> Optional[List[str]]:
+    """Resolve a comma-separated `fields` value into column names of `model`.
+
+    `id` is always included so rows stay addressable, and unknown fields are
+    ignored. Returns None (select whole entities) only when `fields` is empty.
+    """
+    if not fields:
+        return None
+
+    columns = model.__table__.c
+    names: List[str] = []
+    for name in (part.strip() for part in fields.split(",")):
+        if name in columns and name not in names:
+            names.append(name)
+    if "id" not in names:
+        names.insert(0, "id")
+    return names
+
+
+def select_columns(model, field_names: Sequence[str], extra: Sequence[Column] = ()) -> List[Column]:
+    """Columns to select for a projection, plus any `extra` columns the query needs
+    (such as sort keys used to build the next cursor)."""
+    columns = [model.__table__.c[name] for name in field_names]
+    for column in extra:
+        if column.key not in field_names:
+            columns.append(column)
+    return columns
+
+
+def slim_row(row: Any, field_names: Sequence[str]) -> Dict[str, Any]:
+    """Convert a column-only result row into a dict of the requested fields."""
+    mapping = row._mapping
+    return {name: mapping[name] for name in field_names}
@@ -0,0 +1,74 @@
+"""
+Coalescing of token streams into fewer, larger chunks.
+
+Model providers stream one small delta per token. Sending each one as its own
+SSE event means thousands of tiny writes per completion. `coalesce_text`
+buffers deltas and flushes them when `max_chars` have accumulated or
+`interval` seconds have passed since the last flush, whichever comes first. A
+delta that arrives when nothing has been sent for `interval` seconds (always
+the case for the first one) is passed through at once, so time-to-first-token
+and slow streams are not delayed.
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+
+async def coalesce_text(chunks: AsyncIterator[str], interval: float, max_chars: int) -> AsyncIterator[str]:
+    """Re-chunk a text stream, flushing every `interval` seconds or `max_chars` characters."""
+    if interval <= 0 or max_chars <= 1:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer: List[str] = []
+    size = 0
+    last_flush = float("-inf")
+    pending: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = max(0.0, last_flush + interval - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if not done:
+                # Interval elapsed while waiting for the next delta
+                yield "".join(buffer)
+                buffer, size, last_flush = [], 0, loop.time()
+                continue
+
+            finished, pending = pending, None
+            try:
+                chunk = finished.result()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                # Send what was generated before the failure, then let the caller report it
+                if buffer:
+                    yield "".join(buffer)
+                raise
+
+            if not buffer and loop.time() - last_flush >= interval:
+                yield chunk
+                last_flush = loop.time()
+                continue
+
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= max_chars:
+                yield "".join(buffer)
+                buffer, size, last_flush = [], 0, loop.time()
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
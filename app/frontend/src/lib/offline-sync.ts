@@ -68,8 +68,60 @@ export async function queueOfflineAction(
   notifySyncListeners();
 }
 
+const UPLOAD_BUCKETS: Partial<Record<OfflineAction['type'], string>> = {
+  signature_upload: 'signatures',
+  photo_upload: 'damages',
+};
+
+// Presign the uploads of all queued actions in one request instead of one per file
+async function presignUploads(actions: OfflineAction[]): Promise<Map<number, string>> {
+  const uploads = actions.filter(action => UPLOAD_BUCKETS[action.type]);
+  const urls = new Map<number, string>();
+  if (uploads.length === 0) {
+    return urls;
+  }
+
+  try {
+    const response = await client.apiCall.invoke({
+      url: '/api/v1/storage/batch-presign',
+      method: 'POST',
+      data: {
+        operation: 'upload',
+        items: uploads.map(action => ({
+          bucket_name: UPLOAD_BUCKETS[action.type],
+          object_key: action.data.object_key,
+        })),
+      },
+    });
+    // Items come back in request order; failed items fall back to a single presign in syncAction
+    response.data.items.forEach((item: { upload_url: string; error?: string | null }, index: number) => {
+      if (!item.error && item.upload_url) {
+        urls.set(uploads[index].id!, item.upload_url);
+      }
+    });
+  } catch (error) {
+    console.error('Batch presign failed, presigning uploads one by one:', error);
+  }
+  return urls;
+}
+
+async function getUploadUrl(action: OfflineAction, presigned?: string): Promise<string> {
+  if (presigned) {
+    return presigned;
+  }
+  const response = await client.apiCall.invoke({
+    url: '/api/v1/storage/upload-url',
+    method: 'POST',
+    data: {
+      bucket_name: UPLOAD_BUCKETS[action.type],
+      object_key: action.data.object_key,
+    },
+  });
+  return response.data.upload_url;
+}
+
 // Sync a single action
-async function syncAction(action: OfflineAction): Promise<boolean> {
+async function syncAction(action: OfflineAction, presignedUrl?: string): Promise<boolean> {
   try {
     await db.actions.update(action.id!, { status: 'syncing' });
     notifySyncListeners();
@@ -84,17 +136,10 @@ async function syncAction(action: OfflineAction): Promise<boolean> {
 
       case 'signature_upload': {
         // Upload signature to storage
-        const sigResponse = await client.apiCall.invoke({
-          url: '/api/v1/storage/upload-url',
-          method: 'POST',
-          data: {
-            bucket_name: 'signatures',
-            object_key: action.data.object_key,
-          },
-        });
-        
+        const sigUploadUrl = await getUploadUrl(action, presignedUrl);
+
         // Upload file
-        await fetch(sigResponse.data.upload_url, {
+        await fetch(sigUploadUrl, {
           method: 'PUT',
           body: action.data.file,
           headers: { 'Content-Type': 'image/png' },
@@ -110,16 +155,9 @@ async function syncAction(action: OfflineAction): Promise<boolean> {
 
       case 'photo_upload': {
         // Similar to signature upload
-        const photoResponse = await client.apiCall.invoke({
-          url: '/api/v1/storage/upload-url',
-          method: 'POST',
-          data: {
-            bucket_name: 'damages',
-            object_key: action.data.object_key,
-          },
-        });
-        
-        await fetch(photoResponse.data.upload_url, {
+        const photoUploadUrl = await getUploadUrl(action, presignedUrl);
+
+        await fetch(photoUploadUrl, {
           method: 'PUT',
           body: action.data.file,
           headers: { 'Content-Type': 'image/jpeg' },
@@ -150,8 +188,9 @@ export async function startSync(): Promise<void> {
     .and(action => action.retryCount < 3)
     .sortBy('timestamp');
 
+  const uploadUrls = await presignUploads(pendingActions);
   for (const action of pendingActions) {
-    syncQueue.add(() => syncAction(action));
+    syncQueue.add(() => syncAction(action, uploadUrls.get(action.id!)));
   }
 
   notifySyncListeners();